@@ -24,11 +24,26 @@
 """
 
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from plugins.virtualEnvHelper import VirtualEnvHelper
 from plugins.configManager import ConfigManager
+from plugins.installRegistry import InstallRegistry
 from guiManager import GUIManager
-from clipElement import ClipElement
+from clipElement import ClipElement, ClipSnapshot, ClipCapture
 from davinciAPI import DaVinciAPI
+from plugins.job import Job, JobCancelled
+from plugins.media import Media
+from resolveProfiler import ResolveProfiler
+from pasteMemo import PasteMemo
+from assetCatalog import AssetCatalog
+from proxyGenerator import ProxyGenerator
+from jobQueue import JobQueue
+from usageStats import UsageStats
+from inferenceClient import InferenceClient
+from sharedStore import SharedStore
+from contextlib import nullcontext
 import inspect
 
 class ClipRocks:
@@ -73,6 +88,57 @@ class ClipRocks:
             # To read config.json in this folder and each plugins folders
             "abs_dir_script" : abs_dir_script,  
 
+            # count and time every Resolve API call, summary per paste in ?cache?/resolve_calls.jsonl
+            "profile_resolve": False,
+
+            # seconds during which an installed plugin is not checked again on disk (see InstallRegistry)
+            "install_cache_ttl": 3600,
+
+            # same clipboard pasted again with the same button: append the existing clip (see PasteMemo)
+            "memoize_pastes": True,
+
+            # same content already imported in the project (any route): reuse its clip (see AssetCatalog)
+            "asset_catalog": True,
+
+            # proxies of heavy pasted media, linked with LinkProxyMedia (see ProxyGenerator)
+            "proxy_generation": False,
+            "proxy_max_side": 1920,
+            "proxy_min_side": 3840,
+            "proxy_min_video_mb": 200,
+            # empty = ffmpeg from PATH (video proxies are skipped without it)
+            "ffmpeg_path": "",
+
+            # heavy plugin runs (see PluginBase.job_requirements) wait their turn in a queue shared
+            # by every ClipRocks process, journaled in ?cache?/queue (see JobQueue)
+            "job_queue": True,
+            # resources shared by the queued runs, 0 = cpu count / memory available at start
+            "queue_cores": 0,
+            "queue_memory_mb": 0,
+
+            # buttons ordered by the clicks of this user per clipboard format (see UsageStats)
+            "usage_stats": True,
+            # warm up the most clicked plugin while the menu is open (see PluginBase.warm_up)
+            "speculative_warm_up": True,
+            # write the clipboard image in the cache while the menu is open (see ClipCapture)
+            "speculative_capture": True,
+
+            # inference nodes running the AI plugins for this machine ("http://host:8765", see
+            # inferenceServer.py), least busy first. The plugin runs locally when none answers.
+            # Nodes use their own plugin options (model, scale, ...).
+            "inference_nodes": [],
+            # seconds a node may take for one run, queue included
+            "inference_timeout": 600,
+
+            # network folder shared by the seats of the team (see SharedStore): downloads and AI
+            # results are done once for everyone. Empty = disabled
+            "shared_store": "",
+            # local read-through copy of the shared store (least recently used removed first)
+            "shared_store_cache_mb": 2048,
+            # seconds the script waits at exit for the results still being copied to the shared store
+            "shared_store_flush_timeout": 30,
+            # seconds a download in the shared store is used as is, then checked against the server
+            "shared_store_url_ttl": 3600,
+
         }
 
         # reads or init and write config ([default_config + derivated_config])
@@ -86,6 +152,9 @@ class ClipRocks:
         ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
         self.gui_manager = GUIManager(self)
 
+        # map the menu at the cursor now, buttons are added while plugins load (see HandlePlugins)
+        self.gui_manager.show()
+
 
         """──────────────────────────────────────────────────────────────────────────────────
         VirtuelEnv Initialization (VirtualEnvHelper)
@@ -104,16 +173,122 @@ class ClipRocks:
         Davinci API (DaVinciAPI)
         ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
 
+        # optional accounting of the native calls (see ResolveProfiler)
+        self.profiler = None
+        if self.config.read_option("profile_resolve"):
+            self.profiler = ResolveProfiler()
+            resolve = self.profiler.wrap(resolve)
+
         # init Davinci API with default virtual folder and native API resolve from software
-        self.davinciAPI = DaVinciAPI(resolve, self.config.read_option("binName"))
+        with self._profile("DaVinciAPI.__init__"):
+            self.davinciAPI = DaVinciAPI(
+                resolve, self.config.read_option("binName"), self.profiler.caller_operation if self.profiler else None
+            )
+        if self.profiler:
+            self.profiler.instrument(self.davinciAPI)
 
         # Plugin button registry
         self.button_registry = {}
 
+        # worker of the clicked plugin (see on_button_click)
+        self.plugin_thread = None
+
+        # the user sent the running job to the background: window hidden, result only added to the bin
+        self.backgrounded = False
+
+        # plugin warmed up while the menu is open (see _start_warm_up)
+        self.warm_plugin = None
+
+        # clipboard image being saved in the cache while the menu is open (see HandlePlugins)
+        self.clipboard_capture = None
+
+        # cached plugin install states, kept next to this script (local disk)
+        self.install_registry = InstallRegistry(
+            os.path.join(self.config.read_option("abs_dir_script"), "install_registry.json"),
+            ttl=self.config.read_option("install_cache_ttl")
+        )
+
         # where to work and save + auto add folder (!!! Note : need self.davinciAPI instanciated)
         self.asset_save_path = self._construct_folder_path(self.config.read_option("assets"))
         self.cache_save_path = self._construct_folder_path(self.config.read_option("cache"))
 
+        # asset and clip of the last pastes, by clipboard content (saved projects only: no
+        # dedicated cache folder for an untitled one)
+        self.paste_memo = None
+        if self.config.read_option("memoize_pastes") and self.cache_save_path:
+            self.paste_memo = PasteMemo(os.path.join(self.cache_save_path, "paste_memo.json"))
+
+        # proxies generated in a background process pool, linked before the script ends (in the
+        # root cache folder for an unsaved project, proxies are keyed by content anyway)
+        self.proxy_generator = None
+        self.pending_proxies = []
+        if self.config.read_option("proxy_generation"):
+            self.proxy_generator = ProxyGenerator(
+                os.path.join(self.cache_save_path or self.config.read_option("cache"), "proxies"),
+                max_side=self.config.read_option("proxy_max_side"),
+                min_side=self.config.read_option("proxy_min_side"),
+                min_video_mb=self.config.read_option("proxy_min_video_mb"),
+                ffmpeg=self.config.read_option("ffmpeg_path") or None,
+                python_executable=self.venv.python_executable
+            )
+
+        # clicks per clipboard format of this user (cache folder of the user profile)
+        self.usage_stats = None
+        if self.config.read_option("usage_stats"):
+            self.usage_stats = UsageStats(os.path.join(self.config.read_option("cache"), "usage_stats.json"))
+
+        # runs of heavy plugins, shared with the other ClipRocks processes of the machine
+        self.job_queue = None
+        self.recovery_thread = None
+        self.recovered_jobs = []
+        if self.config.read_option("job_queue"):
+            self.job_queue = JobQueue(
+                os.path.join(self.config.read_option("cache"), "queue"),
+                cores=self.config.read_option("queue_cores"),
+                memory_mb=self.config.read_option("queue_memory_mb")
+            )
+
+        # AI plugins sent to the inference nodes of the shop
+        self.inference_client = None
+        if self.config.read_option("inference_nodes"):
+            self.inference_client = InferenceClient(
+                self.config.read_option("inference_nodes"),
+                timeout=self.config.read_option("inference_timeout")
+            )
+
+        # downloads and AI results shared with the other seats, read through ?cache?/store
+        self.shared_store = None
+        if self.config.read_option("shared_store"):
+            self.shared_store = SharedStore(
+                self.config.read_option("shared_store"),
+                os.path.join(self.config.read_option("cache"), "store"),
+                local_max_mb=self.config.read_option("shared_store_cache_mb")
+            )
+
+        # content hashes of the assets imported in the current project (saved projects only)
+        self.asset_catalog = None
+        if self.config.read_option("asset_catalog") and self.cache_save_path:
+            self.asset_catalog = AssetCatalog(
+                os.path.join(self.cache_save_path, "catalogs"), self.davinciAPI.project_name
+            )
+
+
+    def _profile(self, operation):
+        """
+        Context attributing the Resolve calls made inside it to `operation` when profiling is
+        enabled (`profile_resolve`), no-op otherwise.
+        """
+        if self.profiler:
+            return self.profiler.operation(operation)
+        return nullcontext()
+
+    def _dump_profile(self, label):
+        """
+        Prints and stores the Resolve calls summary of this paste.
+        """
+        if self.profiler:
+            path = os.path.join(self.config.read_option("cache"), "resolve_calls.jsonl")
+            self.profiler.dump(path, label)
 
     def _calculate_derived_paths(self):
         """
@@ -212,26 +387,17 @@ class ClipRocks:
         This approach simplifies the process of managing plugins by automatically importing 
         them without manual intervention.
         """
-        plugin_dir = os.path.join(self.config.read_option("abs_dir_script"), "plugins")
-        for plugin_name in os.listdir(plugin_dir):
-            plugin_path = os.path.join(plugin_dir, plugin_name)
-            if os.path.isdir(plugin_path):
-                main_file = os.path.join(plugin_path, "main.py")
-                if os.path.isfile(main_file):
-                    try:
-                        module_name = f"plugins.{plugin_name}.main"
-                        importlib.import_module(module_name)
-                    except ImportError as e:
-                        print(f"Plugin '{plugin_name}' failed to import: {e}")
+        from plugins.pluginBase import load_plugins
+        load_plugins(os.path.join(self.config.read_option("abs_dir_script"), "plugins"))
 
 
-    def register_button(self, button_name, plugin_instance):        
+    def register_button(self, button_name, plugin_instance, order=0):        
         """
         Registers a button with its associated plugin instance and GUI. Once registered, the button 
         can be clicked, and when clicked, it will trigger the associated plugin's functionality.
         """
         self.button_registry[button_name] = plugin_instance
-        self.gui_manager.add_button(button_name, plugin_instance)
+        self.gui_manager.add_button(button_name, plugin_instance, order)
 
 
     def on_button_click(self, button_name):
@@ -240,40 +406,693 @@ class ClipRocks:
         button is clicked, the corresponding plugin's functionality and behavior are executed
 
         Checks associated plugin instance for the given button name in the `button_registry`.
-        If exists, it retrieves the media object by calling the `execute` method of the plugin.
-        stop GUI
+        If exists, the plugin runs as a background Job (see _run_plugin_job) while the window shows
+        its progress and a cancel button, the Tk thread stays free. stop GUI when done.
         """
         if button_name in self.button_registry:
             plugin_instance = self.button_registry[button_name]
 
-            if (plugin_instance.is_install()):
-                media = plugin_instance.execute(self.clipboard_element)
+            if self.usage_stats:
+                self.usage_stats.record(self.clipboard_element.get_format_ids(), button_name)
+            self._cancel_warm_up(keep=plugin_instance)
+
+            if self._paste_from_memo(button_name):
+                return
+
+            # plugins sent to an inference node don't need a local install
+            if plugin_instance.is_install() or self._is_remote(plugin_instance):
+                # the window must stay open until the job is done
+                self.gui_manager.disable_close_focus_out()
+
+                job = Job(button_name)
+                plugin_instance.job = job
+                self.gui_manager.show_progress(job, on_background=self._send_to_background)
+                self.plugin_thread = threading.Thread(
+                    target=self._run_plugin_job,
+                    args=(button_name, plugin_instance, job),
+                    daemon=True
+                )
+                self.plugin_thread.start()
+                return
+
+            self.gui_manager.disable_close_focus_out()
+            plugin_instance.install()
+            self.gui_manager.enable_close_focus_out()
+            self._close()
+        else:
+            print(f"No plugin associated with button: {button_name}")
+
+    def _run_plugin_job(self, button_name, plugin_instance, job):
+        """
+        Job worker: plugin execution and save, off the Tk thread. The Resolve side (bin import,
+        timeline) is posted back to the Tk thread, see _import_media.
+
+        Heavy plugins go through the job queue: journaled at once, `execute` waits for its turn
+        (see _enqueue and _wait_turn) and the slots are released when the job ends.
+        """
+        # remote runs take their turn on the node, in the local queue only if they fall back
+        queued_job = None if self._is_remote(plugin_instance) else self._enqueue(button_name, plugin_instance, job)
+        try:
+            self._run_plugin(button_name, plugin_instance, job, queued_job)
+        finally:
+            if queued_job:
+                self.job_queue.finish(queued_job)
+
+    def _run_plugin(self, button_name, plugin_instance, job, queued_job=None):
+        # AI plugins: result of this input with these options already imported ? Not run again
+        result_hash = self._result_hash(plugin_instance)
+        if result_hash:
+            job.set_stage("Checking project assets")
+            existing = self._lookup_result(result_hash)
+            if existing:
+                self.gui_manager.post(
+                    self._import_media, button_name, None, None, [result_hash], existing, plugin_instance.clipboard_element
+                )
+                return
+
+        try:
+            preview = plugin_instance.preview(self.clipboard_element)
+        except Exception as e:
+            print(f"Plugin '{button_name}' preview failed: {e}")
+            preview = None
+        if preview:
+            return self._run_optimistic_job(button_name, plugin_instance, job, preview, queued_job)
+
+        asset_SAVED_path = None
+        hashes = [result_hash] if result_hash else []
+        existing = None
+        plugin_instance.media_sink = lambda media: self._save_streamed(button_name, media)
+        try:
+            with self._profile(button_name):
+                media = self._execute(button_name, plugin_instance, job, queued_job)
+                if media is None:
+                    # batch: every result was published, and is saved and imported already
+                    self.gui_manager.post(self._finish, button_name)
+                    return
+
+                # content already imported in the project ? (encoded bytes, file) AI results are
+                # known by their input (result_hash), the output isn't hashed
+                if self.asset_catalog and not result_hash:
+                    job.set_stage("Checking project assets")
+                    hashes.append(self.asset_catalog.hash_media(media))
+                    existing = self.asset_catalog.lookup(hashes[-1])
 
                 # Étape 2 : Sauvegarder
-                asset_SAVED_path = media.save(self.asset_save_path)
+                if not existing:
+                    job.set_stage("Saving")
+                    asset_SAVED_path = media.save(self.asset_save_path)
+
+                    # content only known once saved (clipboard bitmap, download, ...)
+                    if self.asset_catalog and not result_hash:
+                        hashes.append(self.asset_catalog.hash_file(asset_SAVED_path))
+                        existing = self.asset_catalog.lookup(hashes[-1])
+                job.set_stage("Importing in DaVinci Resolve")
+
+                # hashed here, off the Tk thread, for the memo record
+                if self.paste_memo:
+                    plugin_instance.clipboard_element.get_content_hash()
+        except JobCancelled:
+            # nothing reached Resolve yet, don't leave the asset behind
+            if asset_SAVED_path and os.path.exists(asset_SAVED_path):
+                os.remove(asset_SAVED_path)
+            self.gui_manager.post(self._close)
+            return
+        except SystemExit:
+            # plugins still call exit() to stop the script (unsupported content, ...)
+            self.gui_manager.post(self._close)
+            return
+        except Exception as e:
+            print(f"Plugin '{button_name}' failed: {e}")
+            plugin_instance.invalidate_install()
+            self.gui_manager.post(self._close)
+            return
 
-                # Étape 3 : Ajouter au bin
-                binFolder = self.davinciAPI.get_or_create_bin()
-                self.davinciAPI.add_to_bin(binFolder, asset_SAVED_path)
-            
-                # Étape 4 : Ajouter à la timeline
+        self.gui_manager.post(
+            self._import_media, button_name, media, asset_SAVED_path, hashes, existing, plugin_instance.clipboard_element
+        )
+
+    def _import_media(self, button_name, media, asset_SAVED_path, hashes=(), existing=None, clipboard_element=None):
+        """
+        Resolve side of a paste, run in the Tk thread: adds the saved asset to the bin and
+        appends it to the timeline (unless the job was sent to the background), then closes.
+
+        With `existing` (AssetCatalog hit), the clip already in the bin is appended instead and the
+        duplicate file, if saved, is removed. If that clip is gone, the paste goes on normally.
+        """
+        with self._profile(button_name):
+            clip = None
+            reused = False
+            if existing:
+                clip = self._find_bin_clip(existing["clip_name"])
+                reused = bool(clip)
+                if clip:
+                    if asset_SAVED_path and asset_SAVED_path != existing["path"]:
+                        os.remove(asset_SAVED_path)
+                    asset_SAVED_path, clip_name = existing["path"], existing["clip_name"]
+                else:
+                    self.asset_catalog.forget(existing)
+                    if media is None:
+                        # AI result found before the run, its clip left the bin meanwhile
+                        print(f"The clip of '{button_name}' left the bin, paste again to run the plugin.")
+                        self._finish(button_name)
+                        return
+                    if not asset_SAVED_path:
+                        asset_SAVED_path = media.save(self.asset_save_path)
+
+            if not clip:
                 clip_name = media.get_filename()
-                currentFolder = self.davinciAPI.getCurrentFolder()
-                clips = currentFolder.GetClipList()
-                clip = self.davinciAPI.get_item_by_name(clips, clip_name)
+                clip = self._import_to_bin(asset_SAVED_path, clip_name)
 
+            # Étape 4 : Ajouter à la timeline
+            if not self.backgrounded:
                 listClips = self.davinciAPI.add_to_timeline([{
                     "mediaPoolItem": clip,
                 }])
-            else:
-                self.gui_manager.disable_close_focus_out()
-                plugin_instance.install()
-                self.gui_manager.enable_close_focus_out()
-            
+                self._place_autocropped(listClips, asset_SAVED_path)
+
+        if clip:
+            self._record_paste(button_name, hashes, asset_SAVED_path, clip_name, clipboard_element)
+            if not reused:
+                self._attach_proxy(clip, asset_SAVED_path)
+        self._finish(button_name)
+
+    def _finish(self, button_name):
+        """
+        End of a paste (Tk thread): closes, or only closes the window while proxies are still
+        being generated (linked in HandlePlugins).
+        """
+        self._dump_profile(button_name)
+        if self.pending_proxies or self._is_recovering():
             self.gui_manager.exit()
-            sys.exit(0)
         else:
-            print(f"No plugin associated with button: {button_name}")
+            self._close()
+
+    def _save_streamed(self, button_name, media):
+        """
+        Media sink of the plugins (see PluginBase.publish), job thread: saves a batch result and
+        posts its import, the next results are still being processed.
+        """
+        asset_path = media.save(self.asset_save_path)
+        self.gui_manager.post(self._import_streamed, button_name, media, asset_path)
+
+    def _import_streamed(self, button_name, media, asset_path):
+        """
+        Tk thread: imports one batch result and appends it to the timeline.
+        """
+        with self._profile(button_name):
+            clip = self._import_to_bin(asset_path, media.get_filename())
+            if clip and not self.backgrounded:
+                listClips = self.davinciAPI.add_to_timeline([{
+                    "mediaPoolItem": clip,
+                }])
+                self._place_autocropped(listClips, asset_path)
+        if clip:
+            self._attach_proxy(clip, asset_path)
+
+    def _import_to_bin(self, asset_path, clip_name):
+        """
+        Adds a saved asset to the ClipRocks bin and returns its media pool item.
+        """
+        # Étape 3 : Ajouter au bin
+        binFolder = self.davinciAPI.get_or_create_bin()
+        items = self.davinciAPI.add_to_bin(binFolder, asset_path)
+        clip = self.davinciAPI.get_item_by_name(items, clip_name)
+        if clip:
+            return clip
+
+        # already in the media pool: nothing new was added
+        currentFolder = self.davinciAPI.getCurrentFolder()
+        clips = currentFolder.GetClipList()
+        return self.davinciAPI.get_item_by_name(clips, clip_name)
+
+    def _record_paste(self, button_name, hashes, asset_path, clip_name, clipboard_element=None):
+        """
+        Remembers the clip produced for this content (AssetCatalog) and this clipboard (PasteMemo).
+        `clipboard_element` is the one the plugin ran on (ClipSnapshot of a queued job).
+        """
+        clipboard_element = clipboard_element or self.clipboard_element
+        if self.asset_catalog:
+            self.asset_catalog.add(hashes, asset_path, clip_name)
+        if self.paste_memo:
+            self.paste_memo.record(
+                button_name,
+                self.davinciAPI.project_name,
+                clipboard_element.get_sequence_number(),
+                sorted(clipboard_element.get_format_ids()),
+                clipboard_element.get_content_hash(),
+                asset_path,
+                clip_name,
+                self._result_options(button_name)
+            )
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Optimistic paste : preview on the timeline first, plugin result swapped in later
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def _run_optimistic_job(self, button_name, plugin_instance, job, preview, queued_job=None):
+        """
+        Job worker of plugins providing a `preview`: the preview is saved and appended (Tk
+        thread, see _import_placeholder), the window closes, then `execute` runs here and its
+        result replaces the preview clip. The script ends once the replacement is done (see
+        HandlePlugins), Resolve calls are made from this thread since the GUI is gone.
+        """
+        placeholder = {}
+        try:
+            with self._profile(button_name):
+                job.set_stage("Saving preview")
+                preview_path = preview.save(self.asset_save_path)
+
+            ready = threading.Event()
+            self.gui_manager.post(self._import_placeholder, button_name, preview, preview_path, placeholder, ready)
+            ready.wait()
+            clip = placeholder.get("clip")
+            if not clip:
+                return
+
+            with self._profile(button_name):
+                media = self._execute(button_name, plugin_instance, job, queued_job)
+                asset_SAVED_path = media.save(self.asset_save_path)
+                replaced_path = self.davinciAPI.replace_clip(clip, asset_SAVED_path, preview_path)
+                if replaced_path:
+                    asset_SAVED_path = replaced_path
+                    items = placeholder.get("items")
+                else:
+                    # result in another format than the preview: a new clip takes its place
+                    clip, items = self._swap_placeholder(clip, placeholder.get("items"), media, asset_SAVED_path)
+                if asset_SAVED_path != preview_path and os.path.exists(preview_path):
+                    os.remove(preview_path)
+                self._place_autocropped(items, asset_SAVED_path)
+                clip_name = clip.GetName()
+
+            result_hash = self._result_hash(plugin_instance)
+            hashes = [result_hash or self.asset_catalog.hash_file(asset_SAVED_path)] if self.asset_catalog else []
+            self._record_paste(button_name, hashes, asset_SAVED_path, clip_name, plugin_instance.clipboard_element)
+            self._attach_proxy(clip, asset_SAVED_path)
+        except (JobCancelled, SystemExit):
+            pass
+        except Exception as e:
+            print(f"Plugin '{button_name}' failed, the preview stays on the timeline: {e}")
+            plugin_instance.invalidate_install()
+        finally:
+            self._dump_profile(button_name)
+            if not placeholder.get("clip"):
+                self.gui_manager.post(self._close)
+
+    def _swap_placeholder(self, placeholder_clip, placeholder_items, media, asset_path):
+        """
+        Fallback of replace_clip: imports and appends the result, then deletes the preview clip
+        and its timeline items. Returns (clip, timeline items) of the result.
+        """
+        clip = self._import_to_bin(asset_path, media.get_filename())
+        if not clip:
+            raise RuntimeError(f"Could not import {asset_path}")
+        listClips = self.davinciAPI.add_to_timeline([{
+            "mediaPoolItem": clip,
+        }])
+        if not self.davinciAPI.remove_clip(placeholder_clip, placeholder_items):
+            print(f"Could not delete the preview clip {placeholder_clip.GetName()}")
+        return clip, listClips
+
+    def _import_placeholder(self, button_name, preview, preview_path, placeholder, ready):
+        """
+        Tk thread: imports and appends the preview, then closes the window while the plugin
+        keeps running in the background.
+        """
+        try:
+            with self._profile(button_name):
+                clip = self._import_to_bin(preview_path, preview.get_filename())
+                if clip:
+                    listClips = self.davinciAPI.add_to_timeline([{
+                        "mediaPoolItem": clip,
+                    }])
+                    placeholder["clip"] = clip
+                    placeholder["items"] = listClips
+        finally:
+            ready.set()
+        if placeholder.get("clip"):
+            self.gui_manager.exit()
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Job queue : turn of the heavy plugins, background jobs, recovery of orphan jobs
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def _enqueue(self, button_name, plugin_instance, job):
+        """
+        Journals the run of a heavy plugin and takes its slots when they are free. Otherwise the
+        clipboard is captured right away (ClipSnapshot), the plugin will run on that copy: the
+        user may copy the next image while this one waits. Returns the QueuedJob, or None
+        for plugins running at once.
+        """
+        if not self.job_queue:
+            return None
+        try:
+            requirements = plugin_instance.job_requirements(self.clipboard_element)
+            if not requirements:
+                return None
+            queued_job = self.job_queue.submit(
+                plugin_instance.__class__.__name__, button_name, requirements, self.davinciAPI.project_name
+            )
+            if not self.job_queue.try_acquire(queued_job):
+                job.set_stage("Queued")
+                folder = self.job_queue.input_folder(queued_job)
+                plugin_instance.clipboard_element = ClipSnapshot.capture(self.clipboard_element, folder)
+                self.job_queue.set_input(queued_job, folder)
+            return queued_job
+        except Exception as e:
+            print(f"Job queue unavailable, running '{button_name}' at once: {e}")
+            return None
+
+    def _execute(self, button_name, plugin_instance, job, queued_job=None):
+        """
+        Result of the plugin: from the shared store when a seat of the team already made it,
+        else stored once saved (see Media.store_key).
+        """
+        store_key = self._store_key(plugin_instance)
+        if store_key:
+            stored = self.shared_store.get(store_key)
+            if stored:
+                media = Media(mime_type=stored[1].get("mime_type", "image/png"), path=stored[0])
+            else:
+                media = self._run_execute(button_name, plugin_instance, job, queued_job)
+            if media:
+                media.store, media.store_key = self.shared_store, store_key
+            return media
+        return self._run_execute(button_name, plugin_instance, job, queued_job)
+
+    def _store_key(self, plugin_instance):
+        return self._result_key(plugin_instance) if self.shared_store else None
+
+    def _result_key(self, plugin_instance):
+        """
+        "<plugin class>:<key>" of the result the plugin makes for its clipboard: input content
+        hash and options (see PluginBase.store_key), None for plugins without one.
+        """
+        try:
+            key = plugin_instance.store_key(plugin_instance.clipboard_element)
+        except Exception as e:
+            print(f"Plugin '{plugin_instance.pluginName}' result key failed: {e}")
+            return None
+        return f"{plugin_instance.__class__.__name__}:{key}" if key else None
+
+    def _result_hash(self, plugin_instance):
+        """
+        AssetCatalog hash of the plugin result (see _result_key), None without catalog or key.
+        """
+        if not self.asset_catalog:
+            return None
+        key = self._result_key(plugin_instance)
+        return self.asset_catalog.hash_key(key) if key else None
+
+    def _lookup_result(self, result_hash):
+        """
+        Catalog entry of an AI result whose clip is still in the bin, or None (job thread, the
+        Resolve calls go through the session dispatcher).
+        """
+        existing = self.asset_catalog.lookup(result_hash)
+        try:
+            if existing and self._find_bin_clip(existing["clip_name"]):
+                return existing
+        except Exception as e:
+            print(f"Project assets not checked: {e}")
+        return None
+
+    def _run_execute(self, button_name, plugin_instance, job, queued_job=None):
+        """
+        Runs the plugin on an inference node when it can (see _execute_remote), otherwise here
+        after its turn in the job queue.
+        """
+        if self._is_remote(plugin_instance):
+            media = self._execute_remote(plugin_instance, job)
+            if media:
+                return media
+            # no node could run it: local run, queued like any other
+            queued_job = self._enqueue(button_name, plugin_instance, job)
+            try:
+                self._wait_turn(queued_job, job)
+                return plugin_instance.execute(plugin_instance.clipboard_element)
+            finally:
+                if queued_job:
+                    self.job_queue.finish(queued_job)
+
+        self._wait_turn(queued_job, job)
+        return plugin_instance.execute(plugin_instance.clipboard_element)
+
+    def _is_remote(self, plugin_instance):
+        return bool(self.inference_client) and plugin_instance.remote_capable(plugin_instance.clipboard_element)
+
+    def _execute_remote(self, plugin_instance, job):
+        """
+        Streams the clipboard image (cache input, see PluginBase.get_cache_input) to the least
+        busy inference node and returns the result as the plugin would, or None.
+        """
+        job.set_stage("Looking for an inference node")
+        media = plugin_instance.get_cache_input()
+        output_root = f"{os.path.splitext(media.get_path())[0]}-{plugin_instance.pluginName}"
+        output_path = self.inference_client.run(
+            plugin_instance.__class__.__name__, media.get_path(), output_root, job
+        )
+        if not output_path:
+            return None
+        extension = os.path.splitext(output_path)[1][1:]
+        mime_type = next((mime for mime, ext in Media.IMAGE_EXTENSIONS.items() if ext == extension), "image/png")
+        media.update_mimeType_path(mime_type, output_path)
+        return media
+
+    def _wait_turn(self, queued_job, job):
+        """
+        Blocks until `queued_job` got its slots (raises JobCancelled if the user cancels).
+        """
+        if not queued_job or queued_job.running:
+            return
+        self.job_queue.acquire(
+            queued_job,
+            check_cancelled=job.check_cancelled,
+            on_wait=lambda ahead: job.set_stage(f"Queued ({ahead} job(s) ahead)")
+        )
+        job.set_stage("Starting")
+
+    def _send_to_background(self):
+        """
+        "Background" button of the progress window (Tk thread): hides the window, the job goes on
+        and its result is only added to the bin, the editor has moved on in the timeline.
+        """
+        self.backgrounded = True
+        self.gui_manager.hide()
+
+    def _is_recovering(self):
+        return bool(self.recovery_thread and self.recovery_thread.is_alive())
+
+    def _recover_jobs(self):
+        """
+        Recovery worker: runs the orphan jobs of the current project (their process died while
+        they waited: killed, Resolve closed) from their input snapshot, through the queue like any
+        job. The results are imported in the bin once the window is closed (see
+        _import_recovered). If this process ends first, the jobs are orphans again and the next
+        ClipRocks run takes them over.
+        """
+        orphans = [entry for entry in self.job_queue.orphans() if entry.get("project") == self.davinciAPI.project_name]
+        if not orphans:
+            return
+
+        from plugins.pluginBase import plugin_registry
+        self._load_plugins()
+
+        for entry in orphans:
+            queued_job = self.job_queue.adopt(entry)
+            if not queued_job:
+                continue
+            if queued_job.entry["state"] == "done":
+                self.recovered_jobs.append(queued_job)
+                continue
+
+            results = []
+            try:
+                snapshot = ClipSnapshot(entry["input"])
+                plugin_instance = plugin_registry[entry["plugin"]](
+                    configRoot = self.config,
+                    venv = self.venv,
+                    clipboard_element = snapshot,
+                    cache_save_path = self.cache_save_path,
+                    davinciAPI = self.davinciAPI,
+                    install_registry = self.install_registry,
+                    shared_store = self.shared_store
+                )
+                plugin_instance.job = Job(entry["button"])
+                plugin_instance.media_sink = lambda media: results.append(
+                    (media.save(self.asset_save_path), media.get_filename())
+                )
+
+                self.job_queue.acquire(queued_job)
+                media = plugin_instance.execute(snapshot)
+                if media:
+                    results.append((media.save(self.asset_save_path), media.get_filename()))
+            except Exception as e:
+                print(f"Queued job '{entry['button']}' failed: {e}")
+                self.job_queue.finish(queued_job)
+                continue
+
+            self.job_queue.complete(queued_job, results)
+            self.recovered_jobs.append(queued_job)
+
+    def _import_recovered(self):
+        """
+        Imports the results of the recovered jobs in the bin (main thread, window closed).
+        """
+        for queued_job in self.recovered_jobs:
+            try:
+                for asset_path, clip_name in queued_job.entry.get("results", []):
+                    if os.path.exists(asset_path):
+                        self._import_to_bin(asset_path, clip_name)
+            except Exception as e:
+                print(f"Import of queued job '{queued_job.entry['button']}' failed: {e}")
+            self.job_queue.finish(queued_job)
+        self.recovered_jobs = []
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Speculative work while the menu is open : warm up of the likely plugin, clipboard capture
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def _button_order(self, format_ids, button_name, order):
+        """
+        Menu position of a button: most clicked first for these formats, then the registry order.
+        """
+        if not self.usage_stats:
+            return order
+        return (-self.usage_stats.score(format_ids, button_name), order)
+
+    def _start_warm_up(self, plugin_instance):
+        """
+        Warms up the plugin the user will most likely click (install check, model files read
+        ahead, worker started) in background, while the mouse moves to the button.
+        """
+        self.warm_plugin = plugin_instance
+
+        def warm_up():
+            try:
+                plugin_instance.warm_up()
+            except Exception as e:
+                print(f"Plugin '{plugin_instance.pluginName}' warm up failed: {e}")
+
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    def _cancel_warm_up(self, keep=None):
+        """
+        Stops the speculative work when another button is chosen (or the script ends).
+        """
+        if self.warm_plugin and self.warm_plugin is not keep:
+            self.warm_plugin.cancel_warm_up()
+            self.warm_plugin = None
+
+    def _discard_capture(self):
+        """
+        Removes the speculative clipboard capture if no plugin took it.
+        """
+        if self.clipboard_capture:
+            self.clipboard_capture.discard()
+            self.clipboard_capture = None
+
+    def _paste_from_memo(self, button_name):
+        """
+        Repeat paste: if `button_name` already produced a clip for this clipboard content, appends
+        that clip again (no decode, no save, no import) and closes. Returns False otherwise.
+        """
+        if not self.paste_memo:
+            return False
+
+        entry = self.paste_memo.lookup(
+            button_name,
+            self.davinciAPI.project_name,
+            self.clipboard_element.get_sequence_number(),
+            sorted(self.clipboard_element.get_format_ids()),
+            self.clipboard_element.get_content_hash,
+            self._result_options(button_name)
+        )
+        if not entry:
+            return False
+
+        with self._profile(button_name):
+            clip = self._find_bin_clip(entry["clip_name"])
+            if not clip:
+                # removed from the bin since, paste it again
+                self.paste_memo.forget(entry)
+                return False
+            listClips = self.davinciAPI.add_to_timeline([{
+                "mediaPoolItem": clip,
+            }])
+            self._place_autocropped(listClips, entry["path"])
+        self._dump_profile(button_name)
+        self._close()
+        return True
+
+    def _result_options(self, button_name):
+        """
+        Options the result of `button_name` depends on (see PluginBase.result_options).
+        """
+        plugin_instance = self.button_registry.get(button_name)
+        if not plugin_instance:
+            return None
+        try:
+            return plugin_instance.result_options()
+        except Exception as e:
+            print(f"Plugin '{button_name}' result options failed: {e}")
+            return None
+
+    def _place_autocropped(self, timeline_items, asset_path):
+        """
+        Cutouts saved cropped to their alpha bounds (see RemBg `autocrop`): the appended timeline
+        item is moved and zoomed to where the full canvas version would have been.
+        """
+        autocrop = Media.read_autocrop(asset_path)
+        if not autocrop or not timeline_items:
+            return
+        if not self.davinciAPI.place_cropped(timeline_items[0], autocrop["box"], autocrop["size"]):
+            print(f"Transform of the cropped cutout refused by Resolve: {asset_path}")
+
+    def _attach_proxy(self, clip, asset_path):
+        """
+        Links the cached proxy of `asset_path` to `clip`, or starts its generation when the asset
+        is heavy (linked in _link_pending_proxies).
+        """
+        if not self.proxy_generator or not os.path.isfile(asset_path):
+            return
+        try:
+            proxy_path = self.proxy_generator.cached(asset_path)
+            if proxy_path:
+                clip.LinkProxyMedia(proxy_path)
+            elif self.proxy_generator.needs_proxy(asset_path):
+                self.pending_proxies.append((clip, self.proxy_generator.submit(asset_path)))
+        except Exception as e:
+            print(f"Proxy generation failed for {asset_path}: {e}")
+
+    def _link_pending_proxies(self):
+        """
+        Waits for the proxies being generated and links them, after the window is closed.
+        """
+        for clip, future in self.pending_proxies:
+            try:
+                clip.LinkProxyMedia(future.result())
+            except Exception as e:
+                print(f"Proxy generation failed: {e}")
+        self.pending_proxies = []
+        self.proxy_generator.shutdown()
+
+    def _find_bin_clip(self, clip_name):
+        """
+        Returns the media pool item `clip_name` of the ClipRocks bin, or None.
+        """
+        binFolder = self.davinciAPI.get_or_create_bin()
+        return self.davinciAPI.get_item_by_name(binFolder.GetClipList(), clip_name)
+
+    def _close(self):
+        """
+        Closes the GUI and ends the script.
+        """
+        self._cancel_warm_up()
+        self._discard_capture()
+        self.gui_manager.exit()
+        if self.shared_store:
+            self.shared_store.flush(self.config.read_option("shared_store_flush_timeout"))
+        sys.exit(0)
             
     def HandlePlugins(self):
         """
@@ -282,37 +1101,92 @@ class ClipRocks:
         are displayed in the GUI for interaction.
 
         1. Retrieves the format IDs from the clipboard element.
-        2. Iterates through each plugin registered in `plugin_registry`and instanciate each plugin
-        3. Checks plugin compatibility with clipboard format IDs, display if ok. 
-        4. after loop, run GUI. 
+        2. Starts the plugin loader in background (see _load_plugin_buttons).
+        3. Runs the GUI right away, buttons appear as each plugin qualifies.
         """
         format_ids = self.clipboard_element.get_format_ids()
 
         # activate main venv
         self.venv.activate_for_current_process()
 
+        # the image the AI plugins will read is decoded and saved while the user chooses
+        if 2 in format_ids and self.config.read_option("speculative_capture"):
+            self.clipboard_capture = ClipCapture(self.clipboard_element, self.cache_save_path).start()
+
+        threading.Thread(target=self._load_plugin_buttons, args=(format_ids,), daemon=True).start()
+
+        # orphan jobs of the queue run again in background (see _recover_jobs)
+        if self.job_queue:
+            self.recovery_thread = threading.Thread(target=self._recover_jobs, daemon=True)
+            self.recovery_thread.start()
+
+        # Run the GUI, buttons are registered while it runs
+        self.gui_manager.run()
+
+        # optimistic paste: the window is closed, the plugin still replaces its preview
+        if self.plugin_thread:
+            self.plugin_thread.join()
+
+        # menu dismissed (warm up worker still waiting), or the plugin didn't need the image
+        self._cancel_warm_up()
+        self._discard_capture()
+
+        if self.pending_proxies:
+            self._link_pending_proxies()
+
+        if self.recovery_thread:
+            self.recovery_thread.join()
+            self._import_recovered()
+
+        if self.shared_store:
+            self.shared_store.flush(self.config.read_option("shared_store_flush_timeout"))
+
+    def _load_plugin_buttons(self, format_ids):
+        """
+        Background plugin loader: imports the plugins, then instantiates each plugin and checks
+        its compatibility with the clipboard format IDs in its own worker, so a slow plugin does
+        not delay the buttons of the others. Buttons keep the registry order.
+        """
         # load plugin registry
         from plugins.pluginBase import plugin_registry
 
         # dynamic import plugins after venv
         self._load_plugins()
 
-        for plugin_name, plugin_class in plugin_registry.items():
-            plugin_instance = None
-
-            plugin_instance = plugin_class(
-                configRoot = self.config,
-                venv = self.venv, 
-                clipboard_element = self.clipboard_element, 
-                cache_save_path = self.cache_save_path
-            )
-
-            if plugin_instance.check_condition(format_ids):
-                button = plugin_instance.display_button()
-                self.register_button(button, plugin_instance)
-
-        # Run the GUI after all buttons are registered
-        self.gui_manager.run()
-                
-ClipRocks = ClipRocks(resolve)
-ClipRocks.HandlePlugins()
\ No newline at end of file
+        # the button this user usually clicks for this clipboard is warmed up as soon as it shows
+        likely_button = None
+        if self.usage_stats and self.config.read_option("speculative_warm_up"):
+            likely_button = self.usage_stats.likely_button(format_ids)
+
+        def load(order, plugin_class):
+            try:
+                plugin_instance = plugin_class(
+                    configRoot = self.config,
+                    venv = self.venv, 
+                    clipboard_element = self.clipboard_element, 
+                    cache_save_path = self.cache_save_path,
+                    davinciAPI = self.davinciAPI,
+                    install_registry = self.install_registry,
+                    clipboard_capture = self.clipboard_capture,
+                    shared_store = self.shared_store
+                )
+
+                if plugin_instance.check_condition(format_ids):
+                    button = plugin_instance.display_button()
+                    self.register_button(button, plugin_instance, self._button_order(format_ids, button, order))
+                    plugin_instance.prefetch(format_ids)
+                    if button == likely_button:
+                        self._start_warm_up(plugin_instance)
+            except Exception as e:
+                print(f"Plugin '{plugin_class.__name__}' failed to load: {e}")
+
+        plugins = list(plugin_registry.values())
+        with ThreadPoolExecutor(max_workers=max(1, len(plugins))) as executor:
+            for order, plugin_class in enumerate(plugins):
+                executor.submit(load, order, plugin_class)
+
+        self.gui_manager.loading_finished()
+
+if __name__ == "__main__":
+    ClipRocks = ClipRocks(resolve)
+    ClipRocks.HandlePlugins()
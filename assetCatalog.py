@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import re
+import mmap
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# files are hashed by chunks of this size, in parallel (hashlib releases the GIL)
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class AssetCatalog:
+    """
+    Content hashes of the files ClipRocks imported in a project -> their media pool clip, so the
+    same image or video arriving by another route (URL, file copy, identical screenshot) reuses
+    the clip instead of being saved and imported again.
+
+    One JSON file per project in the catalog folder: { hash: {"path": ..., "clip_name": ...} }.
+    An asset can be known under several hashes (the content received and the file saved).
+    """
+
+    def __init__(self, folder, project_name, workers=None):
+        """
+        :param folder: folder of the catalogs (one file per project).
+        :param project_name: current DaVinci Resolve project.
+        :param workers: hashing threads for large files (default: cpu count).
+        """
+        os.makedirs(folder, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]', "_", project_name or "default")
+        self.path = os.path.join(folder, f"{safe_name}.json")
+        self.workers = workers or os.cpu_count() or 1
+        self.entries = None
+
+    def _load(self):
+        if self.entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.entries = {}
+        return self.entries
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Hashing
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def hash_buffer(self, buffer):
+        """
+        Hash of a bytes-like content: blake2b of the blake2b of each CHUNK_SIZE chunk, the chunks
+        being hashed in parallel. Same result for bytes and for the file holding them.
+        """
+        view = memoryview(buffer)
+        chunks = [view[start:start + CHUNK_SIZE] for start in range(0, len(view), CHUNK_SIZE)] or [view]
+
+        def digest(chunk):
+            return hashlib.blake2b(chunk, digest_size=32).digest()
+
+        if len(chunks) == 1:
+            digests = [digest(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+                digests = list(executor.map(digest, chunks))
+
+        root = hashlib.blake2b(digest_size=16)
+        root.update(len(view).to_bytes(8, "little"))
+        for chunk_digest in digests:
+            root.update(chunk_digest)
+        del chunks, view
+        return root.hexdigest()
+
+    def hash_file(self, path):
+        """
+        Hashes a file through a read-only memory map, no copy of the content in memory.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.hash_buffer(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.hash_buffer(mapped)
+
+    @staticmethod
+    def hash_key(key):
+        """
+        Catalog hash of a result known by its input rather than its content (AI plugins:
+        input hash + options), never equal to a content hash.
+        """
+        return "result:" + hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def hash_media(self, media):
+        """
+        Hash of a media before it is saved: its encoded bytes or the file it comes from.
+        None when the content only exists once saved (clipboard bitmap, URL, ...).
+        """
+        if isinstance(media.raw_content, (bytes, bytearray)):
+            return self.hash_buffer(media.raw_content)
+        if media.path and os.path.isfile(media.path):
+            return self.hash_file(media.path)
+        return None
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Catalog
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def lookup(self, content_hash):
+        """
+        Returns {"hash", "path", "clip_name"} of the asset already imported with this content,
+        or None. The asset file must still exist.
+        """
+        if not content_hash:
+            return None
+        entry = self._load().get(content_hash)
+        if entry and os.path.exists(entry["path"]):
+            return {"hash": content_hash, **entry}
+        return None
+
+    def add(self, hashes, path, clip_name):
+        """
+        Records the imported asset under each of `hashes` (None values ignored).
+        """
+        entries = self._load()
+        for content_hash in filter(None, hashes):
+            entries[content_hash] = {"path": path, "clip_name": clip_name}
+        self._save()
+
+    def forget(self, entry):
+        """
+        Removes every hash pointing to the asset of `entry` (its clip left the bin).
+        """
+        entries = self._load()
+        for content_hash in [h for h, e in entries.items() if e["path"] == entry["path"]]:
+            del entries[content_hash]
+        self._save()
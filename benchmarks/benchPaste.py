@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+    End-to-end paste benchmark, without DaVinci Resolve nor Windows.
+
+    The real engine (ClipRocks, plugins, Media.save, DaVinciAPI) runs from a temporary copy of the
+    script folder against an in-memory Resolve (FakeResolve, configurable per-call latency) and a
+    synthetic clipboard (FakeClipboard): bitmaps of several sizes (DIB only, DIB + encoded PNG,
+    DIB + CF_HTML <img> original), URLs served by a local HTTP server, file lists and a batch
+    upscale through an upscayl-bin stand-in (stubUpscayl.py). Each paste is timed per phase and
+    compared with a stored baseline.
+
+        python benchmarks/benchPaste.py                      # run + compare with baseline.json
+        python benchmarks/benchPaste.py --save-baseline      # run + store as baseline.json
+        python benchmarks/benchPaste.py --runs 10 --latency-ms 1 --sizes 1920x1080,7680x4320
+
+    Exit code is 1 when a scenario makes more native Resolve calls than the baseline: counts of
+    the first paste (bin created) and of the next ones, deterministic whatever the machine and
+    --runs. Timings only give advisory SLOWER lines (phase slower by more than --threshold and
+    --min-delta-ms): they swing from one run to the next and depend on the machine, store your
+    own baseline (--save-baseline) before reading them.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import contextlib
+import statistics
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fakeResolve import FakeResolve
+from fakeClipboard import FakeClipboard
+
+# clicked button for every scenario (PastePlugin.display_button), but upscale-* (Upscale)
+PASTE_BUTTON = "Ajouter"
+UPSCALE_BUTTON = "UpScale"
+
+
+class HeadlessGUI:
+    """
+    GUIManager replacement: records buttons, never opens a Tk window. `run` waits for the
+    background plugin loader, like a user who waits for the whole menu, then clicks (`on_menu`)
+    while the menu is still open.
+    """
+    def __init__(self, cliprocks):
+        self.cliprocks = cliprocks
+        self.buttons = []
+        self.first_button_at = None
+        self.on_menu = None
+        self.loaded = threading.Event()
+        self.closed = threading.Event()
+
+    def show(self):
+        pass
+
+    def post(self, callback, *args):
+        callback(*args)
+
+    def add_button(self, button_name, plugin_instance, order=0):
+        if self.first_button_at is None:
+            self.first_button_at = time.perf_counter()
+        self.buttons.append(button_name)
+
+    def loading_finished(self):
+        self.loaded.set()
+
+    def show_progress(self, job, on_cancel=None, on_background=None):
+        pass
+
+    def hide(self):
+        pass
+
+    def run(self):
+        self.loaded.wait(timeout=60)
+        if self.on_menu:
+            self.on_menu()
+
+    def exit(self):
+        self.closed.set()
+
+    def disable_close_focus_out(self):
+        pass
+
+    def enable_close_focus_out(self):
+        pass
+
+    def show_install_dialog(self, venvPath):
+        return False
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time per phase for the current paste. Methods of the engine are wrapped so
+    the engine itself is run unmodified.
+    """
+    def __init__(self):
+        self.current = defaultdict(float)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - start
+
+    def wrap_function(self, function, name):
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def wrap_method(self, owner, method_name, name):
+        setattr(owner, method_name, self.wrap_function(getattr(owner, method_name), name))
+
+    def pop(self):
+        current, self.current = dict(self.current), defaultdict(float)
+        return current
+
+
+class PayloadHandler(BaseHTTPRequestHandler):
+    """
+    Serves the in-memory `payloads` { path: (bytes, content type) }.
+    """
+    payloads = {}
+
+    def do_GET(self):
+        if self.path not in self.payloads:
+            self.send_error(404)
+            return
+        data, content_type = self.payloads[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PasteBenchmark:
+    def __init__(self, runs=5, latency=0.0, sizes=((640, 480), (1920, 1080), (3840, 2160)), files=20,
+                 existing_bins=0, existing_clips=0, batch=12):
+        self.runs = runs
+        self.latency = latency
+        self.sizes = sizes
+        self.files = files
+        self.batch = batch
+        self.existing_bins = existing_bins
+        self.existing_clips = existing_clips
+        self.timer = PhaseTimer()
+        self.clipboard = FakeClipboard()
+        self.workspace = tempfile.mkdtemp(prefix="cliprocks-bench-")
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Setup : script copy, config, venv layout, fakes, HTTP server
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def setup(self):
+        script_dir = os.path.join(self.workspace, "ClipRocks")
+        os.makedirs(script_dir)
+        for name in os.listdir(SCRIPT_DIR):
+            if name.endswith(".py"):
+                shutil.copy(os.path.join(SCRIPT_DIR, name), script_dir)
+        shutil.copytree(
+            os.path.join(SCRIPT_DIR, "plugins"), os.path.join(script_dir, "plugins"),
+            ignore=shutil.ignore_patterns("__pycache__", "*.conf")
+        )
+
+        self.clipboard.install()
+        sys.path.insert(0, script_dir)
+        from plugins.configManager import ConfigManager
+
+        base_root = os.path.join(self.workspace, "storage", "ClipRocks")
+        config = {
+            "rootName": "ClipRocks",
+            "binName": "__ClipRocks__",
+            "base": os.path.join(self.workspace, "storage"),
+            "abs_path_script": os.path.join(script_dir, "ClipRocks.py"),
+            "abs_dir_script": script_dir,
+            "baseRoot": base_root,
+            "venv": os.path.join(base_root, "venv"),
+            "assets": os.path.join(base_root, "assets"),
+            "cache": os.path.join(base_root, "cache"),
+            "plugins": os.path.join(base_root, "plugins"),
+            "memoize_pastes": False,
+            "asset_catalog": False,
+        }
+        self.config = ConfigManager(script_dir)
+        self.config.write_config(config)
+
+        # Upscale runs the upscayl-bin stand-in (stubUpscayl.py) through a launcher
+        upscayl_dir = os.path.join(self.workspace, "upscayl")
+        os.makedirs(upscayl_dir)
+        stub = os.path.join(BENCH_DIR, "stubUpscayl.py")
+        if os.name == "nt":
+            launcher = os.path.join(upscayl_dir, "upscayl-bin.bat")
+            with open(launcher, "w") as f:
+                f.write(f'@"{sys.executable}" "{stub}" %*\n')
+        else:
+            launcher = os.path.join(upscayl_dir, "upscayl-bin")
+            with open(launcher, "w") as f:
+                f.write(f'#!/bin/sh\nexec "{sys.executable}" "{stub}" "$@"\n')
+            os.chmod(launcher, 0o755)
+        ConfigManager(script_dir, pluginName="upscale").write_config({
+            "project_base": upscayl_dir,
+            "script_name": os.path.basename(launcher),
+        })
+        os.makedirs(os.path.join(config["venv"], "Lib", "site-packages"))
+        os.makedirs(os.path.join(config["venv"], "lib", f"python{sys.version_info[0]}.{sys.version_info[1]}", "site-packages"))
+
+        import ClipRocks as cliprocks_module
+        from plugins.media import Media
+        from davinciAPI import DaVinciAPI
+        cliprocks_module.GUIManager = HeadlessGUI
+        self.cliprocks_module = cliprocks_module
+
+        self.timer.wrap_method(Media, "save", "save")
+        for method_name in ("get_or_create_bin", "add_to_bin"):
+            self.timer.wrap_method(DaVinciAPI, method_name, "bin")
+        for method_name in ("getCurrentFolder", "get_item_by_name", "add_to_timeline"):
+            self.timer.wrap_method(DaVinciAPI, method_name, "timeline")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PayloadHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def teardown(self):
+        self.server.shutdown()
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Scenarios
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def scenarios(self):
+        """
+        Yields (name, function putting the scenario content on the clipboard).
+        """
+        for width, height in self.sizes:
+            image = FakeClipboard.make_image(width, height)
+            yield f"bitmap-{width}x{height}", lambda image=image: self.clipboard.set_image(image)
+
+        # browser copy: DIB + the encoded file registered as "PNG"
+        for width, height in self.sizes:
+            image = FakeClipboard.make_image(width, height)
+            yield f"png-{width}x{height}", lambda image=image: self.clipboard.set_image(image, encoded_format="PNG")
+
+        for width, height in self.sizes:
+            buffer = io.BytesIO()
+            FakeClipboard.make_image(width, height).save(buffer, format="JPEG", quality=90)
+            path = f"/image-{width}x{height}.jpg"
+            PayloadHandler.payloads[path] = (buffer.getvalue(), "image/jpeg")
+            url = f"http://127.0.0.1:{self.server.server_port}{path}"
+            yield f"url-{width}x{height}", lambda url=url: self.clipboard.set_text(url)
+
+        # browser copy of a downscaled <img>: quarter size bitmap, original fetched from CF_HTML
+        for width, height in self.sizes:
+            buffer = io.BytesIO()
+            image = FakeClipboard.make_image(width, height)
+            image.save(buffer, format="JPEG", quality=90)
+            path = f"/original-{width}x{height}.jpg"
+            PayloadHandler.payloads[path] = (buffer.getvalue(), "image/jpeg")
+            thumbnail = image.resize((max(1, width // 4), max(1, height // 4)))
+            fragment = f'<img src="/thumb.jpg" srcset="/thumb.jpg 1x, {path} 4x" alt="">'
+            source = f"http://127.0.0.1:{self.server.server_port}/page.html"
+
+            def prepare(thumbnail=thumbnail, fragment=fragment, source=source):
+                self.clipboard.set_image(thumbnail)
+                self.clipboard.add_html(fragment, source)
+            yield f"html-{width}x{height}", prepare
+
+        files_dir = os.path.join(self.workspace, "files")
+        os.makedirs(files_dir, exist_ok=True)
+        paths = []
+        for index in range(self.files):
+            path = os.path.join(files_dir, f"file{index}.png")
+            FakeClipboard.make_image(64, 64).save(path)
+            paths.append(path)
+        yield f"files-{self.files}", lambda: self.clipboard.set_files(paths)
+
+        # storyboard upscale: one upscayl-bin process for the whole folder, frames imported as they land
+        frames_dir = os.path.join(self.workspace, "frames")
+        os.makedirs(frames_dir, exist_ok=True)
+        frames = []
+        for index in range(self.batch):
+            path = os.path.join(frames_dir, f"frame{index:03d}.png")
+            FakeClipboard.make_image(320, 180).save(path)
+            frames.append(path)
+        yield f"upscale-batch-{self.batch}", lambda: self.clipboard.set_files(frames)
+
+        # same clipboard pasted again (PasteMemo enabled): only the first run saves and imports
+        for width, height in self.sizes:
+            image = FakeClipboard.make_image(width, height)
+
+            def prepare(image=image, state={}):
+                if state.get("image") is not image:
+                    state["image"] = image
+                    self.clipboard.set_image(image)
+            yield f"repeat-{width}x{height}", prepare
+
+        # same content copied again (AssetCatalog enabled): found by hash before the save
+        for width, height in self.sizes:
+            image = FakeClipboard.make_image(width, height)
+            yield f"dedupe-{width}x{height}", lambda image=image: self.clipboard.set_image(image, encoded_format="PNG")
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Run
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def paste_once(self, resolve, button=PASTE_BUTTON):
+        """
+        One shortcut press: engine init, plugin loading, click on the paste button.
+        Returns (phases in seconds, asset bytes written).
+        """
+        resolve.session.reset()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.timer.phase("init"):
+                cliprocks = self.cliprocks_module.ClipRocks(resolve)
+            assets_before = self._folder_size(cliprocks.asset_save_path)
+
+            def click():
+                plugin_instance = cliprocks.button_registry.get(button)
+                if plugin_instance:
+                    plugin_instance.execute = self.timer.wrap_function(plugin_instance.execute, "execute")
+                with self.timer.phase("click"):
+                    try:
+                        cliprocks.on_button_click(button)
+                    except SystemExit:
+                        pass
+                    # the plugin runs as a background job, wait for the window to close
+                    cliprocks.gui_manager.closed.wait(timeout=120)
+
+            # the click happens within the GUI loop (menu still open), it is not a plugin load
+            cliprocks.gui_manager.on_menu = click
+            with self.timer.phase("plugins"):
+                cliprocks.HandlePlugins()
+
+        phases = self.timer.pop()
+        phases["plugins"] -= phases.get("click", 0)
+        if cliprocks.gui_manager.first_button_at:
+            phases["first_button"] = cliprocks.gui_manager.first_button_at - started
+        phases["total"] = phases["init"] + phases["plugins"] + phases["click"]
+        phases["resolve_calls"] = sum(resolve.session.calls.values())
+        return phases, self._folder_size(cliprocks.asset_save_path) - assets_before
+
+    def run(self):
+        results = {}
+        for name, prepare in self.scenarios():
+            self.config.write_options({
+                "memoize_pastes": name.startswith("repeat-"),
+                "asset_catalog": name.startswith("dedupe-"),
+            })
+            resolve = FakeResolve(
+                latency=self.latency,
+                existing_bins=self.existing_bins,
+                existing_clips=self.existing_clips
+            )
+            samples = defaultdict(list)
+            written = 0
+            for _ in range(self.runs):
+                prepare()
+                phases, size = self.paste_once(resolve, UPSCALE_BUTTON if name.startswith("upscale-") else PASTE_BUTTON)
+                written += size
+                for phase, value in phases.items():
+                    samples[phase].append(value)
+
+            calls = samples.pop("resolve_calls")
+            result = {phase: statistics.median(values) * 1000 for phase, values in samples.items()}
+            # the first paste creates the bin, the next ones find it: both counts are exact
+            result["resolve_calls"] = calls[0]
+            if len(calls) > 1:
+                result["resolve_calls_warm"] = max(calls[1:])
+            total = sum(samples["total"])
+            result["pastes_per_s"] = self.runs / total if total else 0.0
+            result["mb_per_s"] = written / total / 1e6 if total else 0.0
+            results[name] = result
+        return results
+
+    @staticmethod
+    def _folder_size(path):
+        if not path or not os.path.isdir(path):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+"""──────────────────────────────────────────────────────────────────────────────────
+Report & baseline
+─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+PHASES = ["init", "plugins", "first_button", "execute", "save", "bin", "timeline", "click", "total"]
+CALLS = ["resolve_calls", "resolve_calls_warm"]
+
+# options changing the native call counts: counts are compared only with a baseline of the same ones
+CALL_OPTIONS = ["files", "batch", "existing_bins", "existing_clips"]
+
+def print_report(results, baseline=None, threshold=0.2, min_delta_ms=25.0, compare_calls=True):
+    """
+    Prints the median of each phase (ms), the native call counts and the ratios with the baseline.
+    Returns (regressions, slower): scenarios making more native calls than the baseline (the
+    gate), and phases slower by more than `threshold` and `min_delta_ms` (advisory only).
+    """
+    regressions = []
+    slower = []
+    baseline = baseline or {}
+    print(f"{'scenario':<22}" + "".join(f"{phase[:12]:>13}" for phase in PHASES) + f"{'calls':>8}{'warm':>8}{'paste/s':>9}{'MB/s':>8}")
+    for name, result in results.items():
+        print(f"{name:<22}" + "".join(f"{result.get(phase, 0.0):>13.1f}" for phase in PHASES)
+              + "".join(f"{result[calls]:>8.0f}" if calls in result else f"{'-':>8}" for calls in CALLS)
+              + f"{result['pastes_per_s']:>9.2f}{result['mb_per_s']:>8.2f}")
+
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        ratios = []
+        for phase in PHASES + CALLS:
+            if not reference.get(phase) or phase not in result:
+                ratios.append(f"{'-':>13}" if phase in PHASES else f"{'-':>8}")
+                continue
+            ratio = result[phase] / reference[phase]
+            if phase in CALLS:
+                ratios.append(f"{ratio:>7.2f}x")
+                if compare_calls and result[phase] > reference[phase]:
+                    regressions.append((name, phase, result[phase], reference[phase]))
+            else:
+                ratios.append(f"{ratio:>12.2f}x")
+                if ratio > 1 + threshold and result[phase] - reference[phase] > min_delta_ms:
+                    slower.append((name, phase, ratio))
+        print(f"{'  vs baseline':<22}" + "".join(ratios))
+    return regressions, slower
+
+def main():
+    parser = argparse.ArgumentParser(description="ClipRocks end-to-end paste benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="pastes per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.5, help="fake Resolve latency per native call")
+    parser.add_argument("--sizes", default="640x480,1920x1080,3840x2160", help="bitmap/URL image sizes")
+    parser.add_argument("--files", type=int, default=20, help="number of files in the file list scenario")
+    parser.add_argument("--batch", type=int, default=12, help="number of frames in the batch upscale scenario")
+    parser.add_argument("--existing-bins", type=int, default=20, help="bins already in the media pool")
+    parser.add_argument("--existing-clips", type=int, default=50, help="clips already in each bin")
+    parser.add_argument("--baseline", default=os.path.join(BENCH_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="tolerated slowdown (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=25.0, help="tolerated slowdown of a phase in ms")
+    args = parser.parse_args()
+
+    benchmark = PasteBenchmark(
+        runs=args.runs,
+        latency=args.latency_ms / 1000,
+        sizes=[tuple(int(v) for v in size.split("x")) for size in args.sizes.split(",")],
+        files=args.files,
+        existing_bins=args.existing_bins,
+        existing_clips=args.existing_clips,
+        batch=args.batch
+    )
+    benchmark.setup()
+    try:
+        results = benchmark.run()
+    finally:
+        benchmark.teardown()
+
+    options = {"latency_ms": args.latency_ms, "runs": args.runs, **{key: getattr(args, key) for key in CALL_OPTIONS}}
+    baseline = None
+    compare_calls = True
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored["scenarios"]
+        different = [key for key in CALL_OPTIONS if stored.get(key) != options[key]]
+        if different:
+            compare_calls = False
+            print(f"Baseline measured with other {', '.join(different)}: call counts not compared")
+
+    regressions, slower = print_report(results, baseline, args.threshold, args.min_delta_ms, compare_calls)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**options, "scenarios": results}, f, indent=4)
+        print(f"Baseline saved: {args.baseline}")
+
+    for name, phase, ratio in slower:
+        print(f"SLOWER {name} {phase}: {ratio:.2f}x baseline (advisory, timings vary between runs and machines)")
+    for name, phase, count, reference in regressions:
+        print(f"REGRESSION {name} {phase}: {count:.0f} native calls, {reference:.0f} in the baseline")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import sys
+import types
+import ctypes
+from PIL import Image
+
+
+class _Function:
+    """
+    Callable standing for a ctypes.windll function (accepts argtypes/restype assignments).
+    """
+    def __init__(self, function):
+        self.function = function
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self.function(*args)
+
+
+class FakeClipboard:
+    """
+    Synthetic Windows clipboard. `install()` registers fake `win32clipboard` and `win32api`
+    modules and a fake `ctypes.windll`, so ClipElement, Media and the plugins read from it
+    exactly like they read from the real clipboard.
+    """
+
+    CF_TEXT = 1
+    CF_BITMAP = 2
+    CF_DIB = 8
+    CF_UNICODETEXT = 13
+    CF_HDROP = 15
+
+    def __init__(self):
+        self.formats = {}
+        self.registered_formats = {}  # name -> id (RegisterClipboardFormat)
+        self.sequence_number = 0
+        self.cursor = (100, 100)
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Content
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def clear(self):
+        self.formats = {}
+        self.sequence_number += 1
+
+    def set_image(self, image, encoded_format=None):
+        """
+        Puts a PIL image on the clipboard as CF_BITMAP/CF_DIB, like a browser "copy image".
+        With `encoded_format` ("PNG", "image/png", "image/jpeg", ...), the encoded file is also
+        registered under that name, like Chrome/Firefox do.
+        """
+        self.clear()
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="BMP")
+        self.formats[self.CF_BITMAP] = id(image) & 0xFFFFFFFF
+        self.formats[self.CF_DIB] = buffer.getvalue()[14:]  # DIB = BMP without BITMAPFILEHEADER
+
+        if encoded_format:
+            buffer = io.BytesIO()
+            pil_format = "JPEG" if encoded_format in ("JFIF", "image/jpeg") else encoded_format.split("/")[-1].upper()
+            image.convert("RGB").save(buffer, format=pil_format)
+            self.formats[self.register_format(encoded_format)] = buffer.getvalue()
+
+    def add_html(self, fragment, source_url=""):
+        """
+        Adds a CF_HTML entry ("HTML Format", header with byte offsets) to the current content.
+        """
+        prefix = "<html><body><!--StartFragment-->"
+        suffix = "<!--EndFragment--></body></html>"
+        header = "Version:0.9\r\nStartHTML:{:010d}\r\nEndHTML:{:010d}\r\nStartFragment:{:010d}\r\nEndFragment:{:010d}\r\nSourceURL:%s\r\n" % source_url
+        header_size = len(header.format(0, 0, 0, 0).encode("utf-8"))
+        body = (prefix + fragment + suffix).encode("utf-8")
+        start_fragment = header_size + len(prefix.encode("utf-8"))
+        end_fragment = start_fragment + len(fragment.encode("utf-8"))
+        data = header.format(header_size, header_size + len(body), start_fragment, end_fragment).encode("utf-8") + body
+        self.formats[self.register_format("HTML Format")] = data
+        self.sequence_number += 1
+
+    def register_format(self, name):
+        if name not in self.registered_formats:
+            self.registered_formats[name] = 0xC000 + len(self.registered_formats)
+        return self.registered_formats[name]
+
+    def set_text(self, text):
+        self.clear()
+        self.formats[self.CF_TEXT] = text.encode("mbcs" if sys.platform == "win32" else "utf-8")
+        self.formats[self.CF_UNICODETEXT] = text
+
+    def set_files(self, paths):
+        self.clear()
+        self.formats[self.CF_HDROP] = list(paths)
+
+    @staticmethod
+    def make_image(width, height):
+        """
+        Returns a synthetic photo-like image (gradient + noise) so that encoders do real work.
+        """
+        gradient = Image.linear_gradient("L").resize((width, height))
+        noise = Image.effect_noise((width, height), 48)
+        return Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5)))
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    win32clipboard / win32api / ctypes.windll
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def install(self):
+        win32clipboard = types.ModuleType("win32clipboard")
+        for name in ("CF_TEXT", "CF_BITMAP", "CF_DIB", "CF_UNICODETEXT", "CF_HDROP"):
+            setattr(win32clipboard, name, getattr(self, name))
+        win32clipboard.OpenClipboard = lambda hwnd=None: None
+        win32clipboard.CloseClipboard = lambda: None
+        win32clipboard.EnumClipboardFormats = self._enum_formats
+        win32clipboard.IsClipboardFormatAvailable = lambda format_id: format_id in self.formats
+        win32clipboard.GetClipboardData = self._get_data
+        win32clipboard.GetClipboardSequenceNumber = lambda: self.sequence_number
+        win32clipboard.RegisterClipboardFormat = self.register_format
+        win32clipboard.GetClipboardFormatName = self._get_format_name
+        sys.modules["win32clipboard"] = win32clipboard
+
+        win32api = types.ModuleType("win32api")
+        win32api.GetCursorPos = lambda: self.cursor
+        sys.modules["win32api"] = win32api
+
+        user32 = types.SimpleNamespace(
+            IsClipboardFormatAvailable=_Function(lambda format_id: format_id in self.formats),
+            GetClipboardData=_Function(lambda format_id: format_id if format_id in self.formats else 0),
+            OpenClipboard=_Function(lambda hwnd: True),
+            CloseClipboard=_Function(lambda: True),
+            GetClipboardSequenceNumber=_Function(lambda: self.sequence_number),
+        )
+        shell32 = types.SimpleNamespace(DragQueryFileW=_Function(self._drag_query_file))
+        ctypes.windll = types.SimpleNamespace(user32=user32, shell32=shell32)
+
+    def _enum_formats(self, format_id):
+        ids = sorted(self.formats)
+        following = [f for f in ids if f > format_id]
+        return following[0] if following else 0
+
+    def _get_data(self, format_id):
+        if format_id not in self.formats:
+            raise TypeError(f"Specified clipboard format is not available: {format_id}")
+        return self.formats[format_id]
+
+    def _get_format_name(self, format_id):
+        for name, registered_id in self.registered_formats.items():
+            if registered_id == format_id:
+                return name
+        raise TypeError(f"Not a registered clipboard format: {format_id}")
+
+    def _drag_query_file(self, handle, index, buffer, size):
+        files = self.formats.get(self.CF_HDROP, [])
+        if index == 0xFFFFFFFF:
+            return len(files)
+        if buffer is not None:
+            buffer.value = files[index][:size - 1]
+        return len(files[index])
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+from collections import Counter
+
+
+class FakeSession:
+    """
+    Shared state of the fake Resolve object graph: every native call goes through `call`, which
+    counts it and sleeps `latency` seconds to emulate the scripting IPC round trip.
+    """
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = Counter()
+
+    def call(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset(self):
+        self.calls.clear()
+
+
+class FakeObject:
+    def __init__(self, session):
+        self._session = session
+
+
+class FakeMediaPoolItem(FakeObject):
+    def __init__(self, session, path):
+        super().__init__(session)
+        self.path = path
+        self.proxy_path = None
+        self.name = os.path.basename(path)
+
+    def GetName(self):
+        self._session.call("GetName")
+        return self.name
+
+    def GetClipProperty(self, name=None):
+        self._session.call("GetClipProperty")
+        properties = {"File Path": self.path, "File Name": self.name}
+        return properties if name is None else properties.get(name, "")
+
+    def ReplaceClip(self, path):
+        self._session.call("ReplaceClip")
+        self.path = path
+        return True
+
+    def LinkProxyMedia(self, path):
+        self._session.call("LinkProxyMedia")
+        self.proxy_path = path
+        return True
+
+
+class FakeFolder(FakeObject):
+    def __init__(self, session, name):
+        super().__init__(session)
+        self.name = name
+        self.subfolders = []
+        self.clips = []
+
+    def GetName(self):
+        self._session.call("GetName")
+        return self.name
+
+    def GetSubFolderList(self):
+        self._session.call("GetSubFolderList")
+        return list(self.subfolders)
+
+    def GetClipList(self):
+        self._session.call("GetClipList")
+        return list(self.clips)
+
+
+class FakeTimelineItem(FakeObject):
+    def __init__(self, session, media_pool_item):
+        super().__init__(session)
+        self.media_pool_item = media_pool_item
+        self.properties = {}
+
+    def GetName(self):
+        self._session.call("GetName")
+        return self.media_pool_item.name
+
+    def GetMediaPoolItem(self):
+        self._session.call("GetMediaPoolItem")
+        return self.media_pool_item
+
+    def SetProperty(self, name, value):
+        self._session.call("SetProperty")
+        self.properties[name] = value
+        return True
+
+    def GetProperty(self, name=None):
+        self._session.call("GetProperty")
+        return dict(self.properties) if name is None else self.properties.get(name)
+
+
+class FakeTimeline(FakeObject):
+    def __init__(self, session, settings):
+        super().__init__(session)
+        self.settings = settings
+        self.items = []
+
+    def GetName(self):
+        self._session.call("GetName")
+        return "Timeline 1"
+
+    def GetSetting(self, name=None):
+        self._session.call("GetSetting")
+        return dict(self.settings) if name is None else self.settings.get(name, "")
+
+    def DeleteClips(self, items):
+        self._session.call("DeleteClips")
+        self.items = [item for item in self.items if item not in items]
+        return True
+
+
+class FakeMediaPool(FakeObject):
+    def __init__(self, session, project):
+        super().__init__(session)
+        self.project = project
+        self.root_folder = FakeFolder(session, "Master")
+        self.current_folder = self.root_folder
+
+    def GetRootFolder(self):
+        self._session.call("GetRootFolder")
+        return self.root_folder
+
+    def AddSubFolder(self, parent, name):
+        self._session.call("AddSubFolder")
+        folder = FakeFolder(self._session, name)
+        parent.subfolders.append(folder)
+        return folder
+
+    def SetCurrentFolder(self, folder):
+        self._session.call("SetCurrentFolder")
+        self.current_folder = folder
+        return True
+
+    def GetCurrentFolder(self):
+        self._session.call("GetCurrentFolder")
+        return self.current_folder
+
+    def DeleteClips(self, clips):
+        self._session.call("DeleteClips")
+        for folder in [self.root_folder, *self.root_folder.subfolders]:
+            folder.clips = [clip for clip in folder.clips if clip not in clips]
+        return True
+
+    def RelinkClips(self, items, folder_path):
+        self._session.call("RelinkClips")
+        for item in items:
+            item.path = os.path.join(folder_path, item.name)
+        return True
+
+    def AppendToTimeline(self, clips):
+        self._session.call("AppendToTimeline")
+        timeline = self.project.timeline
+        items = []
+        for clip in clips:
+            media_pool_item = clip["mediaPoolItem"] if isinstance(clip, dict) else clip
+            if media_pool_item is None:
+                continue
+            item = FakeTimelineItem(self._session, media_pool_item)
+            timeline.items.append(item)
+            items.append(item)
+        return items
+
+
+class FakeProject(FakeObject):
+    def __init__(self, session, name, settings):
+        super().__init__(session)
+        self.name = name
+        self.settings = settings
+        self.timeline = FakeTimeline(session, settings)
+        self.media_pool = FakeMediaPool(session, self)
+
+    def GetName(self):
+        self._session.call("GetName")
+        return self.name
+
+    def GetMediaPool(self):
+        self._session.call("GetMediaPool")
+        return self.media_pool
+
+    def GetCurrentTimeline(self):
+        self._session.call("GetCurrentTimeline")
+        return self.timeline
+
+    def GetSetting(self, name=None):
+        self._session.call("GetSetting")
+        return dict(self.settings) if name is None else self.settings.get(name, "")
+
+
+class FakeProjectManager(FakeObject):
+    def __init__(self, session, project):
+        super().__init__(session)
+        self.project = project
+
+    def GetCurrentProject(self):
+        self._session.call("GetCurrentProject")
+        return self.project
+
+
+class FakeMediaStorage(FakeObject):
+    def __init__(self, session, project):
+        super().__init__(session)
+        self.project = project
+
+    def AddItemsToMediaPool(self, paths):
+        self._session.call("AddItemsToMediaPool")
+        if isinstance(paths, str):
+            paths = [paths]
+        media_pool = self.project.media_pool
+        items = [FakeMediaPoolItem(self._session, path) for path in paths]
+        media_pool.current_folder.clips.extend(items)
+        return items
+
+
+class FakeResolve(FakeObject):
+    """
+    In-memory stand-in for the `resolve` object DaVinci Resolve injects in scripts, with the subset
+    of the scripting API used by ClipRocks.
+
+    :param latency: seconds slept by every native call (Resolve IPC is ~0.1-1 ms per call).
+    :param existing_bins: number of sub folders already in the media pool root.
+    :param existing_clips: number of clips already in each of these bins.
+    """
+    def __init__(self, latency=0.0, project_name="Bench Project", resolution=(1920, 1080),
+                 existing_bins=0, existing_clips=0):
+        session = FakeSession(latency)
+        super().__init__(session)
+        self.session = session
+
+        settings = {
+            "timelineResolutionWidth": str(resolution[0]),
+            "timelineResolutionHeight": str(resolution[1]),
+            "timelineFrameRate": "25",
+        }
+        self.project = FakeProject(session, project_name, settings)
+        self.project_manager = FakeProjectManager(session, self.project)
+        self.media_storage = FakeMediaStorage(session, self.project)
+
+        root = self.project.media_pool.root_folder
+        for index in range(existing_bins):
+            folder = FakeFolder(session, f"Bin {index}")
+            folder.clips = [FakeMediaPoolItem(session, f"clip{index}_{clip}.mov") for clip in range(existing_clips)]
+            root.subfolders.append(folder)
+
+    def GetProjectManager(self):
+        self._session.call("GetProjectManager")
+        return self.project_manager
+
+    def GetMediaStorage(self):
+        self._session.call("GetMediaStorage")
+        return self.media_storage
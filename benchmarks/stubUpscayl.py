@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+"""
+    Stand-in for upscayl-bin with the same command line, for benchmarks and tests without a GPU.
+
+        stubUpscayl.py -i <file|folder> -o <file|folder> [-n model] [-s scale] [-f png|jpg|webp]
+                       [-t tile] [-j load:proc:save]
+
+    Like upscayl-bin, a folder input is processed in one run (one "model load") and each output
+    is written as <input name>.<format> in the output folder, progress percentages are printed on
+    stderr. Images are enlarged with a nearest neighbour resize.
+
+    STUB_UPSCAYL_LOAD_MS and STUB_UPSCAYL_IMAGE_MS (environment) simulate the model load and
+    the per image inference time. That time grows as -t moves away from STUB_UPSCAYL_BEST_TILE
+    (auto tile 0 counts as a poor choice) and shrinks with more proc threads (-j), so that the
+    calibration of the Upscale plugin has something to find.
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+from PIL import Image
+
+
+def upscale(input_path, output_path, scale, image_delay):
+    for step in (25, 50, 75, 100):
+        time.sleep(image_delay / 4)
+        print(f"{step:.2f}%", file=sys.stderr, flush=True)
+    with Image.open(input_path) as image:
+        image.resize((image.width * scale, image.height * scale), Image.Resampling.NEAREST).save(output_path)
+
+
+def settings_factor(tile, threads):
+    """
+    Inference time multiplier of the -t/-j settings.
+    """
+    best_tile = int(os.environ.get("STUB_UPSCAYL_BEST_TILE", "256"))
+    tile = int(tile or 0)
+    factor = 1.5 if tile == 0 else 1 + 0.5 * abs(math.log2(tile / best_tile))
+    if threads:
+        proc = int(threads.split(":")[1])
+        factor *= 2 / (1 + min(proc, 4) / 2)
+    return factor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", required=True)
+    parser.add_argument("-o", required=True)
+    parser.add_argument("-n", default="realesrgan-x4plus")
+    parser.add_argument("-s", type=int, default=4)
+    parser.add_argument("-f", default=None)
+    parser.add_argument("-m", default=None)
+    parser.add_argument("-t", default=None)
+    parser.add_argument("-j", default=None)
+    parser.add_argument("-g", default=None)
+    args = parser.parse_args()
+
+    image_delay = float(os.environ.get("STUB_UPSCAYL_IMAGE_MS", "50")) / 1000 * settings_factor(args.t, args.j)
+    time.sleep(float(os.environ.get("STUB_UPSCAYL_LOAD_MS", "300")) / 1000)
+
+    if not os.path.isdir(args.i):
+        upscale(args.i, args.o, args.s, image_delay)
+        return 0
+
+    os.makedirs(args.o, exist_ok=True)
+    for name in sorted(os.listdir(args.i)):
+        stem, extension = os.path.splitext(name)
+        output_name = f"{stem}.{args.f}" if args.f else name
+        try:
+            upscale(os.path.join(args.i, name), os.path.join(args.o, output_name), args.s, image_delay)
+        except Exception as e:
+            print(f"{name} failed: {e}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
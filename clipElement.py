@@ -23,10 +23,67 @@
 """
 
 import win32clipboard
+import hashlib
+import json
+import os
+import threading
 
 import ctypes
 from ctypes.wintypes import HWND, UINT, HANDLE, BOOL
 from typing import List
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from plugins.media import Media
+
+# Registered clipboard formats carrying the original encoded image (browsers, image editors),
+# by order of preference -> file extension. Written as is, no decode and no re-encode.
+ENCODED_IMAGE_FORMATS = {
+    "PNG": "png",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/jpeg": "jpg",
+    "JFIF": "jpg",
+    "image/gif": "gif",
+}
+
+# registered name of CF_HTML (browsers "copy image" put the <img> tag there)
+HTML_FORMAT = "HTML Format"
+
+# first registered format id (RegisterClipboardFormat), ids below are predefined CF_*
+FIRST_REGISTERED_FORMAT = 0xC000
+
+# the clipboard is opened by several threads of the process (plugin loaders, speculative capture,
+# job threads) : OpenClipboard fails while another one holds it, see open_clipboard
+CLIPBOARD_LOCK = threading.RLock()
+
+
+@contextmanager
+def open_clipboard():
+    """
+    Opens the clipboard for the `with` block, one thread of the process at a time. Closed only
+    if the open succeeded (never the session of another thread), the open error is raised.
+    """
+    with CLIPBOARD_LOCK:
+        win32clipboard.OpenClipboard()
+        try:
+            yield
+        finally:
+            win32clipboard.CloseClipboard()
+
+class _ImageSourceParser(HTMLParser):
+    """
+    Collects (src, srcset) of the <img> tags of an HTML fragment.
+    """
+    def __init__(self):
+        super().__init__()
+        self.images = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "img":
+            attrs = dict(attrs)
+            self.images.append((attrs.get("src") or "", attrs.get("srcset") or ""))
 
 class ClipElement:
     """
@@ -43,6 +100,9 @@ class ClipElement:
         """
 
         self.format_ids = self._retrieve_format_ids()
+        self.format_names = None  # registered format names, see get_format_names
+        self.sequence_number = self._retrieve_sequence_number()  # changes on every clipboard write
+        self.content_hash = None  # see get_content_hash
         self.raw_data = None  # Placeholder for raw clipboard data
         self.media_info = None  # Placeholder for future media information retrieval logic
 
@@ -72,35 +132,41 @@ class ClipElement:
         """
         Reads files copied to the clipboard.
         """
-        if not self._open_clipboard(None):
-            raise Exception("Unable to open the clipboard.")
+        with CLIPBOARD_LOCK:
+            if not self._open_clipboard(None):
+                raise Exception("Unable to open the clipboard.")
+            try:
+                return self._read_copied_files()
+            finally:
+                self._close_clipboard()
+
+    def _read_copied_files(self):
+        """
+        CF_HDROP paths, the clipboard being open (see get_copied_files).
+        """
+        if not self._is_clipboard_format_available(self.CF_HDROP):
+            print("No files found in the clipboard.")
+            return []
         
-        try:
-            if not self._is_clipboard_format_available(self.CF_HDROP):
-                print("No files found in the clipboard.")
-                return []
-            
-            # Retrieves the handle to the clipboard data
-            handle = self._get_clipboard_data(self.CF_HDROP)
-            if not handle:
-                raise Exception("Error retrieving CF_HDROP data.")
-            
-            # Counts the number of files
-            num_files = self._drag_query_file(handle, 0xFFFFFFFF, None, 0)
-            if num_files == 0:
-                print("No files detected.")
-                return []
-
-            # Reads the paths of the files
-            files = []
-            for i in range(num_files):
-                buffer = ctypes.create_unicode_buffer(260)  # Buffer to store the path
-                self._drag_query_file(handle, i, buffer, 260)
-                files.append(buffer.value)
-            
-            return files
-        finally:
-            self._close_clipboard()
+        # Retrieves the handle to the clipboard data
+        handle = self._get_clipboard_data(self.CF_HDROP)
+        if not handle:
+            raise Exception("Error retrieving CF_HDROP data.")
+        
+        # Counts the number of files
+        num_files = self._drag_query_file(handle, 0xFFFFFFFF, None, 0)
+        if num_files == 0:
+            print("No files detected.")
+            return []
+
+        # Reads the paths of the files
+        files = []
+        for i in range(num_files):
+            buffer = ctypes.create_unicode_buffer(260)  # Buffer to store the path
+            self._drag_query_file(handle, i, buffer, 260)
+            files.append(buffer.value)
+        
+        return files
 
     def _retrieve_format_ids(self):
         """
@@ -108,15 +174,13 @@ class ClipElement:
         """
         formats = set()
         try:
-            win32clipboard.OpenClipboard()
-            format_id = win32clipboard.EnumClipboardFormats(0)
-            while format_id != 0:
-                formats.add(format_id)
-                format_id = win32clipboard.EnumClipboardFormats(format_id)
+            with open_clipboard():
+                format_id = win32clipboard.EnumClipboardFormats(0)
+                while format_id != 0:
+                    formats.add(format_id)
+                    format_id = win32clipboard.EnumClipboardFormats(format_id)
         except Exception as e:
             print("Error: ", str(e))
-        finally:
-            win32clipboard.CloseClipboard()
         return formats
 
     def get_format_ids(self):
@@ -125,19 +189,174 @@ class ClipElement:
         """
         return self.format_ids
 
+    def _retrieve_sequence_number(self):
+        try:
+            return win32clipboard.GetClipboardSequenceNumber()
+        except Exception as e:
+            print("Error retrieving clipboard sequence number:", e)
+            return None
+
+    def get_sequence_number(self):
+        """
+        Clipboard sequence number when this element was read: same number, same content.
+        """
+        return self.sequence_number
+
+    def get_content_hash(self):
+        """
+        Returns a hash of the clipboard content (encoded image, DIB, text or file list, the
+        first available), computed once. None for empty or unsupported content.
+        """
+        if self.content_hash is None:
+            data, _ = self.get_encoded_image()
+            if data is None and win32clipboard.CF_DIB in self.format_ids:
+                data = self.get_raw_format(win32clipboard.CF_DIB)
+            if data is None and win32clipboard.CF_UNICODETEXT in self.format_ids:
+                data = (self.get_text() or "").encode("utf-8")
+            if data is None and self.CF_HDROP in self.format_ids:
+                data = "\n".join(self.get_copied_files()).encode("utf-8")
+            if isinstance(data, bytes):
+                self.content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return self.content_hash
+
+
+    def get_format_names(self):
+        """
+        Returns { format_id: name } of the registered formats of the clipboard ("PNG",
+        "image/png", "HTML Format", ...). Resolved once, on first use.
+        """
+        if self.format_names is None:
+            names = {}
+            for format_id in self.format_ids:
+                if format_id >= FIRST_REGISTERED_FORMAT:
+                    try:
+                        names[format_id] = win32clipboard.GetClipboardFormatName(format_id)
+                    except Exception as e:
+                        print("Error retrieving format name:", e)
+            self.format_names = names
+        return self.format_names
+
+    def get_raw_format(self, format_id):
+        """
+        Retrieves the raw bytes of any clipboard format (registered formats included).
+        """
+        try:
+            with open_clipboard():
+                data = win32clipboard.GetClipboardData(format_id)
+        except Exception as e:
+            print(f"Error retrieving format {format_id}:", e)
+            data = None
+        return data
+
+    def get_encoded_image(self):
+        """
+        Returns (bytes, extension) of the original encoded image (PNG/WebP/JPEG/GIF) when the
+        source application registered one, otherwise (None, None) and the DIB has to be used.
+        """
+        ids_by_name = {name: format_id for format_id, name in self.get_format_names().items()}
+        for name, extension in ENCODED_IMAGE_FORMATS.items():
+            if name not in ids_by_name:
+                continue
+            data = self.get_raw_format(ids_by_name[name])
+            if isinstance(data, bytes) and self._is_encoded_image(data, extension):
+                return data, extension
+        return None, None
+
+    @staticmethod
+    def _is_encoded_image(data, extension):
+        """
+        Checks the file signature, some applications register these names with other content.
+        """
+        if extension == "png":
+            return data.startswith(b"\x89PNG\r\n\x1a\n")
+        if extension == "jpg":
+            return data.startswith(b"\xff\xd8\xff")
+        if extension == "webp":
+            return data[:4] == b"RIFF" and data[8:12] == b"WEBP"
+        if extension == "gif":
+            return data[:6] in (b"GIF87a", b"GIF89a")
+        return False
+
+    def get_html(self):
+        """
+        Returns (fragment, source_url) of the CF_HTML clipboard entry, or (None, None).
+        The entry starts with a header ("StartFragment:000123", "SourceURL:https://...") whose
+        offsets are in bytes of the UTF-8 payload.
+        """
+        format_id = next((i for i, name in self.get_format_names().items() if name == HTML_FORMAT), None)
+        data = self.get_raw_format(format_id) if format_id else None
+        if not isinstance(data, bytes):
+            return None, None
+
+        header = {}
+        for line in data[:1024].splitlines():
+            key, _, value = line.decode("utf-8", "replace").partition(":")
+            if not value or key.startswith("<"):
+                break
+            header[key] = value.strip()
+        try:
+            start, end = int(header["StartFragment"]), int(header["EndFragment"])
+        except (KeyError, ValueError):
+            return None, None
+        return data[start:end].decode("utf-8", "replace"), header.get("SourceURL")
+
+    def get_html_image_url(self):
+        """
+        Returns the absolute URL of the largest candidate of the copied <img> (src or the
+        biggest `srcset` entry), or None when the clipboard has no http(s) image source.
+        """
+        fragment, source_url = self.get_html()
+        if not fragment:
+            return None
+        parser = _ImageSourceParser()
+        parser.feed(fragment)
+        if not parser.images:
+            return None
+
+        src, srcset = parser.images[0]
+        url = self._largest_srcset_candidate(srcset) or src
+        url = urljoin(source_url or "", url.strip())
+        return url if url.startswith(("http://", "https://")) else None
+
+    @staticmethod
+    def _largest_srcset_candidate(srcset):
+        """
+        Picks the URL with the biggest descriptor of a srcset ("a.jpg 480w, b.jpg 1080w" or
+        "a.jpg 1x, b.jpg 2x"). Width descriptors win over densities.
+        """
+        best = None
+        for candidate in srcset.split(","):
+            parts = candidate.split()
+            if not parts:
+                continue
+            descriptor = parts[1] if len(parts) > 1 else "1x"
+            try:
+                score = (descriptor[-1] == "w", float(descriptor[:-1]))
+            except ValueError:
+                continue
+            if best is None or score > best[0]:
+                best = (score, parts[0])
+        return best[1] if best else None
+
+    def get_bitmap_size(self):
+        """
+        Returns (width, height) of the clipboard bitmap from the CF_DIB header, without decoding.
+        """
+        data = self.get_raw_format(win32clipboard.CF_DIB)
+        if not isinstance(data, bytes) or len(data) < 12:
+            return None
+        return int.from_bytes(data[4:8], "little", signed=True), abs(int.from_bytes(data[8:12], "little", signed=True))
 
     def get_raw_BITMAP(self):
         """
         Retrieves raw BITMAP data (CF_BITMAP) from the clipboard.
         """
         try:
-            win32clipboard.OpenClipboard()
-            data = win32clipboard.GetClipboardData(win32clipboard.CF_BITMAP)
+            with open_clipboard():
+                data = win32clipboard.GetClipboardData(win32clipboard.CF_BITMAP)
         except Exception as e:
             print("Error retrieving BITMAP data:", e)
             data = None
-        finally:
-            win32clipboard.CloseClipboard()
         return data
 
     def get_raw_DIB(self):
@@ -145,13 +364,11 @@ class ClipElement:
         Retrieves raw DIB data (CF_DIB) from the clipboard.
         """
         try:
-            win32clipboard.OpenClipboard()
-            data = win32clipboard.GetClipboardData(win32clipboard.CF_DIB)
+            with open_clipboard():
+                data = win32clipboard.GetClipboardData(win32clipboard.CF_DIB)
         except Exception as e:
             print("Error retrieving DIB data:", e)
             data = None
-        finally:
-            win32clipboard.CloseClipboard()
         return data
 
     def get_raw_UNICODETEXT(self):
@@ -159,13 +376,11 @@ class ClipElement:
         Retrieves raw UNICODE text data (CF_UNICODETEXT) from the clipboard.
         """
         try:
-            win32clipboard.OpenClipboard()
-            data = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
+            with open_clipboard():
+                data = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
         except Exception as e:
             print("Error retrieving UNICODE text data:", e)
             data = None
-        finally:
-            win32clipboard.CloseClipboard()
         return data
 
 
@@ -194,13 +409,10 @@ class ClipElement:
         Retrieves text data from the clipboard.
         """
         try:
-            win32clipboard.OpenClipboard()
-            text = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
-            return text
+            with open_clipboard():
+                return win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
         except Exception as e:
             print("Error retrieving text data:", e)
-        finally:
-            win32clipboard.CloseClipboard()
 
     def get_infos_media(self):
         """
@@ -229,4 +441,215 @@ class ClipElement:
             ctypes.windll.shell32.DragQueryFileW(data, i, buffer, length)
             files.append(buffer.value)
             print(self.parse_hdrop_data.__doc__)
-        return files
\ No newline at end of file
+        return files
+
+class ClipSnapshot:
+    """
+    Copy of the clipboard content on disk, with the getters of ClipElement the plugins use.
+
+    A queued job (see JobQueue) runs on its snapshot: the clipboard can change while it waits, and
+    the job can run again from the snapshot after a crash, in another ClipRocks process.
+    Images are kept encoded (the registered PNG/JPEG/WebP as is, the DIB as PNG).
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        with open(os.path.join(folder, "snapshot.json"), "r", encoding="utf-8") as f:
+            self.data = json.load(f)
+        self.format_ids = set(self.data["format_ids"])
+
+    @classmethod
+    def capture(cls, clipboard_element, folder):
+        """
+        Writes the content of `clipboard_element` in `folder` and returns its snapshot.
+        """
+        os.makedirs(folder, exist_ok=True)
+        format_ids = clipboard_element.get_format_ids()
+        data = {
+            "format_ids": sorted(format_ids),
+            "sequence_number": clipboard_element.get_sequence_number(),
+            "content_hash": clipboard_element.get_content_hash(),
+            "files": clipboard_element.get_copied_files() if 15 in format_ids else [],
+            "text": clipboard_element.get_text() if win32clipboard.CF_UNICODETEXT in format_ids else None,
+            "image": None,
+        }
+
+        encoded_data, extension = clipboard_element.get_encoded_image()
+        if encoded_data is None and win32clipboard.CF_DIB in format_ids:
+            encoded_data, extension = cls._dib_to_png(clipboard_element.get_raw_DIB()), "png"
+        if encoded_data:
+            data["image"] = f"image.{extension}"
+            with open(os.path.join(folder, data["image"]), "wb") as f:
+                f.write(encoded_data)
+
+        with open(os.path.join(folder, "snapshot.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        return cls(folder)
+
+    @staticmethod
+    def _dib_to_png(dib):
+        """
+        PNG of a CF_DIB: the BMP file header is rebuilt in front of it for PIL.
+        """
+        import io
+        from PIL import Image
+
+        if not isinstance(dib, bytes) or len(dib) < 40:
+            return None
+        header_size = int.from_bytes(dib[0:4], "little")
+        bit_count = int.from_bytes(dib[14:16], "little")
+        compression = int.from_bytes(dib[16:20], "little")
+        colors = int.from_bytes(dib[32:36], "little") or (1 << bit_count if bit_count <= 8 else 0)
+        masks = 12 if compression == 3 and header_size == 40 else 0
+        offset = 14 + header_size + masks + colors * 4
+        bmp = b"BM" + (14 + len(dib)).to_bytes(4, "little") + b"\0\0\0\0" + offset.to_bytes(4, "little") + dib
+
+        output = io.BytesIO()
+        Image.open(io.BytesIO(bmp)).save(output, format="PNG", compress_level=1)
+        return output.getvalue()
+
+    def get_format_ids(self):
+        return self.format_ids
+
+    def get_sequence_number(self):
+        return self.data["sequence_number"]
+
+    def get_content_hash(self):
+        return self.data["content_hash"]
+
+    def get_copied_files(self):
+        return list(self.data["files"])
+
+    def get_text(self):
+        return self.data["text"]
+
+    def get_format_names(self):
+        return {}
+
+    def get_raw_format(self, format_id):
+        return None
+
+    def get_encoded_image(self):
+        if not self.data["image"]:
+            return None, None
+        with open(os.path.join(self.folder, self.data["image"]), "rb") as f:
+            return f.read(), os.path.splitext(self.data["image"])[1][1:]
+
+    def get_raw_BITMAP(self):
+        return None
+
+    def get_bitmap_size(self):
+        from PIL import Image
+        if not self.data["image"]:
+            return None
+        with Image.open(os.path.join(self.folder, self.data["image"])) as image:
+            return image.size
+
+    def get_html(self):
+        return None, None
+
+    def get_html_image_url(self):
+        return None
+
+class ClipCapture:
+    """
+    Clipboard image written in the cache folder while the menu is open, before any click.
+
+    Plugins running an external tool on the image (RemBg, Upscale) start by reading, encoding and
+    saving it in the cache: the capture does it in background as soon as the menu shows, the
+    clicked plugin gets the file already there (see PluginBase.get_cache_input). The image is
+    hashed on the way (see ClipElement.get_content_hash). Unused, the file is removed when the
+    menu is dismissed (see discard).
+    """
+
+    def __init__(self, clipboard_element, folder):
+        self.clipboard_element = clipboard_element
+        self.folder = folder
+
+        # set once captured: saved file, its Media (index_file, filename) and encoded extension
+        self.path = None
+        self.media = None
+        self.extension = None
+
+        self.used = False
+        self.discarded = False
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def start(self):
+        """
+        Captures in a background thread, returns self.
+        """
+        threading.Thread(target=self._capture, daemon=True).start()
+        return self
+
+    def _capture(self):
+        try:
+            data, extension = self.clipboard_element.get_encoded_image()
+            hashed = data
+            if data is None and win32clipboard.CF_DIB in self.clipboard_element.get_format_ids():
+                hashed = self.clipboard_element.get_raw_DIB()
+                data, extension = ClipSnapshot._dib_to_png(hashed), "png"
+            if not data:
+                return
+
+            # same hash as get_content_hash (encoded image, else the DIB), the clipboard isn't read again
+            if self.clipboard_element.content_hash is None and isinstance(hashed, bytes):
+                self.clipboard_element.content_hash = hashlib.blake2b(hashed, digest_size=16).hexdigest()
+
+            mime_type = next(mime for mime, ext in Media.IMAGE_EXTENSIONS.items() if ext == extension)
+            media = Media(raw_content=data, mime_type=mime_type)
+            media.save(self.folder)
+            with self.lock:
+                self.media, self.path, self.extension = media, media.get_path(), extension
+                if self.discarded:
+                    self._remove()
+        except Exception as e:
+            print(f"Clipboard capture failed: {e}")
+        finally:
+            self.done.set()
+
+    def get_encoded_image(self):
+        """
+        (bytes, extension) of the captured file like ClipElement.get_encoded_image, waits for the
+        capture. (None, None) when there is no capture.
+        """
+        self.done.wait()
+        with self.lock:
+            if not self.path or self.discarded:
+                return None, None
+            with open(self.path, "rb") as f:
+                return f.read(), self.extension
+
+    def take(self):
+        """
+        Waits for the capture and returns a Media of the saved file (path set, as after
+        Media.save), which is then kept. None when there is no capture.
+        """
+        self.done.wait()
+        with self.lock:
+            if not self.path or self.discarded:
+                return None
+            self.used = True
+            media = Media(mime_type=self.media.mime_type, path=self.path)
+            media.save_path = self.folder
+            media.index_file = self.media.index_file
+            media.filename = self.media.filename
+            return media
+
+    def discard(self):
+        """
+        Menu dismissed (or the plugin ran on something else): removes the file if no plugin took it.
+        """
+        with self.lock:
+            if self.used:
+                return
+            self.discarded = True
+            self._remove()
+
+    def _remove(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"Clipboard capture not removed: {e}")
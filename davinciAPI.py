@@ -22,6 +22,12 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import os
+from resolveSession import ResolveSession
+
+# project setting of the input scaling ("Mismatched resolution files" in the project settings)
+INPUT_SCALING_SETTING = "timelineInputResMismatchBehavior"
+
 class DaVinciAPI:
     """
     A dedicated class for handling interactions with DaVinci Resolve's workspace,
@@ -33,21 +39,20 @@ class DaVinciAPI:
     related to media management and project settings.
     """
 
-    def __init__(self, resolve, binName):
+    def __init__(self, resolve, binName, context=None):
         """
         Initialize the workspace with the media pool.
+        :param context: see ResolveSession (profiler attribution of the dispatched calls).
         """
 
         """──────────────────────────────────────────────────────────────────────────────────
         Initialize DaVinci Resolve API 
         ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
 
-        # Initialize DaVinci Resolve objects
-        self.resolve = resolve
-        self.project_manager = self.resolve.GetProjectManager()
-        self.current_project = self.project_manager.GetCurrentProject()
-        self.media_pool = self.current_project.GetMediaPool()
-        self.media_storage = resolve.GetMediaStorage()
+        # every call goes through the session (one dispatcher thread, memoized getters), the
+        # project, media pool, ... are only asked for when first used (see properties below)
+        self.session = ResolveSession(resolve, context)
+        self.resolve = self.session.resolve
 
         """──────────────────────────────────────────────────────────────────────────────────
         Configuration DaVinci Resolve 
@@ -55,11 +60,32 @@ class DaVinciAPI:
 
         # nom du dossier virtuel
         self.binName = binName
+        # the bin folder once found or created (see get_or_create_bin)
+        self._bin = None
+
+    @property
+    def project_manager(self):
+        return self.resolve.GetProjectManager()
+
+    @property
+    def current_project(self):
+        return self.project_manager.GetCurrentProject()
+
+    @property
+    def media_pool(self):
+        return self.current_project.GetMediaPool()
+
+    @property
+    def media_storage(self):
+        return self.resolve.GetMediaStorage()
+
+    @property
+    def project_name(self):
+        return self.current_project.GetName()
 
-        # Project-specific settings
-        self.project_name = self.current_project.GetName()
-        self.project_settings = self.current_project.GetSetting()
-        # self.media_pool = media_pool
+    @property
+    def project_settings(self):
+        return self.current_project.GetSetting()
 
     def _create_bin(self, rootFolder):
         """
@@ -72,12 +98,16 @@ class DaVinciAPI:
 
     def get_or_create_bin(self):
         """
-        Retrieve the `__ClipRocks__` bin or create it if it doesn't exist.
+        Retrieve the `__ClipRocks__` bin or create it if it doesn't exist (searched once per
+        invocation).
         """
+        if self._bin:
+            return self._bin
         rootFolder = self.media_pool.GetRootFolder()
         binFolder = self._get_bin_if_exists(rootFolder)
         if not binFolder:
             binFolder = self._create_bin(rootFolder)
+        self._bin = binFolder
         return binFolder
 
     def _get_bin_if_exists(self, rootFolder):
@@ -95,9 +125,29 @@ class DaVinciAPI:
         Adds a file to the __ClipRocks__ bin in DaVinci Resolve.
         !!!Note : AddItemsToMediaPool considers the case of the path when verifying accuracy!
         (2) CONFIGURE THE PATH IN MEDIA STORAGE (can be removed from preferences) Todo: automatic addition.
+        Imports queued at the same time (background workers) are made by a single
+        SetCurrentFolder + AddItemsToMediaPool, each caller gets the items of its own paths.
+        """
+        return self.session.call_batched(("add_to_bin", binFolder), self._add_batch_to_bin, (binFolder, file_path))
+
+    def _add_batch_to_bin(self, requests):
+        """
+        Runs on the session dispatcher thread: `requests` are (binFolder, file_path) of one bin.
         """
-        self.media_pool.SetCurrentFolder(binFolder)
-        return self.media_storage.AddItemsToMediaPool(file_path)
+        paths = [path for _, file_path in requests for path in ([file_path] if isinstance(file_path, str) else file_path)]
+        self.media_pool.SetCurrentFolder(requests[0][0])
+        items = self.media_storage.AddItemsToMediaPool(paths) or []
+        if len(requests) == 1:
+            return [items]
+
+        by_name = {}
+        for item in items:
+            by_name.setdefault(item.GetName(), []).append(item)
+        results = []
+        for _, file_path in requests:
+            names = [os.path.basename(path) for path in ([file_path] if isinstance(file_path, str) else file_path)]
+            results.append([by_name[name].pop(0) for name in names if by_name.get(name)])
+        return results
 
     def get_item_by_name(self, clips, clip_name):
         """
@@ -121,6 +171,75 @@ class DaVinciAPI:
         """
         return self.media_pool.AppendToTimeline(subClip)
 
+    def replace_clip(self, clip, file_path, placeholder_path):
+        """
+        Swaps the media of a media pool item for `file_path`, its timeline instances (position,
+        transform, edits) are kept. If ReplaceClip is refused, the file takes the place of the
+        placeholder on disk and the clip is relinked to it, which only works when both have the
+        same extension: Resolve picks the decoder from it.
+        :param clip: The media pool item created from `placeholder_path`.
+        :return: The path the clip now points to, or None if the media could not be swapped
+                 (`file_path` is left untouched, see remove_clip).
+        """
+        if clip.ReplaceClip(file_path):
+            return file_path
+        if os.path.splitext(file_path)[1].lower() != os.path.splitext(placeholder_path)[1].lower():
+            return None
+        os.replace(file_path, placeholder_path)
+        if not self.media_pool.RelinkClips([clip], os.path.dirname(placeholder_path)):
+            return None
+        return placeholder_path
+
+    def remove_clip(self, clip, timeline_items=None):
+        """
+        Deletes `timeline_items` from the current timeline, then `clip` from the media pool.
+        :return: True if Resolve deleted everything.
+        """
+        deleted = True
+        timeline = self.current_project.GetCurrentTimeline()
+        if timeline_items and timeline:
+            deleted = bool(timeline.DeleteClips(timeline_items))
+        return bool(self.media_pool.DeleteClips([clip])) and deleted
+
+    def place_cropped(self, timeline_item, box, canvas_size):
+        """
+        Sets the Pan/Tilt/Zoom of a timeline item whose media is the `box` (left, top, right,
+        bottom) of a `canvas_size` image, so that it lands where the full canvas would have been
+        with the project input scaling.
+        :return: True if Resolve accepted every property.
+        """
+        left, top, right, bottom = box
+        width, height = canvas_size
+        timeline_size = self.getTimelineResolution()
+        mode = self.getCurrentProjectSettings(INPUT_SCALING_SETTING)
+        canvas_x, canvas_y = self._input_scale(mode, (width, height), timeline_size)
+        crop_x, crop_y = self._input_scale(mode, (right - left, bottom - top), timeline_size)
+
+        # Pan / Tilt in timeline pixels from the frame center (Tilt goes up), Zoom 1.0 = fitted
+        properties = {
+            "ZoomX": canvas_x / crop_x,
+            "ZoomY": canvas_y / crop_y,
+            "Pan": ((left + right) / 2 - width / 2) * canvas_x,
+            "Tilt": (height / 2 - (top + bottom) / 2) * canvas_y,
+        }
+        if abs(properties["ZoomX"] - properties["ZoomY"]) > 1e-6:
+            properties = {"ZoomGang": False, **properties}
+        return all([timeline_item.SetProperty(name, value) for name, value in properties.items()])
+
+    @staticmethod
+    def _input_scale(mode, source_size, timeline_size):
+        """
+        (x, y) scale Resolve applies to a `source_size` media on a `timeline_size` timeline.
+        """
+        scale_x = timeline_size[0] / source_size[0]
+        scale_y = timeline_size[1] / source_size[1]
+        if mode == "stretch":
+            return scale_x, scale_y
+        if mode == "centerCrop":
+            return 1.0, 1.0
+        scale = max(scale_x, scale_y) if mode == "scaleToCrop" else min(scale_x, scale_y)
+        return scale, scale
+
     def getCurrentProjectSettings(self, name):
         """
         Retrieve the value of a specific setting in the current project.
@@ -129,6 +248,16 @@ class DaVinciAPI:
         """
         return self.current_project.GetSetting(name)
 
+    def getTimelineResolution(self):
+        """
+        Retrieve the resolution of the current timeline, or the project one if no timeline is open.
+        :return: Tuple (width, height) in pixels.
+        """
+        source = self.current_project.GetCurrentTimeline() or self.current_project
+        width = source.GetSetting("timelineResolutionWidth")
+        height = source.GetSetting("timelineResolutionHeight")
+        return int(width), int(height)
+
     def getCurrentProjectName(self):
         """
         Retrieve the name of the current project.
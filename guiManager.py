@@ -23,7 +23,10 @@
 """
 import tkinter as tk
 import win32api     
+import queue
+import threading
 from tkinter import messagebox
+from tkinter import ttk
 
 class GUIManager:
     def __init__(self, cliprocks):
@@ -48,6 +51,64 @@ class GUIManager:
         self.button_frame = tk.Frame(self.root, bg="#282828")
         self.button_frame.pack(fill=tk.BOTH, expand=True)
 
+        # [(order, tk.Button)] kept sorted, buttons can arrive in any order from the loader
+        self.buttons = []
+
+        # shown until the plugin loader calls loading_finished()
+        self.loading_label = tk.Label(self.root, text="…", bg="#282828", fg="#808080")
+        self.loading_label.pack(pady=2)
+
+        # callbacks posted by other threads, run in the Tk thread (see post)
+        self.tk_thread = threading.current_thread()
+        self.pending = queue.Queue()
+        self.root.after(20, self._process_pending)
+
+    def show(self):
+        """
+        Maps the window at the cursor right now, before the main loop starts, so the menu
+        appears while the engine and the plugins are still loading.
+        """
+        self.root.update()
+
+    def post(self, callback, *args):
+        """
+        Runs `callback(*args)` in the Tk thread. Tkinter is not thread safe: background
+        workers (plugin loader, ...) must go through this method to touch the GUI.
+        """
+        if threading.current_thread() is self.tk_thread:
+            callback(*args)
+        else:
+            self.pending.put((callback, args))
+
+    def _process_pending(self):
+        """
+        Executes the callbacks posted by other threads, polled from the Tk main loop. A failing
+        callback is reported and the next ones still run: the polling must never stop while
+        background work is pending.
+        """
+        try:
+            while True:
+                try:
+                    callback, args = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"GUI callback '{getattr(callback, '__name__', callback)}' failed: {e}")
+        finally:
+            try:
+                self.root.after(20, self._process_pending)
+            except tk.TclError:
+                # window destroyed by the callback (exit), nothing left to poll
+                pass
+
+    def loading_finished(self):
+        """
+        Removes the loading indicator once every plugin has been checked.
+        """
+        self.post(self.loading_label.destroy)
+
 
     def show_install_dialog(self, venvPath):
         # Show a dialog box
@@ -93,14 +154,21 @@ class GUIManager:
         creating new windows, as this can inadvertently trigger a focus out event 
         and cause an unintended closure of the application. To disable this behavior,
         use the `disable_close_focus_out()` method.
+
+        The main loop returns (no exit here): ClipRocks.HandlePlugins still runs its cleanup
+        after `run()` (speculative capture and warm up, proxies, shared store).
         """
-        event.widget.destroy()
-        exit(0)
+        self.exit()
 
-    def add_button(self, button_name, plugin_instance):
+    def add_button(self, button_name, plugin_instance, order=0):
         """
-        Adds a button dynamically to the GUI.
+        Adds a button dynamically to the GUI, can be called from any thread. Buttons are
+        kept sorted by `order` whatever the order they are added in.
         """
+        if threading.current_thread() is not self.tk_thread:
+            self.post(self.add_button, button_name, plugin_instance, order)
+            return
+
         def on_click():
             self.cliprocks.on_button_click(button_name)
 
@@ -113,7 +181,82 @@ class GUIManager:
             activebackground="#383838",
             activeforeground="white"
         )
-        button.pack(pady=5, padx=10)
+
+        following = [other for other_order, other in self.buttons if other_order > order]
+        if following:
+            button.pack(pady=5, padx=10, before=following[0])
+        else:
+            button.pack(pady=5, padx=10)
+        self.buttons.append((order, button))
+        self.buttons.sort(key=lambda item: item[0])
+
+    def show_progress(self, job, on_cancel=None, on_background=None):
+        """
+        Replaces the buttons by the progress of `job` (see plugins.job.Job): stage, percentage,
+        elapsed time and a cancel button. The job is polled, the worker never touches Tk.
+        With `on_background`, a "Background" button hides the window and lets the job go on.
+        """
+        self.button_frame.pack_forget()
+
+        progress_frame = tk.Frame(self.root, bg="#282828")
+        progress_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        stage_label = tk.Label(progress_frame, text=job.stage, bg="#282828", fg="white", anchor="w")
+        stage_label.pack(fill=tk.X)
+
+        bar = ttk.Progressbar(progress_frame, length=180, maximum=100, mode="indeterminate")
+        bar.pack(fill=tk.X, pady=5)
+        bar.start(15)
+
+        time_label = tk.Label(progress_frame, text="", bg="#282828", fg="#808080", anchor="w")
+        time_label.pack(fill=tk.X)
+
+        def cancel():
+            cancel_button.config(state=tk.DISABLED, text="Cancelling…")
+            job.cancel()
+            if on_cancel:
+                on_cancel()
+
+        cancel_button = tk.Button(
+            progress_frame,
+            text="Cancel",
+            command=cancel,
+            bg="#181818",
+            fg="white",
+            activebackground="#383838",
+            activeforeground="white"
+        )
+        cancel_button.pack(pady=5)
+
+        if on_background:
+            tk.Button(
+                progress_frame,
+                text="Background",
+                command=on_background,
+                bg="#181818",
+                fg="white",
+                activebackground="#383838",
+                activeforeground="white"
+            ).pack(pady=5)
+
+        def refresh():
+            if not progress_frame.winfo_exists():
+                return
+            stage_label.config(text=job.stage)
+            if job.percent is None:
+                if str(bar["mode"]) != "indeterminate":
+                    bar.config(mode="indeterminate")
+                    bar.start(15)
+                time_label.config(text=f"{job.elapsed():.1f} s")
+            else:
+                if str(bar["mode"]) != "determinate":
+                    bar.stop()
+                    bar.config(mode="determinate")
+                bar["value"] = job.percent
+                time_label.config(text=f"{job.percent:.0f} %  -  {job.elapsed():.1f} s")
+            self.root.after(100, refresh)
+
+        refresh()
 
     def run(self):
         """
@@ -121,8 +264,18 @@ class GUIManager:
         """
         self.root.mainloop()
 
+    def hide(self):
+        """
+        Hides the window, the main loop keeps running (posted callbacks still run).
+        """
+        self.root.withdraw()
+
     def exit(self):
         """
         Closes or destroys the main window associated with the GUI managed by this instance.
+        Safe to call again once destroyed (focus out of several widgets, then _close).
         """
-        self.root.destroy()
\ No newline at end of file
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
\ No newline at end of file
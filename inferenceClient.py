@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from plugins.job import JobCancelled
+
+# body chunks of the downloaded results
+CHUNK_SIZE = 256 * 1024
+
+# seconds between two looks at the cancel button while a node works
+POLL_INTERVAL = 0.2
+
+
+class InferenceClient:
+    """
+    Sends the runs of the AI plugins to the inference nodes of the shop (see InferenceServer)
+    instead of running them on this machine.
+
+    Each run asks every node its /status at once and tries the reachable nodes running the
+    plugin, least busy first (queue depth, then cores). The clipboard image is streamed from its
+    cache file and the result streamed to disk. None is returned when no node could run it:
+    the plugin then runs locally.
+    """
+
+    def __init__(self, nodes, timeout=600, status_timeout=1.0):
+        """
+        :param nodes: base urls of the nodes ("http://192.168.1.20:8765").
+        :param timeout: seconds a node may take to answer a run (queue and inference).
+        :param status_timeout: seconds to answer /status, slower nodes are skipped.
+        """
+        self.nodes = [node.rstrip("/") for node in nodes]
+        self.timeout = timeout
+        self.status_timeout = status_timeout
+
+    def status(self, node):
+        """
+        /status of `node`, or None when unreachable.
+        """
+        import requests
+        try:
+            response = requests.get(f"{node}/status", timeout=self.status_timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError):
+            return None
+
+    def select_nodes(self, plugin_name):
+        """
+        Reachable nodes running `plugin_name`, least busy first.
+        """
+        if not self.nodes:
+            return []
+        with ThreadPoolExecutor(max_workers=len(self.nodes)) as executor:
+            statuses = list(executor.map(self.status, self.nodes))
+
+        candidates = [
+            (node, status) for node, status in zip(self.nodes, statuses)
+            if status and plugin_name in status.get("plugins", [])
+        ]
+        candidates.sort(key=lambda candidate: (candidate[1].get("depth", 0), -candidate[1].get("cores", 1)))
+        return [node for node, _ in candidates]
+
+    def run(self, plugin_name, input_path, output_root, job=None):
+        """
+        Runs `plugin_name` on the image `input_path` on a node. Returns the result path
+        (`output_root` + extension of the result), or None when no node could run it.
+        Raises JobCancelled if `job` is cancelled meanwhile.
+        """
+        for node in self.select_nodes(plugin_name):
+            if job:
+                job.set_stage(f"Running on {urlparse(node).hostname}")
+            try:
+                return self._run_on(node, plugin_name, input_path, output_root, job)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"Inference node {node} failed: {e}")
+        return None
+
+    def _run_on(self, node, plugin_name, input_path, output_root, job):
+        """
+        The request runs in its own thread so that a cancel doesn't wait for the node: the
+        thread is abandoned and drops its result.
+        """
+        result = {}
+        abandoned = threading.Event()
+
+        def request():
+            try:
+                result["path"] = self._post(node, plugin_name, input_path, output_root, job, abandoned)
+            except Exception as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=request, daemon=True)
+        thread.start()
+        while thread.is_alive():
+            thread.join(POLL_INTERVAL)
+            if job and job.cancelled:
+                abandoned.set()
+                job.check_cancelled()
+
+        if "error" in result:
+            raise result["error"]
+        return result["path"]
+
+    def _post(self, node, plugin_name, input_path, output_root, job, abandoned):
+        import requests
+
+        extension = os.path.splitext(input_path)[1][1:].lower()
+        with open(input_path, "rb") as f:
+            # file body: streamed with its Content-Length
+            response = requests.post(
+                f"{node}/run/{plugin_name}",
+                data=f,
+                headers={"X-Image-Extension": extension},
+                stream=True,
+                timeout=(self.status_timeout * 5, self.timeout)
+            )
+
+        with response:
+            if response.status_code != 200:
+                try:
+                    message = response.json().get("message")
+                except ValueError:
+                    message = response.reason
+                raise RuntimeError(f"{response.status_code} {message}")
+
+            output_path = f"{output_root}.{response.headers.get('X-Result-Extension', 'png')}"
+            total = int(response.headers.get("Content-Length") or 0)
+            received = 0
+            try:
+                with open(output_path, "wb") as out:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        if abandoned.is_set():
+                            raise JobCancelled(plugin_name)
+                        out.write(chunk)
+                        received += len(chunk)
+                        if job and total:
+                            job.set_progress(received * 100 / total)
+            except BaseException:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise
+        return output_path
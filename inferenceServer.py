@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from plugins.configManager import ConfigManager
+from plugins.virtualEnvHelper import VirtualEnvHelper
+from plugins.installRegistry import InstallRegistry
+from plugins.media import Media
+from plugins.job import Job
+from clipElement import ClipSnapshot
+from jobQueue import JobQueue
+
+DEFAULT_PORT = 8765
+
+# journal project of the runs of this server in the JobQueue (never recovered by a ClipRocks)
+INFERENCE_PROJECT = "__inference__"
+
+# options of ClipRocks read by the node, missing from a config.conf written by an older version
+DEFAULT_OPTIONS = {
+    "install_cache_ttl": 3600,
+    "job_queue": True,
+    "queue_cores": 0,
+    "queue_memory_mb": 0,
+}
+
+# body chunks read/written while streaming images
+CHUNK_SIZE = 256 * 1024
+
+
+class InferenceServer:
+    """
+    ClipRocks inference node: runs the AI plugins (RemBg, Upscale, ...) of the other machines of
+    the shop, so laptops don't need their own install (see InferenceClient).
+
+    Runs next to a ClipRocks install of the node (same config.conf, venv and plugin installs):
+        python inferenceServer.py --host 0.0.0.0 --port 8765
+
+    - GET /status : {"waiting", "running", "depth", "cores", "plugins"}, read by the clients to
+      pick the least busy node.
+    - POST /run/<PluginClass> : body = the encoded image, header X-Image-Extension. The plugin
+      runs on a ClipSnapshot of that image and the result is streamed back (header
+      X-Result-Extension), errors are {"status": "error", "message"} with a 4xx/5xx code.
+
+    Runs go through the JobQueue of the node like the local ones, so remote and local pastes
+    share its cores.
+    """
+
+    def __init__(self, abs_dir_script):
+        self.abs_dir_script = abs_dir_script
+        self.config = ConfigManager(abs_dir_script)
+        if not self.config.is_config_file_exists():
+            raise FileNotFoundError(f"No config.conf in {abs_dir_script}, run ClipRocks once on this machine.")
+        self.config.initialize_default_config(DEFAULT_OPTIONS)
+
+        self.venv = VirtualEnvHelper(self.config.read_option("venv"))
+        self.venv.activate_for_current_process()
+
+        self.install_registry = InstallRegistry(
+            os.path.join(abs_dir_script, "install_registry.json"),
+            ttl=self.config.read_option("install_cache_ttl")
+        )
+
+        # one folder per run (upload, plugin cache files, result), removed once answered
+        self.work_folder = os.path.join(self.config.read_option("cache"), "inference")
+        os.makedirs(self.work_folder, exist_ok=True)
+
+        self.job_queue = None
+        if self.config.read_option("job_queue"):
+            self.job_queue = JobQueue(
+                os.path.join(self.config.read_option("cache"), "queue"),
+                cores=self.config.read_option("queue_cores"),
+                memory_mb=self.config.read_option("queue_memory_mb")
+            )
+            self._drop_orphans()
+
+        # runs waiting for their turn / running, the queue depth of this node
+        self.counts = {"waiting": 0, "running": 0}
+        self.lock = threading.Lock()
+
+        from plugins.pluginBase import plugin_registry, load_plugins
+        load_plugins(os.path.join(abs_dir_script, "plugins"))
+        self.plugin_registry = plugin_registry
+        self.plugins = sorted(
+            name for name, plugin_class in plugin_registry.items() if self._create_plugin(plugin_class).is_install()
+        )
+
+    def _drop_orphans(self):
+        """
+        Runs of a previous server process: their clients gave up long ago.
+        """
+        for entry in self.job_queue.orphans():
+            if entry.get("project") == INFERENCE_PROJECT:
+                queued_job = self.job_queue.adopt(entry)
+                if queued_job:
+                    self.job_queue.finish(queued_job)
+
+    def _create_plugin(self, plugin_class, clipboard_element=None):
+        return plugin_class(
+            configRoot = self.config,
+            venv = self.venv,
+            clipboard_element = clipboard_element,
+            cache_save_path = self.config.read_option("cache"),
+            davinciAPI = None,
+            install_registry = self.install_registry
+        )
+
+    def status(self):
+        """
+        `depth` also counts the local pastes of the node queued in its JobQueue.
+        """
+        with self.lock:
+            counts = dict(self.counts)
+        depth = counts["waiting"] + counts["running"]
+        if self.job_queue:
+            depth = max(depth, self.job_queue.depth())
+        return {
+            **counts,
+            "depth": depth,
+            "cores": self.job_queue.cores if self.job_queue else os.cpu_count() or 1,
+            "plugins": self.plugins,
+        }
+
+    def run(self, plugin_name, folder, image_name):
+        """
+        Runs `plugin_name` on the image uploaded in `folder`, after its turn in the queue.
+        Returns the result Media (path in `folder`).
+        """
+        with open(os.path.join(folder, image_name), "rb") as f:
+            content_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        with open(os.path.join(folder, "snapshot.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format_ids": [2],
+                "sequence_number": 0,
+                "content_hash": content_hash,
+                "files": [],
+                "text": None,
+                "image": image_name,
+            }, f, indent=4)
+        snapshot = ClipSnapshot(folder)
+
+        plugin_instance = self._create_plugin(self.plugin_registry[plugin_name], snapshot)
+        if not plugin_instance.remote_capable(snapshot):
+            raise ValueError(f"Plugin '{plugin_name}' can't run remotely.")
+        # plugin cache files stay in the run folder
+        plugin_instance.cache_save_path = folder
+        plugin_instance.job = Job(plugin_name)
+
+        queued_job = None
+        state = self._enter("waiting")
+        try:
+            requirements = plugin_instance.job_requirements(snapshot) if self.job_queue else None
+            if requirements:
+                queued_job = self.job_queue.submit(plugin_name, plugin_name, requirements, INFERENCE_PROJECT)
+                self.job_queue.acquire(queued_job)
+
+            state = self._enter("running", state)
+            media = plugin_instance.execute(snapshot)
+            if media is None or not media.get_path():
+                raise RuntimeError(f"Plugin '{plugin_name}' returned no image.")
+            return media
+        finally:
+            if queued_job:
+                self.job_queue.finish(queued_job)
+            self._enter(None, state)
+
+    def _enter(self, state, previous=None):
+        """
+        Moves a run from the `previous` counter to the `state` one (queue depth of /status).
+        """
+        with self.lock:
+            if previous:
+                self.counts[previous] -= 1
+            if state:
+                self.counts[state] += 1
+        return state
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP side of the InferenceServer (`self.server.node`).
+    """
+
+    def do_GET(self):
+        if self.path != "/status":
+            return self._send_error(404, "Unknown path.")
+        self._send_json(200, self.server.node.status())
+
+    def do_POST(self):
+        node = self.server.node
+        plugin_name = self.path[len("/run/"):] if self.path.startswith("/run/") else None
+        if plugin_name not in node.plugins:
+            return self._send_error(404, f"Plugin '{plugin_name}' not available on this node.")
+
+        extension = self.headers.get("X-Image-Extension", "png").lower()
+        if extension not in Media.IMAGE_EXTENSIONS.values():
+            return self._send_error(400, f"Unsupported image type '{extension}'.")
+
+        folder = os.path.join(node.work_folder, uuid.uuid4().hex)
+        os.makedirs(folder)
+        try:
+            image_name = f"image.{extension}"
+            self._receive(os.path.join(folder, image_name))
+            try:
+                media = node.run(plugin_name, folder, image_name)
+            except Exception as e:
+                print(f"Remote run of '{plugin_name}' failed: {e}")
+                return self._send_error(500, str(e))
+            self._send_file(media.get_path())
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _receive(self, path):
+        remaining = int(self.headers.get("Content-Length", 0))
+        with open(path, "wb") as f:
+            while remaining > 0:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ConnectionError("Upload interrupted.")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_file(self, path):
+        extension = os.path.splitext(path)[1][1:].lower()
+        mime_type = next((mime for mime, ext in Media.IMAGE_EXTENSIONS.items() if ext == extension), "application/octet-stream")
+        self.send_response(200)
+        self.send_header("Content-Type", mime_type)
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.send_header("X-Result-Extension", extension)
+        self.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+
+    def _send_json(self, code, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code, message):
+        self._send_json(code, {"status": "error", "message": message})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, abs_dir_script=None):
+    """
+    Starts the inference node and serves until interrupted.
+    """
+    node = InferenceServer(abs_dir_script or os.path.dirname(os.path.abspath(__file__)))
+    httpd = ThreadingHTTPServer((host, port), InferenceRequestHandler)
+    httpd.node = node
+    print(f"ClipRocks inference node on http://{host}:{port} ({', '.join(node.plugins) or 'no plugin installed'})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ClipRocks inference node")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to serve the other machines")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+
+# seconds between two looks at the queue while a job waits for its turn
+POLL_INTERVAL = 0.2
+
+
+def available_memory():
+    """
+    Available physical memory in bytes (GlobalMemoryStatusEx on Windows, sysconf elsewhere).
+    """
+    if os.name == "nt":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullAvailPhys
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def try_lock(path):
+    """
+    Takes an exclusive OS lock on `path` without waiting. Returns the open file holding it, or
+    None if another holder has it. The OS releases the lock when its process dies, so a crashed
+    run never keeps a slot.
+    """
+    handle = open(path, "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return handle
+    except OSError:
+        handle.close()
+        return None
+
+
+def unlock(handle):
+    try:
+        if os.name == "nt":
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    finally:
+        handle.close()
+
+
+class QueuedJob:
+    """
+    A job of the JobQueue held by this process: its journal entry and the locks it owns.
+    """
+
+    def __init__(self, entry, owner_lock):
+        self.entry = entry
+        self.owner_lock = owner_lock
+        self.slot_locks = []
+
+    @property
+    def id(self):
+        return self.entry["id"]
+
+    @property
+    def running(self):
+        return bool(self.slot_locks)
+
+
+class JobQueue:
+    """
+    Queue of the heavy plugin runs (background removal, upscale) shared by every ClipRocks process
+    of the machine: each shortcut press is its own process, so the queue lives on disk.
+
+    - journal/<id>.json : one entry per job (plugin, priority, state, snapshot of its input),
+      written atomically. Finished jobs are removed.
+    - locks/<id>.owner : held by the process running the job, a journal entry whose owner lock
+      is free belongs to a dead process (orphan, see orphans/adopt).
+    - locks/<pool>-<n>.slot : concurrency slots. A job takes one slot of its plugin pool (limit
+      derived from the cores and memory a run needs, see limit) and as many slots of the
+      machine wide "cores" pool as the cores it uses, so plugins don't oversubscribe the CPU.
+
+    Waiting jobs take their turn by priority, then by age.
+    """
+
+    def __init__(self, folder, cores=0, memory_mb=0):
+        """
+        :param folder: queue folder (journal, locks, input snapshots).
+        :param cores: cores shared by the jobs (0 = cpu count).
+        :param memory_mb: memory shared by the jobs (0 = available memory now).
+        """
+        self.folder = folder
+        self.journal_folder = os.path.join(folder, "journal")
+        self.locks_folder = os.path.join(folder, "locks")
+        self.inputs_folder = os.path.join(folder, "inputs")
+        for path in (self.journal_folder, self.locks_folder, self.inputs_folder):
+            os.makedirs(path, exist_ok=True)
+        self.cores = cores or os.cpu_count() or 1
+        self.memory_mb = memory_mb or available_memory() // (1024 * 1024)
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Journal
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def _entry_path(self, job_id):
+        return os.path.join(self.journal_folder, f"{job_id}.json")
+
+    def _owner_path(self, job_id):
+        return os.path.join(self.locks_folder, f"{job_id}.owner")
+
+    @staticmethod
+    def _retry(function, *args):
+        """
+        Windows refuses to replace or remove a file another process is reading: retried shortly.
+        """
+        for attempt in range(10):
+            try:
+                return function(*args)
+            except PermissionError:
+                if attempt == 9:
+                    raise
+                time.sleep(0.02)
+
+    def _write(self, entry):
+        path = self._entry_path(entry["id"])
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=4)
+        self._retry(os.replace, temp_path, path)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.journal_folder):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.journal_folder, name), "r", encoding="utf-8") as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                # being replaced or removed by another process
+                continue
+        return entries
+
+    def _is_alive(self, entry, own_ids=()):
+        """
+        A job is alive while its owner lock is held (by this process or another one).
+        """
+        if entry["id"] in own_ids:
+            return True
+        handle = try_lock(self._owner_path(entry["id"]))
+        if handle is None:
+            return True
+        unlock(handle)
+        return False
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Scheduling
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def limit(self, requirements):
+        """
+        Concurrent runs of a plugin: as many as the cores and memory of one run fit in the
+        machine, capped by its `max_concurrency` (ex: one GPU).
+        """
+        cores = max(1, int(requirements.get("cores") or 1))
+        memory_mb = max(1, int(requirements.get("memory_mb") or 1))
+        limit = min(self.cores // cores, self.memory_mb // memory_mb)
+        if requirements.get("max_concurrency"):
+            limit = min(limit, int(requirements["max_concurrency"]))
+        return max(1, limit)
+
+    def submit(self, plugin, button, requirements, project=None):
+        """
+        Adds a job to the journal and returns its QueuedJob (owned by this process).
+
+        :param plugin: plugin class name (see plugin_registry), to run it again after a crash.
+        :param requirements: {"cores", "memory_mb", "max_concurrency", "priority"} of one run.
+        """
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        owner_lock = try_lock(self._owner_path(job_id))
+        entry = {
+            "id": job_id,
+            "plugin": plugin,
+            "button": button,
+            "project": project,
+            "priority": int(requirements.get("priority", 0)),
+            "cores": min(self.cores, max(1, int(requirements.get("cores") or 1))),
+            "limit": self.limit(requirements),
+            "state": "queued",
+            "input": None,
+            "created_at": time.time(),
+        }
+        self._write(entry)
+        return QueuedJob(entry, owner_lock)
+
+    def set_input(self, queued_job, folder):
+        """
+        Records the snapshot of the job input (see ClipSnapshot): the job can then run again
+        from it if this process dies before the end.
+        """
+        queued_job.entry["input"] = folder
+        self._write(queued_job.entry)
+
+    def input_folder(self, queued_job):
+        return os.path.join(self.inputs_folder, queued_job.id)
+
+    def position(self, queued_job):
+        """
+        Number of live jobs ahead of `queued_job` (waiting with a better rank, or running) among
+        the jobs of its plugin.
+        """
+        rank = (-queued_job.entry["priority"], queued_job.entry["created_at"])
+        ahead = 0
+        for entry in self._entries():
+            if entry["id"] == queued_job.id or entry["plugin"] != queued_job.entry["plugin"]:
+                continue
+            if not self._is_alive(entry):
+                continue
+            if entry["state"] == "running" or (-entry["priority"], entry["created_at"]) < rank:
+                ahead += 1
+        return ahead
+
+    def depth(self):
+        """
+        Live jobs of every process, waiting or running: the load of the machine.
+        """
+        return sum(1 for entry in self._entries() if self._is_alive(entry))
+
+    def _is_first(self, queued_job):
+        """
+        True when no live waiting job goes before `queued_job`: same plugin with a better rank,
+        or any plugin with a higher priority.
+        """
+        rank = (-queued_job.entry["priority"], queued_job.entry["created_at"])
+        for entry in self._entries():
+            if entry["id"] == queued_job.id or entry["state"] != "queued":
+                continue
+            same_plugin = entry["plugin"] == queued_job.entry["plugin"]
+            entry_rank = (-entry["priority"], entry["created_at"])
+            if (same_plugin and entry_rank < rank) or entry["priority"] > queued_job.entry["priority"]:
+                if self._is_alive(entry):
+                    return False
+        return True
+
+    def _take_slots(self, queued_job):
+        """
+        Takes one slot of the plugin pool and `cores` slots of the cores pool, or none.
+        """
+        entry = queued_job.entry
+        locks = []
+        for index in range(entry["limit"]):
+            handle = try_lock(os.path.join(self.locks_folder, f"{entry['plugin']}-{index}.slot"))
+            if handle:
+                locks.append(handle)
+                break
+        if not locks:
+            return False
+
+        for index in range(self.cores):
+            if len(locks) == entry["cores"] + 1:
+                break
+            handle = try_lock(os.path.join(self.locks_folder, f"cores-{index}.slot"))
+            if handle:
+                locks.append(handle)
+        if len(locks) < entry["cores"] + 1:
+            for handle in locks:
+                unlock(handle)
+            return False
+
+        queued_job.slot_locks = locks
+        entry["state"] = "running"
+        entry["started_at"] = time.time()
+        self._write(entry)
+        return True
+
+    def try_acquire(self, queued_job):
+        """
+        Takes the slots of `queued_job` if it is its turn and they are free, without waiting.
+        """
+        return self._is_first(queued_job) and self._take_slots(queued_job)
+
+    def acquire(self, queued_job, check_cancelled=None, on_wait=None):
+        """
+        Waits for the turn of `queued_job` and takes its slots.
+
+        :param check_cancelled: called on every poll, raises to stop waiting (see Job).
+        :param on_wait: called with the number of jobs ahead on every poll.
+        """
+        while not self.try_acquire(queued_job):
+            if check_cancelled:
+                check_cancelled()
+            if on_wait:
+                on_wait(self.position(queued_job))
+            time.sleep(POLL_INTERVAL)
+
+    def complete(self, queued_job, results):
+        """
+        Releases the slots of a job whose results are saved but not imported yet: the results
+        are kept in the journal, so a process taking the job over only imports them.
+
+        :param results: [(asset path, clip name)]
+        """
+        for handle in queued_job.slot_locks:
+            unlock(handle)
+        queued_job.slot_locks = []
+        queued_job.entry["state"] = "done"
+        queued_job.entry["results"] = results
+        self._write(queued_job.entry)
+
+    def finish(self, queued_job):
+        """
+        Releases the slots and removes the job from the journal, with its input snapshot.
+        """
+        for handle in queued_job.slot_locks:
+            unlock(handle)
+        queued_job.slot_locks = []
+        try:
+            self._retry(os.remove, self._entry_path(queued_job.id))
+        except FileNotFoundError:
+            pass
+        if queued_job.entry.get("input"):
+            shutil.rmtree(queued_job.entry["input"], ignore_errors=True)
+        if queued_job.owner_lock:
+            unlock(queued_job.owner_lock)
+            queued_job.owner_lock = None
+        try:
+            os.remove(self._owner_path(queued_job.id))
+        except OSError:
+            # still opened by another process checking it, removed by the next finish/adopt
+            pass
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Recovery
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def orphans(self):
+        """
+        Journal entries of dead processes (popup killed, Resolve closed, crash).
+        """
+        return [entry for entry in self._entries() if not self._is_alive(entry)]
+
+    def adopt(self, entry):
+        """
+        Takes over an orphan job: returns its QueuedJob (waiting again, same rank, or "done" with
+        results to import) or None if another process adopted it first. Orphans without input
+        snapshot can't run again and are dropped.
+        """
+        owner_lock = try_lock(self._owner_path(entry["id"]))
+        if owner_lock is None:
+            return None
+        if not os.path.exists(self._entry_path(entry["id"])):
+            unlock(owner_lock)
+            return None
+
+        if entry["state"] == "done":
+            return QueuedJob(entry, owner_lock)
+
+        queued_job = QueuedJob({**entry, "state": "queued"}, owner_lock)
+        if not entry.get("input") or not os.path.isdir(entry["input"]):
+            self.finish(queued_job)
+            return None
+        self._write(queued_job.entry)
+        return queued_job
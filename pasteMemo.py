@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+
+
+class PasteMemo:
+    """
+    Remembers what the last pastes produced (asset path and media pool clip name) for a given
+    clipboard content, so pressing the shortcut again on the same content appends the existing
+    clip instead of decoding, saving and importing a duplicate.
+
+    Each ClipRocks run is a new process, the memo lives in a small JSON file of the cache folder.
+    An entry matches when the plugin, its result options (see PluginBase.result_options) and
+    the project are the same and:
+    - the clipboard sequence number and formats did not change (same clipboard, nothing to
+      hash; the formats guard against the counter restarting after a reboot), or
+    - the content hash is the same (the same content copied again).
+    """
+
+    def __init__(self, path, size=32):
+        """
+        :param path: JSON file of the memo.
+        :param size: number of pastes remembered (oldest forgotten first).
+        """
+        self.path = path
+        self.size = size
+        self.entries = None
+
+    def _load(self):
+        if self.entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.entries = []
+        return self.entries
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries[-self.size:], f, indent=4)
+        os.replace(temp_path, self.path)
+
+    def lookup(self, button_name, project_name, sequence_number, formats, content_hash, options=None):
+        """
+        Returns the entry produced by `button_name` with `options` for the current clipboard,
+        or None.
+
+        :param content_hash: callable returning the clipboard content hash, only called when no
+            entry has the same sequence number.
+        """
+        candidates = [
+            entry for entry in reversed(self._load())
+            if entry["button"] == button_name and entry["project"] == project_name
+            and entry.get("options") == options and os.path.exists(entry["path"])
+        ]
+        if not candidates:
+            return None
+
+        for entry in candidates:
+            if sequence_number is not None and entry["sequence"] == sequence_number and entry["formats"] == formats:
+                return entry
+
+        current_hash = content_hash()
+        for entry in candidates:
+            if current_hash is not None and entry["hash"] == current_hash:
+                return entry
+        return None
+
+    def record(self, button_name, project_name, sequence_number, formats, content_hash, path, clip_name, options=None):
+        """
+        Remembers the asset and clip produced by `button_name` with `options` for the current
+        clipboard.
+        """
+        entries = self._load()
+        entries[:] = [
+            entry for entry in entries
+            if not (entry["button"] == button_name and entry["project"] == project_name
+                    and entry["hash"] == content_hash and entry.get("options") == options)
+        ]
+        entries.append({
+            "button": button_name,
+            "project": project_name,
+            "options": options,
+            "sequence": sequence_number,
+            "formats": formats,
+            "hash": content_hash,
+            "path": path,
+            "clip_name": clip_name,
+            "pasted_at": time.time(),
+        })
+        self._save()
+
+    def forget(self, entry):
+        """
+        Removes an entry whose clip is gone (deleted from the bin, ...).
+        """
+        entries = self._load()
+        if entry in entries:
+            entries.remove(entry)
+            self._save()
@@ -24,14 +24,103 @@
 
 from ..pluginBase import PluginBase
 from ..media import Media
+from ..imageFitter import ImageFitter
+
+import threading
 
 class PastePlugin(PluginBase):
+    def initConfiguration(self):
+        return {
+            # resample images bigger than the timeline before saving (see ImageFitter)
+            "fit_to_timeline": False,
+            # kept above the timeline size to allow zooming in Resolve (1.5 = 150%)
+            "fit_margin": 1.5,
+            # sub folder of the assets folder where full-res originals are kept
+            "fit_originals_folder": "originals",
+            # download the <img> source of browser copies (CF_HTML) when bigger than the bitmap
+            "fetch_html_original": True,
+            # seconds the paste waits for that download before falling back to the bitmap
+            "html_original_timeout": 3.0,
+        }
+
+    def get_fitter(self):
+        """
+        Returns the ImageFitter for the current timeline, or None if the fit stage is disabled.
+        """
+        if not self.configPlugin.read_option("fit_to_timeline") or not self.davinciAPI:
+            return None
+        if not hasattr(self, "_fitter"):
+            self._fitter = ImageFitter(
+                self.davinciAPI.getTimelineResolution(),
+                margin=self.configPlugin.read_option("fit_margin"),
+                originals_folder=self.configPlugin.read_option("fit_originals_folder")
+            )
+        return self._fitter
+
     def check_condition(self, format_ids):
         """
         Activates the plugin if CF_BITMAP (2) is present in the clipboard formats.
         """
         return {1, 2, 15}.intersection(format_ids)
 
+    def prefetch(self, format_ids):
+        """
+        Starts downloading the original of a browser image copy while the menu is open.
+        """
+        if 2 not in format_ids or not self.configPlugin.read_option("fetch_html_original"):
+            return
+        url = self.clipboard_element.get_html_image_url()
+        if not url:
+            return
+
+        self._original = (None, None)
+        self._original_cancel = threading.Event()
+        self._original_done = threading.Event()
+        threading.Thread(target=self._fetch_original, args=(url,), daemon=True).start()
+
+    def _fetch_original(self, url):
+        try:
+            self._original = self.stream_file_from_url(
+                url,
+                timeout=self.configPlugin.read_option("html_original_timeout"),
+                cancel_event=self._original_cancel
+            )
+        finally:
+            self._original_done.set()
+
+    def get_original_media(self):
+        """
+        Returns the Media of the prefetched original, or None to use the clipboard bitmap:
+        no prefetch, timeout, download error, unsupported format or not bigger than the bitmap.
+        """
+        import io
+        from PIL import Image
+
+        if not getattr(self, "_original_done", None):
+            return None
+
+        self.set_stage("Fetching original image")
+        if not self._original_done.wait(self.configPlugin.read_option("html_original_timeout")):
+            self._original_cancel.set()
+            print("Original image download timed out, using the clipboard bitmap.")
+            return None
+
+        file_data, _ = self._original
+        if not file_data:
+            return None
+        try:
+            with Image.open(io.BytesIO(file_data)) as image:
+                mime_type = Image.MIME.get(image.format)
+                width, height = image.size
+        except Exception as e:
+            print(f"Original image not readable, using the clipboard bitmap: {e}")
+            return None
+
+        bitmap_size = self.clipboard_element.get_bitmap_size()
+        if mime_type not in Media.IMAGE_EXTENSIONS or (bitmap_size and width * height <= bitmap_size[0] * bitmap_size[1]):
+            return None
+        return Media(raw_content=file_data, mime_type=mime_type)
+
     def execute(self, clipboard_element):
         """
         Executes the plugin logic to paste the clipboard content into DaVinci Resolve.
@@ -49,7 +138,10 @@ class PastePlugin(PluginBase):
 
         # CLIPBOARD TYPE IMAGE
         if 2 in clipboard_element.get_format_ids():
-            return self.extract_image_from_clipboard()
+            media = self.get_original_media() or self.extract_image_from_clipboard()
+            if self.get_fitter():
+                media.custom_savers = {mime_type: self.save_fitted_image for mime_type in Media.IMAGE_EXTENSIONS}
+            return media
 
         # CLIPBOARD TYPE TXT 
         elif 1 in clipboard_element.get_format_ids():
@@ -102,8 +194,69 @@ class PastePlugin(PluginBase):
         file_name = f"{media.index_file}{extension}"
         full_path = os.path.join(media.save_path, file_name)
 
+        # Optional fit stage: keep the download as original, save a resampled copy
+        fitter = self.get_fitter()
+        if fitter and mime_type in ImageFitter.FIT_MIME_TYPES:
+            self.save_fitted_data(media, file_data, file_name)
+            return extension.replace(".", ""), full_path
+
         # Sauvegarder le contenu dans un fichier
         with open(full_path, "wb") as f:
             f.write(file_data)
         
-        return extension.replace(".", ""), full_path
\ No newline at end of file
+        return extension.replace(".", ""), full_path
+
+    def save_fitted_image(self, media):
+        """
+        Saver for clipboard images when the fit stage is enabled: the full-res image is kept in
+        the originals folder and the resampled copy is saved as the asset.
+        """
+        import os
+
+        fitter = self.get_fitter()
+        image = media.raw_content
+        if isinstance(image, bytes):
+            extension = Media.IMAGE_EXTENSIONS.get(media.mime_type, "png")
+            return extension, self.save_fitted_data(media, image, f"{media.index_file}.{extension}")
+
+        if not fitter.target_size(image.size):
+            return media._save_as_image(media)
+
+        file_name = f"{media.index_file}.png"
+        original_path = os.path.join(fitter.get_originals_path(media.save_path), file_name)
+        image.save(original_path)
+
+        full_path = os.path.join(media.save_path, file_name)
+        fitter.fit(image).save(full_path)
+
+        fitter.record_original(media.save_path, file_name, original_path)
+        media.original_path = original_path
+        return "png", full_path
+
+    def save_fitted_data(self, media, file_data, file_name):
+        """
+        Fit stage for encoded files (downloads, clipboard PNG/JPEG/WebP): the bytes are written
+        as the original, then resampled into the asset (or just moved when already small enough).
+        :return: full path of the asset.
+        """
+        import os
+
+        fitter = self.get_fitter()
+        full_path = os.path.join(media.save_path, file_name)
+        original_path = os.path.join(fitter.get_originals_path(media.save_path), file_name)
+        with open(original_path, "wb") as f:
+            f.write(file_data)
+
+        try:
+            fitted = fitter.fit_file(original_path, full_path)
+        except Exception as e:
+            # undecodable or truncated file: the asset is the downloaded bytes, as without the fit stage
+            print(f"Could not fit {file_name}, keeping the original: {e}")
+            fitted = False
+
+        if fitted:
+            fitter.record_original(media.save_path, file_name, original_path)
+            media.original_path = original_path
+        else:
+            os.replace(original_path, full_path)
+        return full_path
@@ -49,7 +49,7 @@ class ConfigManager:
 
         # pluginName
         self.pluginName = pluginName
-        if (self.pluginName):
+        if (self.pluginName and not self.pluginName.lower().endswith("plugin")):
             self.pluginName = f"{pluginName}Plugin"
 
         # root/plugin folder & config file 
@@ -63,11 +63,14 @@ class ConfigManager:
         If the configuration file does not exist, it calculates derived paths and writes 
         the configuration to the file. Otherwise, it reads the configuration from the file
         using the read_config method.
+
+        Options added to `dataConfig` after the file was written (new plugin options) are
+        merged in the cache as defaults, values from the file always win.
         """
         if not self.is_config_file_exists():
             self.configCache = self.write_config(dataConfig)
         else:
-            self.configCache = self.read_config()
+            self.configCache = {**dataConfig, **self.read_config()}
 
 
     def _set_plugin_folder_and_json(self):
@@ -78,12 +81,25 @@ class ConfigManager:
         Otherwise, it uses the root configuration directory.
         """
         if self.pluginName:
-            self.PluginFolder = os.path.join(self.rootConfig, self.pluginsNameFolder, self.pluginName.lower())
+            self.PluginFolder = os.path.join(self.rootConfig, self.pluginsNameFolder, self._find_plugin_folder_name())
             self.configPath = os.path.join(self.PluginFolder, self.configFileName)
         else:
             self.PluginFolder = None
             self.configPath = os.path.join(self.rootConfig, self.configFileName)
 
+    def _find_plugin_folder_name(self):
+        """
+        Returns the real name of the plugin folder (ex: `rembgPlugin` for `rembgplugin`), the
+        lookup is case insensitive like Windows so it also works on case sensitive file systems.
+        """
+        folder_name = self.pluginName.lower()
+        plugins_root = os.path.join(self.rootConfig, self.pluginsNameFolder)
+        if os.path.isdir(plugins_root):
+            for entry in os.listdir(plugins_root):
+                if entry.lower() == folder_name:
+                    return entry
+        return folder_name
+
     def is_config_file_exists(self):
         """
         Checks if the configuration file exists.
@@ -145,16 +161,23 @@ class ConfigManager:
         """
         Writes or updates a specific configuration option in the file.
         """
-        if not self.is_config_file_exists():
-            with open(self.configPath, 'w') as file:
-                json.dump({}, file)
+        self.write_options({option_name: value})
 
-        with open(self.configPath, 'r+') as file:
-            config = json.load(file)
-            config[option_name] = value
-            file.seek(0)
-            json.dump(config, file, indent=4)
-            file.truncate()
+    def write_options(self, options: dict):
+        """
+        Writes or updates several configuration options in the file at once (same single
+        backslash format as `write_config`) and keeps the cache in sync.
+        """
+        cache = self.configCache or {}
+        config = self.read_config(use_cache=False)
+        config.update(options)
+
+        json_string = json.dumps(config, indent=4)
+        json_string = json_string.replace("\\\\", "\\")
+        with open(self.configPath, "w", encoding="utf-8") as f:
+            f.write(json_string)
+
+        self.configCache = {**cache, **config}
 
     def create_config_file(self):
         """
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+from PIL import Image
+
+
+class ImageFitter:
+    """
+    Resamples oversized still images down to the timeline resolution (plus a zoom margin) before
+    they are handed to DaVinci Resolve, so Resolve does not decode and scale a 8000x6000 photo on
+    every frame it plays.
+
+    The full resolution original is kept on disk and recorded in an `originals.json` index next to
+    the saved assets, so the fitted file can be swapped back for the original later.
+    """
+
+    # index file stored in the assets folder : { "5.jpg": "...\\originals\\5.jpg" }
+    INDEX_FILE_NAME = "originals.json"
+    # raster formats Pillow decodes and saves back in place; anything else (svg, icons...) is kept untouched
+    FIT_MIME_TYPES = {"image/png", "image/jpeg", "image/webp", "image/bmp", "image/tiff", "image/gif"}
+
+    def __init__(self, timeline_size, margin=1.5, originals_folder="originals"):
+        """
+        :param timeline_size: (width, height) of the timeline, see DaVinciAPI.getTimelineResolution.
+        :param margin: extra scale kept above the timeline size to allow zooming in Resolve.
+        :param originals_folder: sub folder (inside save_path) where full-res originals are kept.
+        """
+        self.timeline_size = timeline_size
+        self.margin = margin
+        self.originals_folder = originals_folder
+
+    def target_size(self, size):
+        """
+        Returns the size an image of `size` should be resampled to, or None if it already fits.
+
+        Resolve displays a still with "scale entire image to fit", so the useful resolution is
+        the one that fits inside the timeline frame, multiplied by the zoom margin.
+        """
+        width, height = size
+        timeline_width, timeline_height = self.timeline_size
+        scale = min(timeline_width / width, timeline_height / height) * self.margin
+        if scale >= 1:
+            return None
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def fit(self, image):
+        """
+        Returns `image` resampled to `target_size`, or the image itself when no resampling is needed.
+
+        JPEG sources are decoded through `draft()` so libjpeg only produces the 1/2, 1/4 or 1/8
+        scale we need, then `reduce()` shrinks by the largest integer factor before the final
+        Lanczos pass, which only has to cover the remaining fractional step.
+        """
+        target = self.target_size(image.size)
+        if not target:
+            return image
+
+        # JPEG: let the decoder do the coarse downscale (never below target)
+        if image.format == "JPEG":
+            image.draft(image.mode, target)
+
+        # integer box reduction, cheap compared to a full Lanczos on the source size
+        factor = min(image.size[0] // target[0], image.size[1] // target[1])
+        if factor >= 2:
+            image = image.reduce(factor)
+
+        return image.resize(target, Image.Resampling.LANCZOS)
+
+    def fit_file(self, source_path, dest_path):
+        """
+        Reads `source_path`, writes the fitted version to `dest_path` in the same format and
+        returns True. Returns False (nothing written) when the image already fits.
+        """
+        with Image.open(source_path) as image:
+            image_format = image.format
+            # animations would be reduced to their first frame
+            if getattr(image, "is_animated", False) or not self.target_size(image.size):
+                return False
+            fitted = self.fit(image)
+            if image_format == "JPEG":
+                fitted.save(dest_path, format="JPEG", quality=95)
+            else:
+                fitted.save(dest_path)
+        return True
+
+    def get_originals_path(self, save_path):
+        """
+        Returns (and creates) the folder where full-res originals are kept for `save_path`.
+        """
+        path = os.path.join(save_path, self.originals_folder)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def record_original(self, save_path, filename, original_path):
+        """
+        Records that `filename` (saved in `save_path`) is a fitted copy of `original_path`.
+        """
+        index = self.read_index(save_path)
+        index[filename] = original_path
+        with open(os.path.join(save_path, self.INDEX_FILE_NAME), "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=4)
+
+    @classmethod
+    def read_index(cls, save_path):
+        """
+        Returns the { fitted filename: original path } index of `save_path`.
+        """
+        index_path = os.path.join(save_path, cls.INDEX_FILE_NAME)
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @classmethod
+    def get_original(cls, save_path, filename):
+        """
+        Returns the full-res original path of a fitted asset, or None if it was never fitted.
+        Use it with `MediaPoolItem.ReplaceClip(original)` to restore the full resolution in Resolve.
+        """
+        return cls.read_index(save_path).get(filename)
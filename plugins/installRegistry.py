@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class InstallRegistry:
+    """
+    Remembers the install state of each plugin (installed, version, fingerprint of its artifacts)
+    in a small JSON file next to the script, so `is_install` does not stat venvs, binaries and
+    models on every click (each stat is a round trip on network home directories).
+
+    - a positive state younger than `ttl` seconds is trusted without touching the disk,
+    - otherwise the artifacts are fingerprinted (size/mtime, one stat each) and the recorded state
+      is kept if nothing changed,
+    - the full plugin probe (imports, versions, ...) only runs when the fingerprint changed.
+    """
+
+    def __init__(self, path, ttl=3600):
+        """
+        :param path: JSON file of the registry.
+        :param ttl: seconds during which an installed plugin is not revalidated at all.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.entries = None
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.entries = {}
+        return self.entries
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def fingerprint(paths):
+        """
+        Returns { path: [size, mtime_ns] } (None for missing paths). For a folder, the mtime
+        changes when files are added or removed in it (models downloaded, ...).
+        """
+        result = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                result[path] = [stat.st_size, stat.st_mtime_ns]
+            except OSError:
+                result[path] = None
+        return result
+
+    def get(self, name):
+        """
+        Returns the recorded entry of plugin `name` or None.
+        """
+        with self.lock:
+            return self._load().get(name)
+
+    def check(self, name, artifacts, probe):
+        """
+        Returns True if plugin `name` is installed.
+
+        :param artifacts: callable returning the paths whose fingerprint tells whether the install
+            changed (only called when the TTL expired).
+        :param probe: full check, returns (installed, version), only called on fingerprint change.
+        """
+        with self.lock:
+            entries = self._load()
+            entry = entries.get(name)
+            now = time.time()
+
+            if entry and entry["installed"] and now - entry["checked_at"] < self.ttl:
+                return True
+
+            fingerprint = self.fingerprint(artifacts())
+            if entry and entry["fingerprint"] == fingerprint:
+                entry["checked_at"] = now
+                self._save()
+                return entry["installed"]
+
+            installed, version = probe()
+            entries[name] = {
+                "installed": installed,
+                "version": version,
+                "fingerprint": fingerprint,
+                "checked_at": now,
+            }
+            self._save()
+            return installed
+
+    def invalidate(self, name):
+        """
+        Forgets plugin `name`, next `check` runs the full probe (ex: after a failed execution).
+        """
+        with self.lock:
+            if self._load().pop(name, None) is not None:
+                self._save()
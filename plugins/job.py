@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import re
+import time
+import threading
+import subprocess
+
+
+class JobCancelled(Exception):
+    """
+    Raised in the job worker when the user cancelled the job.
+    """
+
+
+class Job:
+    """
+    State of a plugin run executed in background (see ClipRocks.on_button_click): current stage,
+    percentage, elapsed time, and the subprocesses to kill if the user cancels.
+
+    The GUI only reads the state (polling), the worker only writes it, so the only lock needed is
+    around the list of running processes.
+    """
+
+    # "42.5%" / "42,5 %" as printed by upscayl-bin and most CLI tools
+    PERCENT_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*%")
+
+    def __init__(self, name):
+        self.name = name
+        self.stage = "Starting"
+        self.percent = None
+        self.started_at = time.perf_counter()
+        self.cancelled = False
+        self.processes = []
+        self.lock = threading.Lock()
+
+    def set_stage(self, stage, percent=None):
+        """
+        Starts a new stage (shown in the progress window), `percent` is reset if not given.
+        """
+        self.check_cancelled()
+        self.stage = stage
+        self.percent = percent
+
+    def set_progress(self, percent):
+        self.percent = max(0.0, min(100.0, percent))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def cancel(self):
+        """
+        Cancels the job: kills the running subprocesses, the worker stops at its next check.
+        """
+        self.cancelled = True
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(self.name)
+
+    def run_process(self, args, outputs=(), parse_progress=True, **kwargs):
+        """
+        Runs `args` like subprocess.run (text mode, stdout/stderr captured) while parsing the
+        percentages printed on either stream into the job progress (unless `parse_progress` is
+        False, ex: per-file percentages of a batch). The process is killed if the job is
+        cancelled, and the `outputs` files it may have partially written are removed.
+
+        :return: subprocess.CompletedProcess
+        """
+        self.check_cancelled()
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            **kwargs
+        )
+        return self.wait_process(process, outputs=outputs, parse_progress=parse_progress)
+
+    def wait_process(self, process, outputs=(), parse_progress=True):
+        """
+        Same as `run_process` for a process already started (text mode, stdout/stderr pipes),
+        ex: a worker spawned ahead of the click (see PluginBase.warm_up).
+
+        :return: subprocess.CompletedProcess
+        """
+        with self.lock:
+            self.processes.append(process)
+        if self.cancelled and process.poll() is None:
+            process.kill()
+
+        stdout, stderr = [], []
+        readers = [
+            threading.Thread(target=self._read_stream, args=(process.stdout, stdout, parse_progress), daemon=True),
+            threading.Thread(target=self._read_stream, args=(process.stderr, stderr, parse_progress), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        process.wait()
+        for reader in readers:
+            reader.join()
+
+        with self.lock:
+            self.processes.remove(process)
+
+        if self.cancelled:
+            for output in outputs:
+                if os.path.exists(output):
+                    os.remove(output)
+            raise JobCancelled(self.name)
+
+        return subprocess.CompletedProcess(process.args, process.returncode, "".join(stdout), "".join(stderr))
+
+    def _read_stream(self, stream, lines, parse_progress=True):
+        """
+        Reads a process stream line by line (upscayl-bin ends its progress lines with \\r or \\n).
+        """
+        buffer = ""
+        while True:
+            chunk = stream.read(1)
+            if not chunk:
+                break
+            buffer += chunk
+            if chunk in "\r\n":
+                if parse_progress:
+                    self._parse_progress(buffer)
+                lines.append(buffer)
+                buffer = ""
+        if buffer:
+            if parse_progress:
+                self._parse_progress(buffer)
+            lines.append(buffer)
+        stream.close()
+
+    def _parse_progress(self, line):
+        match = self.PERCENT_PATTERN.search(line)
+        if match:
+            self.set_progress(float(match.group(1).replace(",", ".")))
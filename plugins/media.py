@@ -24,11 +24,23 @@
 
 import os 
 import io
+import json
+import shutil
 import win32clipboard
 from PIL import Image # Convert the handle to actual image data
 
 
 class Media:
+    # image mime types -> extension of the encoded bytes written as is (see _save_as_image)
+    IMAGE_EXTENSIONS = {
+        "image/png": "png",
+        "image/jpeg": "jpg",
+        "image/webp": "webp",
+        "image/gif": "gif",
+    }
+    # PNG text chunk of the cutouts saved cropped to their alpha bounds (see cliprembg.py)
+    AUTOCROP_KEY = "ClipRocks:autocrop"
+
     def __init__(self, raw_content=None, mime_type=None, path=None, custom_savers={}, custom_catchers={}):
         """
         TODO: Consider implementing a history of mutations with a table of paths to be able to trace 
@@ -64,6 +76,14 @@ class Media:
         # defined FOR SAVE before stored
         self.save_path = None
 
+        # full resolution source when the saved file is a resampled copy (see ImageFitter)
+        self.original_path = None
+
+        # shared store of the team (see SharedStore) and the work key of this media: save copies
+        # the stored file instead of catching/encoding, and stores what it saved
+        self.store = None
+        self.store_key = None
+
 
         """──────────────────────────────────────────────────────────────────────────────────
         Catchers & Savers 
@@ -74,13 +94,13 @@ class Media:
         self.custom_savers = custom_savers
 
         self._default_savers = {
-            "image/png": self._save_as_image,
+            **{mime_type: self._save_as_image for mime_type in self.IMAGE_EXTENSIONS},
             "text/plain": self._save_as_text,
             "video/mp4": self._save_as_video,
         }
 
         self._default_catchers = {
-            "image/png": self._get_content_image,
+            **{mime_type: self._get_content_image for mime_type in self.IMAGE_EXTENSIONS},
             "text/plain": self._get_content_text,
             "video/mp4": self._get_content_video,
         }
@@ -99,6 +119,9 @@ class Media:
         """
 
         self.save_path = save_path
+        if self._save_from_store():
+            return self.path
+
         catcher = self._get_catcher()
         saver = self._get_saver()
         
@@ -111,9 +134,34 @@ class Media:
         self.index_file = self._generate_file_name(self.save_path)
         extension, self.path = saver(self)
         self.filename = f"{self.index_file}.{extension}"
+
+        if self.store and self.store_key:
+            try:
+                self.store.put(self.store_key, self.path, mime_type=self.mime_type)
+            except OSError as e:
+                print(f"Shared store not updated: {e}")
         
         return self.path
 
+    def _save_from_store(self):
+        """
+        Copies the file stored for `store_key` in `save_path`, returns False when there is none.
+        """
+        if not self.store or not self.store_key:
+            return False
+        stored = self.store.get(self.store_key)
+        if not stored:
+            return False
+
+        stored_path, ref = stored
+        extension = os.path.splitext(stored_path)[1][1:]
+        self.index_file = self._generate_file_name(self.save_path)
+        self.path = os.path.join(self.save_path, f"{self.index_file}.{extension}")
+        shutil.copyfile(stored_path, self.path)
+        self.filename = f"{self.index_file}.{extension}"
+        self.mime_type = ref.get("mime_type") or self.mime_type
+        return True
+
 
     def _get_catcher(self):
         """
@@ -133,16 +181,21 @@ class Media:
         image from the clipboard.
         
         Note:
-            - The image is returned as a PIL.Image object for further processing or display.
+            - The clipboard image is returned as a PIL.Image object for further processing or display.
+            - Files are already encoded: their bytes are kept and written as they are (no decode /
+              encode, PNG text chunks such as AUTOCROP_KEY are preserved).
             - This method ensures that the image content is correctly loaded, handling both clipboard
               data and files on disk.
+            - Encoded bytes taken from the clipboard (PNG/JPEG/WebP registered formats) are
+              kept as they are, `_save_as_image` writes them without decoding.
         """
+        if not self.path and isinstance(self.raw_content, bytes):
+            return
         if self.path:
             folder = os.path.dirname(self.path)
             if os.path.exists(folder):
                 with open(self.path, 'rb') as f:
-                    raw_data = f.read() 
-                    self.raw_content = Image.open(io.BytesIO(raw_data))  # Charge le fichier comme une image PIL
+                    self.raw_content = f.read()
                     return
         self.raw_content = self.get_clipboard_image()  # Retourne l'image depuis le presse-papier
 
@@ -189,6 +242,23 @@ class Media:
         """
         return self.path
 
+    @staticmethod
+    def read_autocrop(path):
+        """
+        Returns the autocrop geometry {"box": [left, top, right, bottom], "size": [width, height]}
+        of a cutout saved cropped (AUTOCROP_KEY chunk), or None. Only the PNG header chunks are
+        read, the pixels are not decoded.
+        """
+        if not path or not path.lower().endswith(".png"):
+            return None
+        try:
+            with Image.open(path) as image:
+                value = image.info.get(Media.AUTOCROP_KEY)
+            return json.loads(value) if value else None
+        except (OSError, ValueError) as e:
+            print(f"Autocrop geometry not read: {e}")
+            return None
+
     def update_mimeType_path(self, mimeType, path):
         """
         Updates the MIME type and path for the media.
@@ -217,6 +287,13 @@ class Media:
 
         TODO : Why I did that (self, media) ??? Very strange, investigation is required
         """
+        if isinstance(self.raw_content, bytes):
+            extension = self.IMAGE_EXTENSIONS.get(self.mime_type, "png")
+            full_path = os.path.join(self.save_path, f"{self.index_file}.{extension}")
+            with open(full_path, "wb") as f:
+                f.write(self.raw_content)
+            return extension, full_path
+
         file_name = f"{self.index_file}.png"
         full_path = os.path.join(self.save_path, file_name)
         # Sauvegarde l'image
@@ -260,8 +337,9 @@ class Media:
         Get an image from the clipboard and returns it as a PIL Image object.
         Returns the image if available, otherwise None.
         """
-        win32clipboard.OpenClipboard()
-        try:
+        from clipElement import open_clipboard
+
+        with open_clipboard():
             # Check if an image is available
             if win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_DIB):
                 data = win32clipboard.GetClipboardData(win32clipboard.CF_DIB)
@@ -271,6 +349,4 @@ class Media:
                 return image
             else:
                 print("No image in clipboard.")
-                return None
-        finally:
-            win32clipboard.CloseClipboard()
\ No newline at end of file
+                return None
\ No newline at end of file
@@ -25,13 +25,33 @@
 from .virtualEnvHelper import VirtualEnvHelper
 from .media import Media
 
+import os
 import re
+import importlib
+import threading
+import subprocess
 
 from .configManager import ConfigManager
 
 # Global plugin registry
 plugin_registry = {}
 
+def load_plugins(plugin_dir):
+    """
+    Imports `plugins.<folder>.main` for every folder of `plugin_dir` with a main.py, the plugin
+    classes register themselves in `plugin_registry` (see PluginBase.__init_subclass__).
+    """
+    for plugin_name in os.listdir(plugin_dir):
+        plugin_path = os.path.join(plugin_dir, plugin_name)
+        if os.path.isdir(plugin_path):
+            main_file = os.path.join(plugin_path, "main.py")
+            if os.path.isfile(main_file):
+                try:
+                    module_name = f"plugins.{plugin_name}.main"
+                    importlib.import_module(module_name)
+                except ImportError as e:
+                    print(f"Plugin '{plugin_name}' failed to import: {e}")
+
 class PluginBase:
     def __init_subclass__(cls, **kwargs):
         """
@@ -83,6 +103,30 @@ class PluginBase:
         self.clipboard_element = kwargs.get('clipboard_element')
         self.cache_save_path = self.configRoot.read_option("cache")
 
+        # clipboard image saved in the cache while the menu was open (see ClipCapture), may be None
+        self.clipboard_capture = kwargs.get('clipboard_capture')
+
+        # content-addressed store shared by the team (see SharedStore), may be None
+        self.shared_store = kwargs.get('shared_store')
+
+        # DaVinci Resolve workspace (timeline resolution, ...), may be None outside Resolve
+        self.davinciAPI = kwargs.get('davinciAPI')
+
+        # background Job of the current execution (progress, cancel), set by ClipRocks before execute
+        self.job = None
+
+        # results handed over while `execute` runs (see publish), set by ClipRocks
+        self.media_sink = None
+        self.published = []
+
+        # cached install states shared by all plugins (see is_install)
+        self.install_registry = kwargs.get('install_registry')
+
+        # set to stop the speculative work of warm_up (another button chosen, menu closed), the
+        # lock guards what warm_up hands over to execute (worker process, ...)
+        self.warm_up_cancel = threading.Event()
+        self.warm_up_lock = threading.Lock()
+
 
     def initConfiguration(self): 
         """
@@ -119,10 +163,135 @@ class PluginBase:
     def is_install(self):
         """
         check that the plugin is properly installed in the directory specified in its own 
-        configuration file. This method should be overridden in child classes if needed.
+        configuration file. Child classes override `probe_install` and `install_artifacts`,
+        the result is cached by the InstallRegistry and only probed again when the
+        fingerprint of the artifacts changed.
+        """
+        if not self.install_registry:
+            return self.probe_install()[0]
+        return self.install_registry.check(self.pluginName, self.install_artifacts, self.probe_install)
+
+    def probe_install(self):
+        """
+        Full install check, returns (installed, version). This method should be overridden
+        in child classes if needed.
+        """
+        return True, None
+
+    def install_artifacts(self):
+        """
+        Returns the paths (binaries, libs, model folders) whose size/mtime change when the plugin
+        install changes. Without artifacts, `probe_install` runs on every check.
+        """
+        return []
+
+    def invalidate_install(self):
+        """
+        Forgets the cached install state (ex: the plugin failed, its files may be gone).
+        """
+        if self.install_registry:
+            self.install_registry.invalidate(self.pluginName)
+
+
+    def prefetch(self, format_ids):
+        """
+        Called once the button is shown, while the user is still choosing: speculative work
+        (downloads, ...) started here must run in its own thread and be disposable, the menu
+        may be dismissed or another button clicked. No-op by default.
+        """
+        pass
+
+    def warm_up(self):
         """
-        return True
+        Speculative work while the menu is open, when this button is the one the user usually
+        clicks for this clipboard (see UsageStats), run in its own thread: the install is
+        checked and the `warm_up_files` are read into the OS page cache, so the click doesn't
+        wait on the disk. Plugins may also start their worker process ahead. Everything must
+        stop once `warm_up_cancel` is set (see cancel_warm_up).
+        """
+        if self.warm_up_cancel.is_set() or not self.is_install():
+            return
+        self.preload_files(self.warm_up_files(), self.warm_up_cancel)
+
+    def warm_up_files(self):
+        """
+        Files and folders read by `warm_up` (models, binaries), the install artifacts by default.
+        """
+        return self.install_artifacts()
+
+    def cancel_warm_up(self):
+        """
+        Stops the speculative work of `warm_up`. Plugins starting a worker ahead kill it here.
+        """
+        self.warm_up_cancel.set()
+
+    @staticmethod
+    def preload_files(paths, cancel_event=None, limit=1024 * 1024 * 1024, chunk_size=8 * 1024 * 1024):
+        """
+        Reads `paths` (files, or folders walked) and drops the data: the next read is served
+        from the page cache. Stops at `limit` bytes or when `cancel_event` is set.
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for folder, _, names in os.walk(path):
+                    files += [os.path.join(folder, name) for name in names]
+            elif os.path.isfile(path):
+                files.append(path)
 
+        total = 0
+        for path in files:
+            try:
+                with open(path, "rb", buffering=0) as f:
+                    while total < limit:
+                        if cancel_event and cancel_event.is_set():
+                            return total
+                        read = len(f.read(chunk_size))
+                        if not read:
+                            break
+                        total += read
+            except OSError:
+                continue
+        return total
+
+    def preview(self, clipboard_element):
+        """
+        Optimistic paste: returns a fast stand-in of the `execute` result (same size), appended
+        to the timeline right away. `execute` then runs in the background and its result replaces
+        the stand-in (ReplaceClip). None (default) waits for `execute` as usual.
+        """
+        return None
+
+    def job_requirements(self, clipboard_element):
+        """
+        Resources of one run for the job queue (see JobQueue): {"cores", "memory_mb",
+        "max_concurrency" (optional), "priority"}. Heavy plugins return them so their runs wait
+        their turn instead of oversubscribing the machine, None (default) runs at once.
+        """
+        return None
+
+    def remote_capable(self, clipboard_element):
+        """
+        True when this run can go to an inference node (see InferenceClient): the plugin works on
+        the clipboard image alone (`get_cache_input`) and returns a single image. False by default.
+        """
+        return False
+
+    def store_key(self, clipboard_element):
+        """
+        Key of the result of this run in the shared store (see SharedStore): everything the result
+        depends on (options, content hash of the input). A stored result is used instead of
+        running `execute`. None (default) always runs.
+        """
+        return None
+
+    def result_options(self):
+        """
+        Plugin options the result depends on (model, scale, ...), JSON values: a repeat paste
+        made with other options runs again (see PasteMemo). None (default) when the result only
+        depends on the clipboard.
+        """
+        return None
 
     def execute(self, media_info):
         """
@@ -130,14 +299,83 @@ class PluginBase:
         """
         raise NotImplementedError
 
+    def set_stage(self, stage, percent=None):
+        """
+        Reports the current stage of `execute` to the progress window (no-op without job).
+        """
+        if self.job:
+            self.job.set_stage(stage, percent)
+
+    def run_subprocess(self, args, outputs=(), parse_progress=True, **kwargs):
+        """
+        Runs an external process like subprocess.run (text, stdout/stderr captured). Within a job,
+        its printed percentages feed the progress window (if `parse_progress`) and it is killed
+        on cancel, the partial `outputs` files being removed.
+        """
+        if self.job:
+            return self.job.run_process(args, outputs=outputs, parse_progress=parse_progress, **kwargs)
+        return subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **kwargs)
+
+    def wait_subprocess(self, process, outputs=(), parse_progress=True):
+        """
+        `run_subprocess` for a process already started with text pipes (worker spawned by
+        `warm_up`): waits for it, with progress and cancel within a job.
+        """
+        if self.job:
+            return self.job.wait_process(process, outputs=outputs, parse_progress=parse_progress)
+        stdout, stderr = process.communicate()
+        return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+    def publish(self, media):
+        """
+        Hands a finished Media over while `execute` goes on (batches): ClipRocks saves and
+        imports it at once. `execute` returns None when all its results were published.
+        """
+        if self.media_sink:
+            self.media_sink(media)
+        else:
+            self.published.append(media)
+
     def extract_image_from_clipboard(self):
         """
         Checks if the clipboard contains an image and returns a Media object containing
-        the image data.
+        the image data. The original encoded file (PNG/JPEG/WebP registered by browsers and
+        image editors) is preferred, the DIB is only decoded when there is none. The file of
+        the speculative capture is used once there (already encoded, see ClipCapture).
         """
+        capture = self._get_capture()
+        encoded_data, extension = capture.get_encoded_image() if capture else (None, None)
+        if not encoded_data:
+            encoded_data, extension = self.clipboard_element.get_encoded_image()
+        if encoded_data:
+            mime_type = next(mime for mime, ext in Media.IMAGE_EXTENSIONS.items() if ext == extension)
+            return Media(raw_content=encoded_data, mime_type=mime_type)
+
         raw_data = self.clipboard_element.get_raw_BITMAP()
         return Media(raw_content=raw_data, mime_type="image/png")
 
+    def get_cache_input(self):
+        """
+        The clipboard image saved in the cache folder (Media with its path set), the input file of
+        external tools. Taken from the capture made while the menu was open, saved now without one.
+        """
+        capture = self._get_capture()
+        media = capture.take() if capture else None
+        if media:
+            return media
+        media = self.extract_image_from_clipboard()
+        media.save(self.cache_save_path)
+        return media
+
+    def _get_capture(self):
+        """
+        The capture, when it was made from the clipboard this plugin runs on (not a ClipSnapshot).
+        """
+        capture = self.clipboard_capture
+        if capture and capture.clipboard_element is self.clipboard_element:
+            return capture
+        return None
+
 
     def display_button(self):
         """
@@ -170,12 +408,101 @@ class PluginBase:
         """
         Downloads the content of a URL and returns the binary content and MIME type.
         """
+        stored = self._read_stored_download(url)
+        if stored and self._is_fresh_download(stored[2]):
+            return stored[:2]
         try:
             import requests
-            response = requests.get(url)
+            response = requests.get(url, headers=self._download_validators(stored))
+            if stored and response.status_code == 304:
+                self._store_download(url, stored[0], stored[1], response)
+                return stored[:2]
             response.raise_for_status()
             mime_type = response.headers.get('Content-Type', 'application/octet-stream')
+            self._store_download(url, response.content, mime_type, response)
             return response.content, mime_type
         except requests.RequestException as e:
             print(f"Error downloading file from URL: {e}")
-            return None, None
\ No newline at end of file
+            return stored[:2] if stored else (None, None)
+
+    def stream_file_from_url(self, url, timeout=10, cancel_event=None, chunk_size=64 * 1024):
+        """
+        Streaming version of `download_file_from_url`: the body is read chunk by chunk so the
+        download can be abandoned (`cancel_event` set) at any time.
+        :return: (binary content, MIME type), or (None, None) on error or cancel.
+        """
+        stored = self._read_stored_download(url)
+        if stored and self._is_fresh_download(stored[2]):
+            return stored[:2]
+        try:
+            import requests
+            with requests.get(url, stream=True, timeout=timeout, headers=self._download_validators(stored)) as response:
+                if stored and response.status_code == 304:
+                    self._store_download(url, stored[0], stored[1], response)
+                    return stored[:2]
+                response.raise_for_status()
+                mime_type = response.headers.get('Content-Type', 'application/octet-stream')
+                content = bytearray()
+                for chunk in response.iter_content(chunk_size):
+                    if cancel_event and cancel_event.is_set():
+                        return None, None
+                    content.extend(chunk)
+            mime_type = mime_type.split(";")[0].strip()
+            self._store_download(url, bytes(content), mime_type, response)
+            return bytes(content), mime_type
+        except requests.RequestException as e:
+            print(f"Error downloading file from URL: {e}")
+            return stored[:2] if stored else (None, None)
+
+    def _read_stored_download(self, url):
+        """
+        (content, MIME type, ref) of `url` already downloaded by a seat of the team, or None.
+        The same URL may serve new content later: see _is_fresh_download.
+        """
+        if not self.shared_store:
+            return None
+        data, ref = self.shared_store.read(f"url:{url}")
+        if data is None:
+            return None
+        return data, ref.get("mime_type", "application/octet-stream"), ref
+
+    def _is_fresh_download(self, ref):
+        """
+        A stored download is used without asking the server for `shared_store_url_ttl`
+        seconds, then it is revalidated with its ETag / Last-Modified (see _download_validators).
+        """
+        import time
+        return time.time() - ref.get("stored_at", 0) < self.configRoot.read_option("shared_store_url_ttl")
+
+    @staticmethod
+    def _download_validators(stored):
+        """
+        Conditional request headers of a stored download: the server answers 304 when unchanged.
+        """
+        if not stored:
+            return {}
+        ref = stored[2]
+        headers = {}
+        if ref.get("etag"):
+            headers["If-None-Match"] = ref["etag"]
+        if ref.get("last_modified"):
+            headers["If-Modified-Since"] = ref["last_modified"]
+        return headers
+
+    def _store_download(self, url, content, mime_type, response=None):
+        if not self.shared_store:
+            return
+        import time
+        import mimetypes
+        extension = (mimetypes.guess_extension(mime_type.split(";")[0].strip()) or ".bin")[1:]
+        headers = response.headers if response is not None else {}
+        try:
+            self.shared_store.put_bytes(
+                f"url:{url}", content, extension,
+                mime_type=mime_type,
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+                stored_at=time.time()
+            )
+        except OSError as e:
+            print(f"Shared store not updated: {e}")
\ No newline at end of file
@@ -1,36 +1,390 @@
 from rembg import remove
+from rembg.sessions import sessions_class
+import onnxruntime as ort
 import sys
 import os
 import json
+import time
 
-def process_image(input_path, output_path):
+# config "model" -> rembg session name
+MODELS = {
+    "u2net": "u2net",
+    "u2netp": "u2netp",
+    "isnet": "isnet-general-use",
+    "silueta": "silueta",
+}
+
+GRAPH_OPTIMIZATIONS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+DEFAULT_OPTIONS = {
+    "model": "u2net",
+    "quantized": False,
+    "intra_op_threads": 0,
+    "inter_op_threads": 0,
+    "graph_optimization": "all",
+    "execution_mode": "sequential",
+    "mask_resolution": 0,
+    "mask_radius": 8,
+    "mask_eps": 1e-4,
+    "autocrop": False,
+    "autocrop_threshold": 8,
+    "autocrop_margin": 2,
+}
+
+# PNG text chunk of the autocrop geometry, read back by ClipRocks (Media.read_autocrop)
+AUTOCROP_KEY = "ClipRocks:autocrop"
+
+def build_session_options(options):
+    """
+    Builds the onnxruntime SessionOptions from the plugin options (0 threads = onnxruntime default).
+    """
+    sess_opts = ort.SessionOptions()
+    sess_opts.intra_op_num_threads = int(options["intra_op_threads"])
+    sess_opts.inter_op_num_threads = int(options["inter_op_threads"])
+    sess_opts.graph_optimization_level = GRAPH_OPTIMIZATIONS[options["graph_optimization"]]
+    sess_opts.execution_mode = EXECUTION_MODES[options["execution_mode"]]
+    return sess_opts
+
+def quantize_model(model_path):
+    """
+    Returns the int8 (dynamic, weights only) version of `model_path`, created next to it on first use.
     """
-    Processes an image to remove its background.
+    quantized_path = f"{os.path.splitext(model_path)[0]}.int8.onnx"
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QUInt8)
+    return quantized_path
+
+def new_session(options):
+    """
+    Creates the rembg session described by `options` on the CPU provider.
+
+    The quantized variant reuses the rembg session class of the model (same pre/post-processing)
+    and only swaps the model file it downloads.
+    """
+    model_name = MODELS[options["model"]]
+    session_class = next(cls for cls in sessions_class if cls.name() == model_name)
+
+    if options["quantized"]:
+        class QuantizedSession(session_class):
+            @classmethod
+            def download_models(cls, *args, **kwargs):
+                return quantize_model(str(session_class.download_models(*args, **kwargs)))
+        session_class = QuantizedSession
+
+    return session_class(model_name, build_session_options(options), providers=["CPUExecutionProvider"])
+
+def process_image(input_path, output_path, options=None, session=None):
+    """
+    Processes an image to remove its background (with `session`, loaded ahead, if given).
+    Returns True on success, the JSON status line on stdout says the same to the plugin.
     """
     try:
+        import io
+        from PIL import Image
+
         # Read input image
         with open(input_path, 'rb') as i:
             input_data = i.read()
 
         # Process image with rembg
-        output_data = remove(input_data)
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        session = session or new_session(options)
+        if options["mask_resolution"]:
+            cutout = remove_lowres(input_data, session, options)
+        else:
+            cutout = remove(Image.open(io.BytesIO(input_data)), session=session)
+        output_data, crop = encode_cutout(cutout, options)
 
         # Write processed image to output path
         with open(output_path, 'wb') as o:
             o.write(output_data)
 
         # Return success response
-        print(json.dumps({"status": "success", "output": output_path}))
+        print(json.dumps({"status": "success", "output": output_path, "crop": crop}))
+        return True
     except Exception as e:
         # Return error response
         print(json.dumps({"status": "error", "message": str(e)}))
+        return False
+
+def box_filter(array, radius):
+    """
+    Mean over a (2r+1)x(2r+1) window with integral images, normalized at the borders.
+    """
+    import numpy as np
+    padded = np.pad(array, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    h, w = array.shape
+    y0 = np.clip(np.arange(h) - radius, 0, h)
+    y1 = np.clip(np.arange(h) + radius + 1, 0, h)
+    x0 = np.clip(np.arange(w) - radius, 0, w)
+    x1 = np.clip(np.arange(w) + radius + 1, 0, w)
+    total = (padded[y1][:, x1] - padded[y0][:, x1] - padded[y1][:, x0] + padded[y0][:, x0])
+    count = (y1 - y0)[:, None] * (x1 - x0)[None, :]
+    return total / count
+
+def guided_coefficients(guide, mask, radius, eps):
+    """
+    Guided filter (He et al.) linear coefficients computed at low resolution: the upsampled
+    alpha is `a * guide + b`, which follows the edges of the full resolution guide.
+    """
+    mean_i = box_filter(guide, radius)
+    mean_p = box_filter(mask, radius)
+    var_i = box_filter(guide * guide, radius) - mean_i * mean_i
+    cov_ip = box_filter(guide * mask, radius) - mean_i * mean_p
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return box_filter(a, radius), box_filter(b, radius)
+
+def upsample_alpha(a, b, guide, band=512):
+    """
+    Bilinear upsampling of the coefficients and `a * guide + b`, band by band so that only a few
+    rows of full resolution floats exist at once. Returns the uint8 alpha at the guide size.
+    """
+    import numpy as np
+    h, w = a.shape
+    height, width = guide.shape
+
+    def axis(size, src_size):
+        src = np.clip((np.arange(size) + 0.5) * src_size / size - 0.5, 0, src_size - 1)
+        low = np.floor(src).astype(np.intp)
+        high = np.minimum(low + 1, src_size - 1)
+        return low, high, (src - low).astype(np.float32)
+
+    x0, x1, wx = axis(width, w)
+    y0, y1, wy = axis(height, h)
+    alpha = np.empty((height, width), dtype=np.uint8)
+
+    for top in range(0, height, band):
+        rows = slice(top, min(top + band, height))
+        ry = wy[rows, None]
+        band_a = a[y0[rows]] * (1 - ry) + a[y1[rows]] * ry
+        band_b = b[y0[rows]] * (1 - ry) + b[y1[rows]] * ry
+        band_a = band_a[:, x0] * (1 - wx) + band_a[:, x1] * wx
+        band_b = band_b[:, x0] * (1 - wx) + band_b[:, x1] * wx
+        band_i = guide[rows].astype(np.float32) * (1 / 255)
+        alpha[rows] = np.clip((band_a * band_i + band_b) * 255 + 0.5, 0, 255).astype(np.uint8)
+
+    return alpha
+
+def remove_lowres(input_data, session, options):
+    """
+    Background removal with the network and its pre/post-processing at `mask_resolution`
+    (longest side) only. The mask is upsampled with a guided filter driven by the full
+    resolution luminance and applied once as the alpha channel of the original pixels.
+    Returns the RGBA image.
+    """
+    import io
+    import numpy as np
+    from PIL import Image
+
+    def decode():
+        image = Image.open(io.BytesIO(input_data))
+        image.load()
+        return image.convert("RGB")
+
+    # the header gives the size, nothing is decoded yet
+    size = int(options["mask_resolution"])
+    source = Image.open(io.BytesIO(input_data))
+    scale = min(1.0, size / max(source.size))
+    small_size = (max(1, round(source.width * scale)), max(1, round(source.height * scale)))
+
+    if source.format == "JPEG" and scale <= 0.5:
+        # JPEG: the reduced copy is decoded at 1/2..1/8 scale in the DCT domain (draft), the
+        # full resolution decode, needed for the output pixels anyway, runs in a thread
+        # meanwhile, during the inference
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            full = pool.submit(decode)
+            source.draft("RGB", small_size)
+            small = source.convert("RGB").resize(small_size, Image.Resampling.BILINEAR)
+            mask = remove(small, session=session, only_mask=True)
+            image = full.result()
+    else:
+        # reduced copy: integer box reduce first, then the exact size
+        image = decode()
+        factor = min(image.width // small_size[0], image.height // small_size[1])
+        small = image.reduce(factor) if factor >= 2 else image
+        small = small.resize(small_size, Image.Resampling.BILINEAR)
+        mask = remove(small, session=session, only_mask=True)
+
+    guide_small = np.asarray(small.convert("L"), dtype=np.float32) * (1 / 255)
+    mask_small = np.asarray(mask, dtype=np.float32) * (1 / 255)
+    a, b = guided_coefficients(guide_small, mask_small, int(options["mask_radius"]), float(options["mask_eps"]))
+    alpha = upsample_alpha(a.astype(np.float32), b.astype(np.float32), np.asarray(image.convert("L")))
+
+    image.putalpha(Image.fromarray(alpha, "L"))
+    return image
+
+"""──────────────────────────────────────────────────────────────────────────────────
+Autocrop : only the alpha bounds of the cutout are saved
+─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+def alpha_bounds(alpha, threshold=0):
+    """
+    Box (left, top, right, bottom) of the pixels whose alpha is above `threshold`, or None when
+    there is none. Rows are reduced over the whole mask, columns over the rows in the box only.
+    """
+    import numpy as np
+    mask = alpha > threshold
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not rows.size:
+        return None
+    columns = np.flatnonzero(mask[rows[0]:rows[-1] + 1].any(axis=0))
+    return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+def encode_cutout(image, options):
+    """
+    Returns (PNG bytes, crop) of the RGBA `image`. With `autocrop`, only its alpha bounds
+    (plus `autocrop_margin` pixels) are kept and crop = {"box": [left, top, right, bottom],
+    "size": [width, height]} of the full canvas, also written in the AUTOCROP_KEY text chunk
+    so that the placement follows the file. crop is None when nothing was cut.
+    """
+    import io
+    import numpy as np
+    from PIL import PngImagePlugin
+
+    crop = None
+    if options["autocrop"] and image.mode == "RGBA":
+        box = alpha_bounds(np.asarray(image.getchannel("A")), int(options["autocrop_threshold"]))
+        if box:
+            margin = int(options["autocrop_margin"])
+            left, top, right, bottom = box
+            box = (
+                max(0, left - margin), max(0, top - margin),
+                min(image.width, right + margin), min(image.height, bottom + margin)
+            )
+        if box and box != (0, 0, image.width, image.height):
+            crop = {"box": list(box), "size": [image.width, image.height]}
+
+    info = None
+    if crop:
+        image = image.crop(tuple(crop["box"]))
+        info = PngImagePlugin.PngInfo()
+        info.add_text(AUTOCROP_KEY, json.dumps(crop))
+
+    output = io.BytesIO()
+    image.save(output, format="PNG", pnginfo=info)
+    return output.getvalue(), crop
+
+def serve(options=None):
+    """
+    Warm worker, started while the menu is open: the session is loaded first, then the paths
+    to process are read on stdin ("<input_path>\t<output_path>"). An empty stdin (ClipRocks
+    closed, another button chosen) ends the worker without output.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    session = new_session(options)
+    line = sys.stdin.readline().rstrip("\n")
+    if not line:
+        return True
+    input_path, output_path = line.split("\t")
+    return process_image(input_path, output_path, options, session=session)
+
+def benchmark(image, options, runs=3):
+    """
+    Returns (seconds, mask) for `options`: session load + median inference time, since every
+    paste starts a new process and pays both.
+    """
+    start = time.perf_counter()
+    session = new_session(options)
+    load_time = time.perf_counter() - start
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        mask = remove(image, session=session, only_mask=True)
+        timings.append(time.perf_counter() - start)
+    return load_time + sorted(timings)[len(timings) // 2], mask
+
+def mask_iou(mask, reference):
+    """
+    Intersection over union of two masks (alpha > 127).
+    """
+    import numpy as np
+    a = np.asarray(mask) > 127
+    b = np.asarray(reference) > 127
+    union = np.logical_or(a, b).sum()
+    return 1.0 if union == 0 else float(np.logical_and(a, b).sum() / union)
+
+def calibrate(sample_path, options=None, models=None, min_iou=0.9):
+    """
+    Benchmarks session settings on the local CPU and prints the fastest configuration whose mask
+    stays within `min_iou` of the configured model in full precision.
+
+    1. thread counts are tuned on the reference model,
+    2. each model of `models`, float and int8, is then timed with the best thread counts.
+    """
+    from PIL import Image
+    try:
+        image = Image.open(sample_path).convert("RGB")
+        reference_options = {**DEFAULT_OPTIONS, **(options or {}), "quantized": False}
+        cores = os.cpu_count() or 1
+        results = []
+
+        reference_mask = None
+        best = None
+        for threads in sorted({cores, max(1, cores // 2), max(1, cores // 4)}, reverse=True):
+            candidate = {**reference_options, "intra_op_threads": threads, "inter_op_threads": 1}
+            seconds, mask = benchmark(image, candidate)
+            if reference_mask is None:
+                reference_mask = mask
+            results.append({"config": candidate, "seconds": seconds})
+            if best is None or seconds < best[0]:
+                best = (seconds, candidate)
+
+        thread_options = {k: best[1][k] for k in ("intra_op_threads", "inter_op_threads")}
+        for model in (models or MODELS):
+            for quantized in (False, True):
+                candidate = {**reference_options, **thread_options, "model": model, "quantized": quantized}
+                if candidate == best[1]:
+                    continue
+                try:
+                    seconds, mask = benchmark(image, candidate)
+                except Exception as e:
+                    results.append({"config": candidate, "error": str(e)})
+                    continue
+                iou = mask_iou(mask, reference_mask)
+                results.append({"config": candidate, "seconds": seconds, "iou": iou})
+                if iou >= min_iou and seconds < best[0]:
+                    best = (seconds, candidate)
+
+        print(json.dumps({"status": "success", "config": best[1], "seconds": best[0], "results": results}))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print(json.dumps({"status": "error", "message": "Usage: rembg_processor.py <input_path> <output_path>"}))
+    # cliprembg.py --calibrate <sample_path> [options_json]
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "--calibrate":
+        calibration = json.loads(sys.argv[3]) if len(sys.argv) == 4 else {}
+        calibrate(
+            sys.argv[2],
+            options=calibration.get("options"),
+            models=calibration.get("models"),
+            min_iou=calibration.get("min_iou", 0.9)
+        )
+        sys.exit(0)
+
+    # cliprembg.py --serve [options_json], paths on stdin
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "--serve":
+        sys.exit(0 if serve(json.loads(sys.argv[2]) if len(sys.argv) == 3 else None) else 1)
+
+    if len(sys.argv) not in (3, 4):
+        print(json.dumps({"status": "error", "message": "Usage: rembg_processor.py <input_path> <output_path> [options_json]"}))
         sys.exit(1)
 
     input_path = sys.argv[1]
     output_path = sys.argv[2]
+    options = json.loads(sys.argv[3]) if len(sys.argv) == 4 else None
 
-    process_image(input_path, output_path)
+    sys.exit(0 if process_image(input_path, output_path, options) else 1)
@@ -25,6 +25,8 @@
 from ..pluginBase import PluginBase
 from ..media import Media
 import os
+import glob
+import json
 import shutil
 import subprocess
 import tkinter as tk
@@ -70,17 +72,137 @@ class RemBg(PluginBase):
             "project_venv" : os.path.join(pluginsPath, 'venv'),
             "U2NET_HOME" : os.path.join(pluginsPath, 'u2net'),
             "script_name" : 'cliprembg.py',
-            "install": 'rembg[cli] onnxruntime==1.20.1'
+            "install": 'rembg[cli] onnxruntime==1.20.1 onnx',
+
+            # onnxruntime session (see cliprembg.py) : u2net, u2netp, isnet, silueta
+            "model": "u2net",
+            # int8 quantized copy of the model, created on first use (needs onnx)
+            "quantized": False,
+            # 0 = onnxruntime default
+            "intra_op_threads": 0,
+            "inter_op_threads": 0,
+            # disable, basic, extended, all
+            "graph_optimization": "all",
+            # sequential, parallel
+            "execution_mode": "sequential",
+
+            # > 0 : run rembg on a copy of this size (longest side) and upsample the mask with a
+            # guided filter on the full resolution image (0 = full resolution through rembg)
+            "mask_resolution": 0,
+            "mask_radius": 8,
+            "mask_eps": 1e-4,
+
+            # save only the alpha bounds of the cutout (plus margin pixels), ClipRocks moves the
+            # timeline item back in place (alpha <= threshold counts as transparent)
+            "autocrop": False,
+            "autocrop_threshold": 8,
+            "autocrop_margin": 2,
+
+            # calibration command: set to true to benchmark the options above on the next paste
+            # (every model of calibration_models, float and int8, several minutes and model
+            # downloads) and keep the fastest acceptable one, set back to false once done
+            "calibrate": False,
+            "calibration_models": ["u2net", "u2netp", "isnet", "silueta"],
+            # minimal mask agreement (IoU) with the configured model in full precision
+            "calibration_min_iou": 0.9,
+
+            # append the original image at once, swapped for the cutout when done
+            "optimistic_paste": False,
+
+            # job queue (see JobQueue): memory of one run, higher priority runs first
+            "queue_memory_mb": 1500,
+            "queue_priority": 10,
+        }
+
+    def get_rembg_options(self):
+        """
+        Returns the onnxruntime session and mask options passed to cliprembg.py.
+        """
+        keys = [
+            "model", "quantized", "intra_op_threads", "inter_op_threads", "graph_optimization", "execution_mode",
+            "mask_resolution", "mask_radius", "mask_eps", "autocrop", "autocrop_threshold", "autocrop_margin"
+        ]
+        return {key: self.configPlugin.read_option(key) for key in keys}
+
+    def prepare_script(self):
+        """
+        Copies cliprembg.py in the rembg project folder when missing or older than ours,
+        and returns its destination path.
+        """
+        project_base = self.configPlugin.read_option('project_base')
+        script_base = self.configPlugin.read_option('base') 
+        script_name = self.configPlugin.read_option('script_name')
+        script_source = os.path.join(script_base, script_name)
+        script_dest = os.path.join(project_base, script_name)
+
+        if not os.path.exists(script_dest) or os.path.getmtime(script_source) > os.path.getmtime(script_dest):
+            try:
+                shutil.copyfile(script_source, script_dest)
+            except Exception as e:
+                print(f"Error copying '{script_name}': {e}")
+        return script_dest
+
+    def get_subprocess_env(self):
+        """
+        Returns (python_executable, env) of the rembg project virtual environment.
+        """
+        project_venv = self.use_virtual_env(self.configPlugin.read_option('project_venv'))
+        env = project_venv.prepare_for_subprocess()
+        env["U2NET_HOME"] = self.configPlugin.read_option('U2NET_HOME')
+        return project_venv.python_executable, env
+
+    def calibrate(self, sample_path):
+        """
+        Benchmarks model, int8 variant and thread counts on the local CPU with `sample_path`
+        (cliprembg.py --calibrate) and writes the fastest acceptable options in config.conf.
+        Only run when the `calibrate` option is set, the default options are used otherwise.
+        """
+        script_dest = self.prepare_script()
+        python_executable, env = self.get_subprocess_env()
+        calibration = {
+            "options": self.get_rembg_options(),
+            "models": self.configPlugin.read_option('calibration_models'),
+            "min_iou": self.configPlugin.read_option('calibration_min_iou'),
         }
 
-    def is_install(self):
-        venv_path = self.configPlugin.read_option('project_venv')
-        rembg_lib = os.path.join(venv_path, "Lib", "site-packages", "rembg")
-        rembg_exe = os.path.join(venv_path, "Scripts", "rembg.exe")
+        process = self.run_subprocess(
+            [python_executable, script_dest, "--calibrate", sample_path, json.dumps(calibration)],
+            env=env
+        )
+
+        lines = process.stdout.strip().splitlines()
+        result = json.loads(lines[-1]) if lines else {"status": "error", "message": process.stderr}
+        if result["status"] != "success":
+            # keep the current options, `calibrate` stays true: the next paste retries
+            print(f"Calibration failed: {result['message']}")
+            return None
+
+        self.configPlugin.write_options({**result["config"], "calibrate": False})
+        return result["config"]
+
+    def _install_paths(self):
+        """
+        Returns (project venv helper, rembg package folder, rembg executable).
+        """
+        project_venv = self.use_virtual_env(self.configPlugin.read_option('project_venv'))
+        rembg_lib = os.path.join(project_venv.site_packages, "rembg")
+        rembg_exe = os.path.join(project_venv.bin_dir, "rembg.exe" if os.name == "nt" else "rembg")
+        return project_venv, rembg_lib, rembg_exe
+
+    def install_artifacts(self):
+        _, rembg_lib, rembg_exe = self._install_paths()
+        return [rembg_lib, rembg_exe, self.configPlugin.read_option('U2NET_HOME')]
+
+    def probe_install(self):
+        project_venv, rembg_lib, rembg_exe = self._install_paths()
 
         if not os.path.exists(rembg_lib) or not os.path.exists(rembg_exe):
-            return False
-        return True
+            return False, None
+
+        # version from the package metadata folder (rembg-2.0.59.dist-info)
+        distributions = glob.glob(os.path.join(project_venv.site_packages, "rembg-*.dist-info"))
+        version = os.path.basename(distributions[0])[len("rembg-"):-len(".dist-info")] if distributions else None
+        return True, version
         
 
     def check_condition(self, format_ids):
@@ -89,51 +211,141 @@ class RemBg(PluginBase):
         """
         return {2}.intersection(format_ids)
 
+    def warm_up_files(self):
+        """
+        The model file the session will load only: U2NET_HOME holds every model downloaded so far
+        (file names of rembg, int8 variant created by cliprembg.py quantize_model).
+        """
+        model = self.configPlugin.read_option('model')
+        file_name = {"isnet": "isnet-general-use"}.get(model, model)
+        extension = ".int8.onnx" if self.configPlugin.read_option('quantized') else ".onnx"
+        return [os.path.join(self.configPlugin.read_option('U2NET_HOME'), f"{file_name}{extension}")]
+
+    def warm_up(self):
+        """
+        Install check and model read ahead (see PluginBase.warm_up), then a cliprembg.py worker
+        is started with --serve: its session is loaded while the user moves to the button, and
+        `execute` only hands it the paths (see take_warm_worker).
+        """
+        super().warm_up()
+        # a requested calibration changes the options, the worker would load the wrong session
+        if self.configPlugin.read_option('calibrate'):
+            return
+
+        script_dest = self.prepare_script()
+        python_executable, env = self.get_subprocess_env()
+        with self.warm_up_lock:
+            if self.warm_up_cancel.is_set():
+                return
+            self._warm_worker = subprocess.Popen(
+                [python_executable, script_dest, "--serve", json.dumps(self.get_rembg_options())],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env
+            )
+
+    def take_warm_worker(self):
+        """
+        Returns the worker started by `warm_up` if it is still alive (ends the warm up), or None.
+        """
+        with self.warm_up_lock:
+            self.warm_up_cancel.set()
+            worker, self._warm_worker = getattr(self, "_warm_worker", None), None
+        if worker and worker.poll() is None:
+            return worker
+        return None
+
+    def cancel_warm_up(self):
+        worker = self.take_warm_worker()
+        if worker:
+            worker.kill()
+
+    def remote_capable(self, clipboard_element):
+        """
+        Clipboard images can go to an inference node.
+        """
+        return 2 in clipboard_element.get_format_ids()
+
+    def store_key(self, clipboard_element):
+        """
+        Same clipboard image, same session and mask options: same cutout.
+        """
+        content_hash = clipboard_element.get_content_hash()
+        if 2 not in clipboard_element.get_format_ids() or not content_hash:
+            return None
+        return json.dumps({"input": content_hash, "options": self.result_options()}, sort_keys=True)
+
+    def result_options(self):
+        return self.get_rembg_options()
+
+    def job_requirements(self, clipboard_element):
+        """
+        One onnxruntime session using `intra_op_threads` cores (all of them by default).
+        """
+        return {
+            "cores": int(self.configPlugin.read_option("intra_op_threads")) or os.cpu_count() or 1,
+            "memory_mb": self.configPlugin.read_option("queue_memory_mb"),
+            "priority": self.configPlugin.read_option("queue_priority"),
+        }
+
+    def preview(self, clipboard_element):
+        """
+        The clipboard image itself, same size as the cutout.
+        """
+        if not self.configPlugin.read_option("optimistic_paste"):
+            return None
+        return self.extract_image_from_clipboard()
+
     def execute(self, clipboard_element):
         if 2 in clipboard_element.get_format_ids():
             
-            # Step 1: is script in official rembgProject ? No ? Copy that file
-            project_base = self.configPlugin.read_option('project_base')
-            script_base = self.configPlugin.read_option('base') 
-            script_name = self.configPlugin.read_option('script_name')
-            script_source = os.path.join(script_base, script_name)
-            script_dest = os.path.join(project_base, script_name)
-
-            if not os.path.exists(script_dest):
-                try:
-                    shutil.copyfile(script_source, script_dest)
-                except Exception as e:
-                    print(f"Error copying '{script_name}': {e}")
+            # Step 1: is script in official rembgProject (and up to date) ? No ? Copy that file
+            script_dest = self.prepare_script()
 
             # Step 2: Get file from lipboard and save in cache to process with rembg
-            media = self.extract_image_from_clipboard()
-            media.save(self.cache_save_path)
+            self.set_stage("Reading clipboard")
+            media = self.get_cache_input()
 
             # Step 3: Prepare input & output to process
             input_path = media.get_path()
-            file_root, file_extension = os.path.splitext(input_path)
-            output_path = f"{file_root}-rm{file_extension}"
+            # rembg always writes PNG (alpha), whatever the clipboard format was
+            file_root = os.path.splitext(input_path)[0]
+            output_path = f"{file_root}-rm.png"
+
+            # On request only (`calibrate`): tune the onnxruntime options on this machine with this image
+            if self.configPlugin.read_option('calibrate'):
+                self.set_stage("Calibrating")
+                self.calibrate(input_path)
                     
             # Step 4: Prepare the subprocess virtual environment
-            venv_path = self.configPlugin.read_option('project_venv')   
-            python_executable = os.path.join(venv_path, "Scripts", "python.exe")
-            env = os.environ.copy()
-            env["VIRTUAL_ENV"] = venv_path
-            env["PATH"] = os.path.join(venv_path, "Scripts") + ";" + env["PATH"]
-            env["U2NET_HOME"] = self.configPlugin.read_option('U2NET_HOME')
-
-            # Step 5: Call remote cliprembg.py using subprocess with venv project
-            process = subprocess.run(
-                [python_executable, script_dest, input_path, output_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env
-            )
+            python_executable, env = self.get_subprocess_env()
+
+            # Step 5: Call remote cliprembg.py using subprocess with venv project, or hand the
+            # paths to the worker started by warm_up (session already loaded)
+            self.set_stage("Removing background")
+            worker = self.take_warm_worker()
+            if worker:
+                worker.stdin.write(f"{input_path}\t{output_path}\n")
+                worker.stdin.close()
+                process = self.wait_subprocess(worker, outputs=[output_path])
+            else:
+                process = self.run_subprocess(
+                    [python_executable, script_dest, input_path, output_path, json.dumps(self.get_rembg_options())],
+                    outputs=[output_path],
+                    env=env
+                )
 
-            if process.stderr:
-                print(f"Error: {process.stderr}")
-                exit()
+            # the last stdout line is the JSON status of cliprembg.py, stderr only carries warnings
+            lines = process.stdout.strip().splitlines()
+            try:
+                result = json.loads(lines[-1]) if lines else {"status": "error", "message": process.stderr}
+            except ValueError:
+                result = {"status": "error", "message": lines[-1]}
+            if process.returncode != 0 or result["status"] != "success" or not os.path.exists(output_path):
+                print(f"Error: {result.get('message') or process.stderr}")
+                raise RuntimeError("Background removal failed.")
 
             media.update_mimeType_path("image/png", output_path)
 
@@ -0,0 +1,230 @@
+import onnxruntime as ort
+import numpy as np
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import sys
+import os
+import json
+import math
+from collections import deque
+
+# inputs processed in directory mode (same as upscayl-bin)
+EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# estimated inference memory per input pixel of a tile (Real-ESRGAN class models on CPU)
+BYTES_PER_PIXEL = 8 * 1024
+
+DEFAULT_OPTIONS = {
+    "model": None,
+    # final scale, the model output is resized when its native scale differs (0 = native)
+    "scale": 0,
+    # input tile side, 0 = derived from the available RAM
+    "tile": 0,
+    "overlap": 16,
+    # worker processes, 0 = half the cores
+    "workers": 0,
+}
+
+"""──────────────────────────────────────────────────────────────────────────────────
+Worker processes : one onnxruntime session each, loaded once
+─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+_session = None
+
+def init_worker(model_path, threads):
+    global _session
+    sess_opts = ort.SessionOptions()
+    sess_opts.intra_op_num_threads = threads
+    sess_opts.inter_op_num_threads = 1
+    _session = ort.InferenceSession(model_path, sess_opts, providers=["CPUExecutionProvider"])
+
+def run_tile(tile):
+    """
+    Upscales a HxWx3 uint8 tile, returns the HsxWsx3 float32 result in [0, 1].
+    """
+    batch = np.ascontiguousarray(tile.transpose(2, 0, 1)[None], dtype=np.float32) * (1 / 255)
+    output = _session.run(None, {_session.get_inputs()[0].name: batch})[0][0]
+    return np.clip(output.transpose(1, 2, 0), 0, 1)
+
+"""──────────────────────────────────────────────────────────────────────────────────
+Tiling
+─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+def available_memory():
+    """
+    Available physical memory in bytes (GlobalMemoryStatusEx on Windows, sysconf elsewhere).
+    """
+    if os.name == "nt":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullAvailPhys
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+def tile_size(workers, memory=None):
+    """
+    Largest tile side (multiple of 32, 64..1024) whose inference fits in half of the available
+    memory shared by `workers` processes.
+    """
+    budget = (memory or available_memory()) * 0.5 / workers
+    side = int(math.sqrt(budget / BYTES_PER_PIXEL)) // 32 * 32
+    return max(64, min(1024, side))
+
+def positions(size, tile, overlap):
+    """
+    Tile origins along an axis: stride tile - overlap, the last tile ends on the border.
+    """
+    if size <= tile:
+        return [0]
+    stride = tile - overlap
+    result = list(range(0, size - tile, stride))
+    return result + [size - tile]
+
+def ramp(length, overlap, start_shared, end_shared):
+    """
+    1D blending weight of a tile: linear ramps on the sides shared with a neighbour tile.
+    """
+    weight = np.ones(length, dtype=np.float32)
+    if overlap:
+        edge = (np.arange(overlap, dtype=np.float32) + 0.5) / overlap
+        if start_shared:
+            weight[:overlap] = np.minimum(weight[:overlap], edge)
+        if end_shared:
+            weight[-overlap:] = np.minimum(weight[-overlap:], edge[::-1])
+    return weight
+
+def windowed_map(executor, function, items, window):
+    """
+    Ordered executor.map with at most `window` tasks in flight: an input is submitted when a
+    result is taken, so the queued tile inputs and the outputs waiting for a slow tile stay
+    bounded whatever the image size.
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, item))
+    while pending:
+        yield pending.popleft().result()
+
+def upscale_array(executor, rgb, tile, overlap, progress=None, window=4):
+    """
+    Upscales a HxWx3 uint8 array through overlapping tiles processed by `executor` (`window`
+    tiles in flight, see windowed_map). Tiles are blended with linear weights on their shared
+    borders (no seams), row of tiles by row of tiles so that only one band of float
+    accumulators exists at once.
+    """
+    height, width = rgb.shape[:2]
+    ys = positions(height, tile, overlap)
+    xs = positions(width, tile, overlap)
+    boxes = [(y, x, min(tile, height - y), min(tile, width - x)) for y in ys for x in xs]
+    results = windowed_map(executor, run_tile, (rgb[y:y + h, x:x + w] for y, x, h, w in boxes), window)
+
+    output = None
+    scale = None
+    done = 0
+    for row, y in enumerate(ys):
+        for x in xs:
+            tile_out = next(results)
+            h, w = boxes[done][2], boxes[done][3]
+            if output is None:
+                scale = tile_out.shape[0] // h
+                output = np.empty((height * scale, width * scale, 3), dtype=np.uint8)
+                band_top = 0
+                band = np.zeros((0, width * scale, 3), dtype=np.float32)
+                band_weight = np.zeros((0, width * scale), dtype=np.float32)
+
+            top, bottom = y * scale, (y + h) * scale
+            if bottom - band_top > band.shape[0]:
+                extra = bottom - band_top - band.shape[0]
+                band = np.concatenate([band, np.zeros((extra, width * scale, 3), dtype=np.float32)])
+                band_weight = np.concatenate([band_weight, np.zeros((extra, width * scale), dtype=np.float32)])
+
+            shared = overlap * scale
+            weight = ramp(h * scale, shared, y > 0, y + h < height)[:, None] * ramp(w * scale, shared, x > 0, x + w < width)[None, :]
+            band[top - band_top:bottom - band_top, x * scale:(x + w) * scale] += tile_out * weight[..., None]
+            band_weight[top - band_top:bottom - band_top, x * scale:(x + w) * scale] += weight
+
+            done += 1
+            if progress:
+                progress(done, len(boxes))
+
+        # rows above the next row of tiles are final
+        final = ys[row + 1] * scale if row + 1 < len(ys) else band_top + band.shape[0]
+        count = final - band_top
+        output[band_top:final] = np.clip(band[:count] / band_weight[:count, :, None] * 255 + 0.5, 0, 255).astype(np.uint8)
+        band, band_weight, band_top = band[count:], band_weight[count:], final
+
+    return output
+
+def upscale_file(executor, input_path, output_path, options, progress=None):
+    """
+    Upscales one image file, alpha (if any) is resized separately with LANCZOS.
+    """
+    image = Image.open(input_path)
+    image.load()
+    alpha = image.getchannel("A") if image.mode in ("RGBA", "LA") else None
+    rgb = np.asarray(image.convert("RGB"))
+
+    # two tiles per worker: one running, one queued so the worker never waits for the stitching
+    window = 2 * options["workers"]
+    result = Image.fromarray(upscale_array(executor, rgb, options["tile"], options["overlap"], progress, window))
+
+    scale = int(options["scale"] or 0)
+    if scale and result.size != (image.width * scale, image.height * scale):
+        result = result.resize((image.width * scale, image.height * scale), Image.Resampling.LANCZOS)
+    if alpha is not None:
+        result.putalpha(alpha.resize(result.size, Image.Resampling.LANCZOS))
+    result.save(output_path)
+
+def main(input_path, output_path, options):
+    """
+    File mode (input and output files) or directory mode (every image of the input folder
+    written as <name>.png in the output folder), with a single pool for all the images.
+    """
+    options = {**DEFAULT_OPTIONS, **options}
+    cores = os.cpu_count() or 1
+    workers = options["workers"] = int(options["workers"]) or max(1, cores // 2)
+    options["tile"] = int(options["tile"]) or tile_size(workers)
+    threads = max(1, cores // workers)
+
+    def progress(done, total):
+        print(f"{done * 100 / total:.2f}%", flush=True)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(options["model"], threads)) as executor:
+        if not os.path.isdir(input_path):
+            upscale_file(executor, input_path, output_path, options, progress)
+            return
+
+        os.makedirs(output_path, exist_ok=True)
+        for name in sorted(os.listdir(input_path)):
+            stem, extension = os.path.splitext(name)
+            if extension.lower() not in EXTENSIONS:
+                continue
+            try:
+                upscale_file(executor, os.path.join(input_path, name), os.path.join(output_path, f"{stem}.png"), options)
+                print(f"{name} done", flush=True)
+            except Exception as e:
+                print(f"{name} failed: {e}", file=sys.stderr, flush=True)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print(json.dumps({"status": "error", "message": "Usage: clipupscale.py <input> <output> [options_json]"}))
+        sys.exit(1)
+
+    try:
+        main(sys.argv[1], sys.argv[2], json.loads(sys.argv[3]) if len(sys.argv) == 4 else {})
+        print(json.dumps({"status": "success", "output": sys.argv[2]}))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
+        sys.exit(1)
@@ -25,21 +25,66 @@
 from ..pluginBase import PluginBase
 from ..media import Media
 import os
-import subprocess
+import json
+import time
+import shutil
+import tempfile
+import threading
 import tkinter as tk
 from tkinter import messagebox
 import webbrowser
 
+# inputs accepted by upscayl-bin in directory mode
+BATCH_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
 class Upscale(PluginBase):
+    # last 12 bytes of every complete PNG: the empty IEND chunk and its CRC
+    PNG_END = b"\x00\x00\x00\x00IEND\xaeB`\x82"
 
-    def is_install(self):
-        binary = os.path.join(
+    def _binary_path(self):
+        return os.path.join(
             self.configPlugin.read_option('project_base'), 
             self.configPlugin.read_option('script_name'),
             )
-        if not os.path.isfile(binary):
-            return False
-        return True
+
+    def _cpu_venv(self):
+        return self.use_virtual_env(self.configPlugin.read_option('cpu_venv'))
+
+    def install_artifacts(self):
+        return [
+            self._binary_path(), self.configPlugin.read_option('project_model'),
+            self.configPlugin.read_option('cpu_model'), self._cpu_venv().python_executable
+        ]
+
+    def probe_install(self):
+        # upscayl-bin has no version flag, the binary size/mtime of the fingerprint stands for it
+        if not self._upscayl_installed() and not self._cpu_installed():
+            return False, None
+        return True, None
+
+    def _upscayl_installed(self):
+        return self.configPlugin.read_option('backend') != "cpu" and os.path.isfile(self._binary_path())
+
+    def _cpu_installed(self):
+        """
+        CPU backend: the ONNX model and the python of its virtual environment (see `cpu_install`).
+        """
+        return (
+            self.configPlugin.read_option('backend') != "upscayl"
+            and os.path.isfile(self.configPlugin.read_option('cpu_model'))
+            and os.path.isfile(self._cpu_venv().python_executable)
+        )
+
+    def get_backends(self):
+        """
+        Backends to try in order: upscayl-bin (Vulkan) first, the CPU one as its fallback.
+        """
+        backends = []
+        if self._upscayl_installed():
+            backends.append("upscayl")
+        if self._cpu_installed():
+            backends.append("cpu")
+        return backends
 
     def install(self):
          self.show_plugin_warning()
@@ -69,63 +114,413 @@ class Upscale(PluginBase):
 
     def initConfiguration(self):
         pluginsPath = os.path.join(self.configRoot.read_option('plugins'), self.pluginName)
+        script_base = os.path.join(self.configRoot.read_option('abs_dir_script'), 'plugins', f"{self.pluginName}Plugin")
         return {
+            "base" : script_base,
             "project_base" : pluginsPath,
             "project_model" : os.path.join(pluginsPath, 'models'),
             "model_name" : "RealESRGAN_General_x4_v3",
+            # upscayl-bin -s (2, 3 or 4)
+            "scale" : 4,
+            # append a Lanczos upscale at once, swapped for the upscayl result when done
+            "optimistic_paste" : False,
             "script_name" : 'upscayl-bin.exe',
-            "install": 'https://github.com/upscayl/upscayl-ncnn'
+            "install": 'https://github.com/upscayl/upscayl-ncnn',
+
+            # auto (upscayl-bin, CPU when it is missing or fails), upscayl or cpu
+            "backend" : "auto",
+            # CPU backend (see clipupscale.py): Real-ESRGAN class ONNX model run by onnxruntime
+            "cpu_model" : os.path.join(pluginsPath, 'models', 'RealESRGAN_General_x4_v3.onnx'),
+            "cpu_venv" : os.path.join(pluginsPath, 'venv'),
+            "cpu_script_name" : 'clipupscale.py',
+            "cpu_install": 'onnxruntime numpy pillow',
+            # input tile side in pixels, 0 = derived from the available RAM
+            "cpu_tile" : 0,
+            # pixels shared by neighbour tiles, blended to hide the seams
+            "cpu_tile_overlap" : 16,
+            # worker processes (one onnxruntime session each), 0 = half the cores
+            "cpu_workers" : 0,
+
+            # calibration command: set to true to benchmark upscayl-bin -t/-j on the next image of
+            # each size band without a profile (about six full upscayl runs inside that paste) and
+            # keep the fastest, the defaults are used otherwise
+            "calibrate_upscayl" : False,
+            # size bands: longest side of the input in pixels, larger inputs use the last band
+            "calibration_bands" : [512, 1024, 2048, 4096],
+            # -t candidates (0 = upscayl-bin auto) then -j (load:proc:save) with the best tile
+            "calibration_tiles" : [0, 128, 256, 512],
+            "calibration_threads" : ["1:2:2", "1:4:2", "2:4:4"],
+            # per machine profile written by the calibration: {band: {"tile": -t, "threads": -j}}
+            "performance_profile" : {},
+
+            # job queue (see JobQueue): memory of one run, higher priority runs first (batches
+            # of copied files go after single images)
+            "queue_memory_mb" : 2000,
+            "queue_priority" : 10,
+            "queue_batch_priority" : 0,
         }
 
     def check_condition(self, format_ids):
         """
-        Activates the plugin if CF_BITMAP (2) is present in the clipboard formats.
+        Activates the plugin if CF_BITMAP (2) is present in the clipboard formats, or copied
+        files (CF_HDROP, 15) with images among them (batch mode).
         """
-        return {2}.intersection(format_ids)
+        if 2 in format_ids:
+            return True
+        return 15 in format_ids and bool(self.get_image_files(self.clipboard_element))
 
-    def execute(self, clipboard_element):
+    def get_image_files(self, clipboard_element):
+        """
+        Images of a multi-file paste, folders expanded (their images, by name).
+        """
+        paths = []
+        for path in clipboard_element.get_copied_files():
+            if os.path.isdir(path):
+                paths += sorted(
+                    os.path.join(path, name) for name in os.listdir(path)
+                    if os.path.splitext(name)[1].lower() in BATCH_EXTENSIONS
+                )
+            elif os.path.splitext(path)[1].lower() in BATCH_EXTENSIONS:
+                paths.append(path)
+        return paths
+
+    def _upscayl_args(self, input_path, output_path, settings=None):
+        """
+        upscayl-bin command line, `input_path`/`output_path` being files or folders, with the
+        tile size (-t) and thread counts (-j) of `settings` (see get_profile_settings).
+        """
+        upscayl_bin = os.path.join(
+            self.configPlugin.read_option('project_base'),
+            self.configPlugin.read_option('script_name')
+        )
+        args = [
+            upscayl_bin,
+            "-i", input_path,
+            "-o", output_path,
+            "-n", self.configPlugin.read_option('model_name'),
+            "-s", str(self.configPlugin.read_option('scale')),
+            "-f", "png"
+        ]
+        if settings:
+            args += ["-t", str(settings["tile"]), "-j", settings["threads"]]
+        return args
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Performance profile : upscayl-bin -t/-j per input size band
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def get_band(self, size):
+        """
+        Size band (key of `performance_profile`) of an input of `size` (width, height).
+        """
+        bands = sorted(self.configPlugin.read_option('calibration_bands'))
+        return str(next((band for band in bands if max(size) <= band), bands[-1]))
+
+    def get_profile_settings(self, size):
+        """
+        Calibrated {"tile", "threads"} for an input of `size`, None when its band was never
+        calibrated (upscayl-bin defaults).
+        """
+        if not size:
+            return None
+        return self.configPlugin.read_option('performance_profile').get(self.get_band(size))
+
+    @staticmethod
+    def get_image_size(path):
+        from PIL import Image
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception:
+            return None
+
+    def calibrate(self, input_path, output_path, size):
+        """
+        Times upscayl-bin on `input_path` with every -t candidate, then every -j candidate with
+        the best tile, and records the fastest settings for the band of `size` in config.conf.
+        Every run writes a full result, so the output of the last successful one is kept as the
+        result of this paste.
+        :return: True when `output_path` holds a result.
+        """
+        band = self.get_band(size)
+        threads = self.configPlugin.read_option('calibration_threads')
+        candidates = [{"tile": tile, "threads": threads[0]} for tile in self.configPlugin.read_option('calibration_tiles')]
+        best = None
+
+        def measure(settings, index, count):
+            self.set_stage(f"Calibrating upscale {index}/{count} (first image up to {band} px)")
+            started = time.perf_counter()
+            process = self.run_subprocess(
+                self._upscayl_args(input_path, output_path, settings), outputs=[output_path], parse_progress=False
+            )
+            if process.returncode != 0 or not os.path.exists(output_path):
+                print(f"Upscale calibration failed with {settings}: {process.stderr}")
+                return None
+            return time.perf_counter() - started
+
+        count = len(candidates) + len(threads) - 1
+        for index, settings in enumerate(candidates, 1):
+            seconds = measure(settings, index, count)
+            if seconds is not None and (best is None or seconds < best[0]):
+                best = (seconds, settings)
+        if best is None:
+            return False
+
+        for index, thread_counts in enumerate(threads[1:], len(candidates) + 1):
+            settings = {**best[1], "threads": thread_counts}
+            seconds = measure(settings, index, count)
+            if seconds is not None and seconds < best[0]:
+                best = (seconds, settings)
+
+        profile = {**self.configPlugin.read_option('performance_profile'), band: best[1]}
+        self.configPlugin.write_option('performance_profile', profile)
+        print(f"Upscale calibrated for inputs up to {band} px: {best[1]} ({best[0]:.2f} s)")
+        return os.path.exists(output_path)
+
+    def prepare_script(self):
+        """
+        Copies clipupscale.py in the upscale project folder when missing or older than ours,
+        and returns its destination path.
+        """
+        script_name = self.configPlugin.read_option('cpu_script_name')
+        script_source = os.path.join(self.configPlugin.read_option('base'), script_name)
+        script_dest = os.path.join(self.configPlugin.read_option('project_base'), script_name)
+
+        if not os.path.exists(script_dest) or os.path.getmtime(script_source) > os.path.getmtime(script_dest):
+            try:
+                shutil.copyfile(script_source, script_dest)
+            except Exception as e:
+                print(f"Error copying '{script_name}': {e}")
+        return script_dest
+
+    def _cpu_args(self, input_path, output_path):
         """
-        Upscale an image using upscayl-bin.exe.
+        clipupscale.py command line (same file/folder modes as upscayl-bin) and its environment.
         """
+        project_venv = self._cpu_venv()
+        options = {
+            "model": self.configPlugin.read_option('cpu_model'),
+            "scale": int(self.configPlugin.read_option('scale')),
+            "tile": self.configPlugin.read_option('cpu_tile'),
+            "overlap": self.configPlugin.read_option('cpu_tile_overlap'),
+            "workers": self.configPlugin.read_option('cpu_workers'),
+        }
+        args = [project_venv.python_executable, self.prepare_script(), input_path, output_path, json.dumps(options)]
+        return args, project_venv.prepare_for_subprocess()
+
+    def run_upscaler(self, input_path, output_path, outputs=(), parse_progress=True, size=None):
+        """
+        Runs the first working backend (see get_backends) and returns its process: when
+        upscayl-bin fails (no Vulkan device, ...) the CPU backend takes over with the same paths.
+        upscayl-bin runs with the profile settings of `size` (the input, or largest batch input).
+        """
+        backends = self.get_backends()
+        if not backends:
+            raise RuntimeError("No upscale backend installed.")
+
+        for backend in backends:
+            if backend == "upscayl":
+                process = self.run_subprocess(
+                    self._upscayl_args(input_path, output_path, self.get_profile_settings(size)),
+                    outputs=outputs, parse_progress=parse_progress
+                )
+            else:
+                self.set_stage("Upscaling (CPU)", 0)
+                args, env = self._cpu_args(input_path, output_path)
+                process = self.run_subprocess(args, outputs=outputs, parse_progress=parse_progress, env=env)
+            if process.returncode == 0:
+                break
+            print(f"Upscale failed with {backend}: {process.stderr}")
+        return process
+
+    def remote_capable(self, clipboard_element):
+        """
+        Clipboard images can go to an inference node (batches of files run here).
+        """
+        return 2 in clipboard_element.get_format_ids()
+
+    def store_key(self, clipboard_element):
+        """
+        Same clipboard image, model and scale: same upscale (batches of files aren't stored).
+        """
+        content_hash = clipboard_element.get_content_hash()
+        if 2 not in clipboard_element.get_format_ids() or not content_hash:
+            return None
+        return json.dumps({"input": content_hash, "options": self.result_options()}, sort_keys=True)
+
+    def result_options(self):
+        options = {key: self.configPlugin.read_option(key) for key in ("model_name", "scale", "backend", "cpu_model")}
+        options["cpu_model"] = os.path.basename(options["cpu_model"])
+        return options
+
+    def job_requirements(self, clipboard_element):
+        """
+        upscayl-bin: one run at a time on the GPU, its load/save threads on the CPU. The CPU
+        backend uses every core (see clipupscale.py).
+        """
+        backends = self.get_backends()
+        if backends and backends[0] == "upscayl":
+            cores = 2
+        else:
+            cores = os.cpu_count() or 1
+        batch = 2 not in clipboard_element.get_format_ids()
+        return {
+            "cores": cores,
+            "memory_mb": self.configPlugin.read_option('queue_memory_mb'),
+            "max_concurrency": 1,
+            "priority": self.configPlugin.read_option('queue_batch_priority' if batch else 'queue_priority'),
+        }
+
+    def preview(self, clipboard_element):
+        """
+        Lanczos upscale of the clipboard image, at the size of the upscayl result.
+        """
+        if not self.configPlugin.read_option('optimistic_paste') or 2 not in clipboard_element.get_format_ids():
+            return None
         media = self.extract_image_from_clipboard()
-        media.save(self.cache_save_path)  # Save the clipboard image in the cache
+        media.custom_savers = {mime_type: self.save_preview for mime_type in Media.IMAGE_EXTENSIONS}
+        return media
 
-        # Define input and output paths
-        input_path = media.get_path()
-        file_root, file_extension = os.path.splitext(input_path)
-        output_path = f"{file_root}-x2{file_extension}"
+    def save_preview(self, media):
+        import io
+        from PIL import Image
 
-        # Path to upscayl-bin.exe
-        project_base = self.configPlugin.read_option('project_base')
-        script_name  = self.configPlugin.read_option('script_name')
+        image = media.raw_content
+        if isinstance(image, bytes):
+            image = Image.open(io.BytesIO(image))
+        scale = int(self.configPlugin.read_option('scale'))
+        full_path = os.path.join(media.save_path, f"{media.index_file}.png")
+        image.resize((image.width * scale, image.height * scale), Image.Resampling.LANCZOS).save(full_path)
+        return "png", full_path
 
-        upscayl_bin = os.path.join(project_base, script_name)
-        model_path =  os.path.join(project_base, script_name)
+    def execute(self, clipboard_element):
+        """
+        Upscale an image using upscayl-bin.exe (or the CPU backend, see run_upscaler).
+        """
+        if 2 not in clipboard_element.get_format_ids():
+            return self.execute_batch(self.get_image_files(clipboard_element))
 
-        model_name = self.configPlugin.read_option('model_name')
+        self.set_stage("Reading clipboard")
+        media = self.get_cache_input()  # clipboard image saved in the cache (see ClipCapture)
+
+        # Define input and output paths
+        input_path = media.get_path()
+        # the result is handled as image/png, whatever the clipboard format was
+        scale = int(self.configPlugin.read_option('scale'))
+        file_root = os.path.splitext(input_path)[0]
+        output_path = f"{file_root}-x{scale}.png"
+
+        # On request only (`calibrate_upscayl`), first image of its size band: calibrate
+        # upscayl-bin, the fastest run is the result
+        size = self.get_image_size(input_path)
+        if (
+            size and self.configPlugin.read_option('calibrate_upscayl') and self._upscayl_installed()
+            and self.get_profile_settings(size) is None and self.calibrate(input_path, output_path, size)
+        ):
+            media.update_mimeType_path("image/png", output_path)
+            return media
 
         # Run the subprocess
-        process = subprocess.run(
-            [
-                upscayl_bin,
-                "-i", input_path,
-                "-o", output_path,
-                "-n", model_name
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        self.set_stage("Upscaling", 0)
+        process = self.run_upscaler(input_path, output_path, outputs=[output_path], size=size)
 
         # Check for errors
         if process.returncode != 0:
-            print(f"Upscale failed: {process.stderr}")
             raise RuntimeError("Upscale process failed.")
 
         # Update the media path to point to the upscaled image
         media.update_mimeType_path("image/png", output_path)
 
         return media  # Return the updated media object for ResolveAI to handle
+
+    def execute_batch(self, paths):
+        """
+        Upscales many images with a single upscayl-bin process (directory mode: the model is
+        loaded once). Inputs are staged in a temporary folder under ordered names, each output is
+        published (see PluginBase.publish) as soon as it is written, in the input order, so the
+        first frames reach the timeline while the next ones are processed.
+        """
+        if not paths:
+            raise ValueError("No image to upscale in the copied files.")
+
+        batch_dir = tempfile.mkdtemp(prefix="upscale-batch-", dir=self.cache_save_path)
+        input_dir = os.path.join(batch_dir, "in")
+        output_dir = os.path.join(batch_dir, "out")
+        os.makedirs(input_dir)
+        os.makedirs(output_dir)
+        try:
+            self.set_stage("Staging images")
+            outputs = []
+            # one upscayl-bin run for all: the settings of the largest image (the slowest ones)
+            image_sizes = [size for size in map(self.get_image_size, paths) if size]
+            largest = max(image_sizes, key=max) if image_sizes else None
+            for index, path in enumerate(paths):
+                staged_path = os.path.join(input_dir, f"{index:05d}{os.path.splitext(path)[1].lower()}")
+                try:
+                    os.link(path, staged_path)
+                except OSError:
+                    shutil.copy2(path, staged_path)
+                outputs.append(os.path.join(output_dir, f"{index:05d}.png"))
+
+            self.set_stage(f"Upscaling 0/{len(paths)}", 0)
+            result = {}
+
+            def run():
+                try:
+                    result["process"] = self.run_upscaler(input_dir, output_dir, parse_progress=False, size=largest)
+                except Exception as e:
+                    result["error"] = e
+
+            runner = threading.Thread(target=run, daemon=True)
+            runner.start()
+
+            next_index = 0
+            missing = []
+            while True:
+                finished = not runner.is_alive()
+                while next_index < len(outputs):
+                    if self._is_landed(outputs[next_index]):
+                        self._publish_output(outputs[next_index])
+                    elif finished:
+                        # no output for this one, the next ones are still published
+                        missing.append(paths[next_index])
+                    else:
+                        break
+                    next_index += 1
+                    self.set_stage(f"Upscaling {next_index}/{len(paths)}", next_index * 100 / len(paths))
+                if finished:
+                    break
+                time.sleep(0.2)
+
+            if "error" in result:
+                raise result["error"]
+            if missing:
+                print(f"Upscale failed for {len(missing)} file(s): {missing}\n{result['process'].stderr}")
+                if len(missing) == len(paths):
+                    raise RuntimeError("Upscale process failed.")
+            return None
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+
+    @classmethod
+    def _is_landed(cls, path):
+        """
+        An output is complete once its PNG is terminated by the IEND chunk: a file still being
+        written (or cut short by a crash) is never published.
+        """
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < len(cls.PNG_END):
+                    return False
+                f.seek(-len(cls.PNG_END), os.SEEK_END)
+                return f.read() == cls.PNG_END
+        except OSError:
+            return False
+
+    def _publish_output(self, path):
+        with open(path, "rb") as f:
+            self.publish(Media(raw_content=f.read(), mime_type="image/png"))
     
     def display_button(self):
         return "UpScale"
\ No newline at end of file
@@ -24,14 +24,29 @@
 
 import os
 import sys
+import glob
+import threading
 import subprocess
 
 class VirtualEnvHelper:
     """
     Helper class for managing virtual environments.
     Provides methods to activate a virtual environment for the current process or subprocesses.
+
+    Activation is idempotent and reversible: `sys.path` and `PATH` get each entry at most once, no
+    matter how many times (and from how many plugins) the same venv is activated, and
+    `deactivate` removes exactly what the activation added. Windows (`Lib\\site-packages`,
+    `Scripts\\python.exe`) and POSIX (`lib/pythonX.Y/site-packages`, `bin/python`) layouts are handled.
     """
 
+    # venv_path -> site-packages found on disk (validation cache shared by every instance)
+    _site_packages_cache = {}
+
+    # venv_path -> (previous VIRTUAL_ENV, sys.path entry added ?, PATH entry added ?)
+    _activations = {}
+
+    _lock = threading.Lock()
+
     def __init__(self, venv_path):
         """
         Initializes the VirtualEnvHelper with the path to the virtual environment.
@@ -39,8 +54,46 @@ class VirtualEnvHelper:
         :param venv_path: Path to the virtual environment.
         """
         self.venv_path = venv_path
-        self.site_packages = os.path.join(venv_path, "Lib", "site-packages")
-        self.python_executable = os.path.join(venv_path, "Scripts", "python.exe")  # Adjust for Linux/Mac if needed
+        if os.name == "nt":
+            self.bin_dir = os.path.join(venv_path, "Scripts")
+            self.python_executable = os.path.join(self.bin_dir, "python.exe")
+        else:
+            self.bin_dir = os.path.join(venv_path, "bin")
+            self.python_executable = os.path.join(self.bin_dir, "python")
+        self.site_packages = self._find_site_packages()
+
+    def _find_site_packages(self):
+        """
+        Returns the site-packages folder of the venv. A found folder is cached for the process,
+        a missing one is looked up again next time (the venv may be installed meanwhile).
+        """
+        cached = VirtualEnvHelper._site_packages_cache.get(self.venv_path)
+        if cached:
+            return cached
+
+        if os.name == "nt":
+            candidates = [os.path.join(self.venv_path, "Lib", "site-packages")]
+        else:
+            version = f"python{sys.version_info[0]}.{sys.version_info[1]}"
+            candidates = [os.path.join(self.venv_path, "lib", version, "site-packages")]
+            candidates += sorted(glob.glob(os.path.join(self.venv_path, "lib", "python*", "site-packages")))
+
+        for candidate in candidates:
+            if os.path.isdir(candidate):
+                VirtualEnvHelper._site_packages_cache[self.venv_path] = candidate
+                return candidate
+        return candidates[0]
+
+    def is_valid(self):
+        """
+        True if the venv site-packages exists (cached once found).
+        """
+        if self.venv_path not in VirtualEnvHelper._site_packages_cache:
+            self.site_packages = self._find_site_packages()
+        return self.venv_path in VirtualEnvHelper._site_packages_cache
+
+    def is_active(self):
+        return self.venv_path in VirtualEnvHelper._activations
 
     def activate_for_current_process(self):
         """
@@ -48,25 +101,51 @@ class VirtualEnvHelper:
         
         This method modifies the `sys.path` and `os.environ` to include the virtual environment's site-packages
         and python executable, respectively. It ensures that any further imports use the packages installed in the
-        virtual environment.
+        virtual environment. Calling it again for an already active venv does nothing.
         """
-        if not os.path.exists(self.site_packages):
-            raise FileNotFoundError(f"Site-packages not found in virtual environment: {self.site_packages}")
-        sys.path.insert(0, self.site_packages)
-        os.environ["VIRTUAL_ENV"] = self.venv_path
-        os.environ["PATH"] = os.path.join(self.venv_path, "Scripts") + ";" + os.environ["PATH"]
+        with VirtualEnvHelper._lock:
+            if self.is_active():
+                return
+
+            if not self.is_valid():
+                raise FileNotFoundError(f"Site-packages not found in virtual environment: {self.site_packages}")
 
-        # print(os.environ["VIRTUAL_ENV"])
+            added_path = self.site_packages not in sys.path
+            if added_path:
+                sys.path.insert(0, self.site_packages)
 
-        # print(os.environ["PATH"])
+            path_entries = os.environ.get("PATH", "").split(os.pathsep)
+            added_bin = self.bin_dir not in path_entries
+            if added_bin:
+                os.environ["PATH"] = os.pathsep.join([self.bin_dir, *path_entries])
 
-        # print(f"sys.path: {sys.path}")
-        # print(f"sys.executable: {sys.executable}")
-        # import urllib3
-        # http = urllib3.PoolManager()
-        # response = http.request('GET', 'https://www.example.com')
-        # print(f"Test urllib3: Status {response.status}")
-        # exit()
+            VirtualEnvHelper._activations[self.venv_path] = (os.environ.get("VIRTUAL_ENV"), added_path, added_bin)
+            os.environ["VIRTUAL_ENV"] = self.venv_path
+
+    def deactivate(self):
+        """
+        Reverts `activate_for_current_process`: removes the entries it added to `sys.path` and
+        `PATH` and restores the previous VIRTUAL_ENV.
+        """
+        with VirtualEnvHelper._lock:
+            state = VirtualEnvHelper._activations.pop(self.venv_path, None)
+            if not state:
+                return
+            previous_env, added_path, added_bin = state
+
+            if added_path and self.site_packages in sys.path:
+                sys.path.remove(self.site_packages)
+
+            if added_bin:
+                path_entries = os.environ.get("PATH", "").split(os.pathsep)
+                if self.bin_dir in path_entries:
+                    path_entries.remove(self.bin_dir)
+                os.environ["PATH"] = os.pathsep.join(path_entries)
+
+            if previous_env is None:
+                os.environ.pop("VIRTUAL_ENV", None)
+            else:
+                os.environ["VIRTUAL_ENV"] = previous_env
 
     def initVirtualEnv(self):
         """
@@ -93,7 +172,8 @@ class VirtualEnvHelper:
             raise FileNotFoundError(f"Python executable not found in virtual environment: {self.python_executable}")
         env = os.environ.copy()
         env["VIRTUAL_ENV"] = self.venv_path
-        env["PATH"] = os.path.join(self.venv_path, "Scripts") + ";" + env["PATH"]
+        path_entries = [entry for entry in env.get("PATH", "").split(os.pathsep) if entry != self.bin_dir]
+        env["PATH"] = os.pathsep.join([self.bin_dir, *path_entries])
         return env
 
     def run_script_in_venv(self, script_path, *args):
@@ -120,3 +200,4 @@ class VirtualEnvHelper:
 # helper = VirtualEnvHelper("path/to/venv")
 # helper.activate_for_current_process()  # For ResolveAI
 # env = helper.prepare_for_subprocess()  # For subprocess
+# helper.deactivate()                    # Back to the previous sys.path / PATH
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import shutil
+import hashlib
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".webm", ".avi", ".mxf", ".m4v"}
+
+# bytes read at the start, middle and end of a file for its cache key
+SAMPLE_SIZE = 1024 * 1024
+
+
+def make_still_proxy(source_path, proxy_path, max_side):
+    """
+    Worker: JPEG copy of a still with its longest side at `max_side` (JPEG draft decoding and
+    box reduction first, LANCZOS for the last step).
+    """
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        scale = max_side / max(image.size)
+        target = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image.draft("RGB", target)
+        factor = min(image.width // target[0], image.height // target[1])
+        reduced = image.reduce(factor) if factor >= 2 else image
+        proxy = reduced.convert("RGB").resize(target, Image.Resampling.LANCZOS)
+
+    temp_path = f"{proxy_path}.tmp"
+    proxy.save(temp_path, format="JPEG", quality=85)
+    os.replace(temp_path, proxy_path)
+    return proxy_path
+
+
+def make_video_proxy(source_path, proxy_path, max_side, ffmpeg):
+    """
+    Worker: H.264 proxy of a video through ffmpeg (decode, scale, encode in one pipeline), the
+    longest side limited to `max_side`, audio kept.
+    """
+    temp_path = f"{proxy_path}.tmp.mp4"
+    scale = f"scale='if(gt(iw,ih),min({max_side},iw),-2)':'if(gt(iw,ih),-2,min({max_side},ih))'"
+    process = subprocess.run(
+        [
+            ffmpeg, "-y", "-v", "error", "-i", source_path,
+            "-vf", scale, "-c:v", "libx264", "-preset", "veryfast", "-crf", "23",
+            "-pix_fmt", "yuv420p", "-c:a", "aac", "-b:a", "128k", temp_path
+        ],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if process.returncode != 0:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise RuntimeError(f"ffmpeg failed: {process.stderr.strip()}")
+    os.replace(temp_path, proxy_path)
+    return proxy_path
+
+
+class ProxyGenerator:
+    """
+    Builds lightweight proxies of heavy pasted media in a background process pool, to be linked
+    with MediaPoolItem.LinkProxyMedia so big stills and 8K clips stay scrubbable.
+
+    - stills whose longest side exceeds `min_side` get a JPEG proxy (Pillow),
+    - videos over `min_video_mb` get an H.264 proxy when ffmpeg is available,
+    - proxies are cached by sampled content (size + start/middle/end bytes), so the same media
+      pasted again under another asset name links the cached proxy at once.
+    """
+
+    def __init__(self, proxy_folder, max_side=1920, min_side=3840, min_video_mb=200, ffmpeg=None, python_executable=None):
+        """
+        :param proxy_folder: cache folder of the proxies.
+        :param max_side: longest side of the proxies.
+        :param min_side: stills above this longest side get a proxy.
+        :param min_video_mb: videos above this size get a proxy.
+        :param ffmpeg: ffmpeg executable (default: found in PATH), videos are skipped without it.
+        :param python_executable: interpreter of the pool workers (the venv one when the host
+            application embeds Python), default: the current one.
+        """
+        os.makedirs(proxy_folder, exist_ok=True)
+        self.proxy_folder = proxy_folder
+        self.max_side = max_side
+        self.min_side = min_side
+        self.min_video_bytes = min_video_mb * 1024 * 1024
+        self.ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        self.python_executable = python_executable
+        self.executor = None
+
+    def _get_executor(self):
+        if self.executor is None:
+            context = multiprocessing.get_context("spawn")
+            if self.python_executable and os.path.isfile(self.python_executable):
+                context.set_executable(self.python_executable)
+            self.executor = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2), mp_context=context)
+        return self.executor
+
+    @staticmethod
+    def is_video(path):
+        return os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS
+
+    def get_proxy_path(self, path):
+        """
+        Cache path of the proxy of `path`, keyed by its size and sampled content (a few MB read
+        whatever the file size).
+        """
+        size = os.path.getsize(path)
+        digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+        with open(path, "rb") as f:
+            for offset in sorted({0, max(0, size // 2 - SAMPLE_SIZE // 2), max(0, size - SAMPLE_SIZE)}):
+                f.seek(offset)
+                digest.update(f.read(SAMPLE_SIZE))
+        key = digest.hexdigest()
+        return os.path.join(self.proxy_folder, f"{key}.{'mp4' if self.is_video(path) else 'jpg'}")
+
+    def cached(self, path):
+        """
+        Returns the already generated proxy of `path`, or None.
+        """
+        proxy_path = self.get_proxy_path(path)
+        return proxy_path if os.path.exists(proxy_path) else None
+
+    def needs_proxy(self, path):
+        """
+        True if `path` is heavy enough to be worth a proxy (and can be processed here).
+        """
+        if self.is_video(path):
+            return bool(self.ffmpeg) and os.path.getsize(path) >= self.min_video_bytes
+        try:
+            from PIL import Image
+            with Image.open(path) as image:  # header only
+                return max(image.size) > self.min_side
+        except Exception:
+            return False
+
+    def submit(self, path):
+        """
+        Starts the proxy generation of `path` in the pool, returns a Future of the proxy path.
+        """
+        proxy_path = self.get_proxy_path(path)
+        if self.is_video(path):
+            return self._get_executor().submit(make_video_proxy, path, proxy_path, self.max_side, self.ffmpeg)
+        return self._get_executor().submit(make_still_proxy, path, proxy_path, self.max_side)
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+# label of the object returned by a native method, to name calls `MediaPool.GetRootFolder`
+RETURNED_TYPES = {
+    "GetProjectManager": "ProjectManager",
+    "GetCurrentProject": "Project",
+    "LoadProject": "Project",
+    "GetMediaPool": "MediaPool",
+    "GetMediaStorage": "MediaStorage",
+    "GetRootFolder": "Folder",
+    "GetCurrentFolder": "Folder",
+    "GetSubFolderList": "Folder",
+    "AddSubFolder": "Folder",
+    "GetClipList": "MediaPoolItem",
+    "AddItemsToMediaPool": "MediaPoolItem",
+    "ImportMedia": "MediaPoolItem",
+    "GetMediaPoolItem": "MediaPoolItem",
+    "GetCurrentTimeline": "Timeline",
+    "GetTimelineByIndex": "Timeline",
+    "AppendToTimeline": "TimelineItem",
+    "GetItemListInTrack": "TimelineItem",
+    "GetCurrentVideoItem": "TimelineItem",
+}
+
+PRIMITIVES = (str, int, float, bool, bytes, type(None))
+
+
+class NativeProxy:
+    """
+    Base of the proxies of native Resolve objects (ResolveProxy here, SessionProxy of
+    resolveSession): compared, hashed and tested as the object they wrap.
+    """
+    __slots__ = ("_target",)
+
+    def __eq__(self, other):
+        return self._target == unwrap_native(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __bool__(self):
+        return bool(self._target)
+
+
+def wrap_native(value, make_proxy):
+    """
+    Returns `value` with its native objects proxied by `make_proxy(target)`, also inside lists,
+    tuples and dicts (ex: GetClipList, GetItemListInTrack).
+    """
+    if isinstance(value, PRIMITIVES):
+        return value
+    if isinstance(value, list):
+        return [wrap_native(item, make_proxy) for item in value]
+    if isinstance(value, tuple):
+        return tuple(wrap_native(item, make_proxy) for item in value)
+    if isinstance(value, dict):
+        return {key: wrap_native(item, make_proxy) for key, item in value.items()}
+    return make_proxy(value)
+
+
+def unwrap_native(value):
+    """
+    Native methods must receive native objects: proxies are unwrapped (one level), also inside
+    lists and dicts (ex: AppendToTimeline([{"mediaPoolItem": item}])).
+    """
+    if isinstance(value, NativeProxy):
+        return value._target
+    if isinstance(value, list):
+        return [unwrap_native(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(unwrap_native(item) for item in value)
+    if isinstance(value, dict):
+        return {key: unwrap_native(item) for key, item in value.items()}
+    return value
+
+
+class ResolveProfiler:
+    """
+    Counts and times every native call made on the DaVinci Resolve scripting API (each one is an
+    IPC round trip) and attributes it to the ClipRocks operation that triggered it.
+
+    `wrap(resolve)` returns a proxy of the `resolve` object; every object obtained through it is
+    proxied as well, so the whole object graph is accounted for. Operations are named with
+    `operation(name)` (nested operations are joined with " > ") or by `instrument(api)`, which
+    turns each public method of an object (ex: DaVinciAPI) into an operation.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the recorded calls (start of a new paste).
+        """
+        with self._lock:
+            # { operation: { "Type.Method": [calls, seconds] } }
+            self.records = {}
+            self.started = time.perf_counter()
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Operations (attribution)
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_operation(self):
+        stack = self._stack()
+        return " > ".join(stack) if stack else "other"
+
+    @contextmanager
+    def operation(self, name):
+        """
+        Attributes the native calls made inside the `with` block (current thread) to `name`.
+        """
+        stack = self._stack()
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def caller_operation(self):
+        """
+        Context manager attributing the native calls made in another thread (ResolveSession
+        dispatcher) to the current operation of this one.
+        """
+        stack = self._stack()
+        return self.operation(" > ".join(stack)) if stack else nullcontext()
+
+    def instrument(self, obj):
+        """
+        Wraps each public method of `obj` (instance attributes) as an operation of its own name.
+        Properties are left alone (not evaluated).
+        """
+        for name in dir(obj):
+            if name.startswith("_") or isinstance(getattr(type(obj), name, None), property):
+                continue
+            method = getattr(obj, name)
+            if callable(method):
+                setattr(obj, name, self._operation_method(name, method))
+        return obj
+
+    def _operation_method(self, name, method):
+        def wrapper(*args, **kwargs):
+            with self.operation(name):
+                return method(*args, **kwargs)
+        return wrapper
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Proxies
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def wrap(self, resolve):
+        """
+        Returns the instrumented proxy of the native `resolve` object.
+        """
+        return ResolveProxy(resolve, self, "Resolve")
+
+    def record(self, call_name, seconds):
+        operation = self.current_operation()
+        with self._lock:
+            calls = self.records.setdefault(operation, {})
+            record = calls.setdefault(call_name, [0, 0.0])
+            record[0] += 1
+            record[1] += seconds
+
+    def wrap_result(self, result, type_name):
+        return wrap_native(result, lambda target: ResolveProxy(target, self, type_name))
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Summary
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def summary(self, label=None):
+        """
+        Returns the per-operation summary of the calls recorded since the last `reset`.
+        """
+        with self._lock:
+            operations = {}
+            total_calls, total_seconds = 0, 0.0
+            for operation, calls in self.records.items():
+                op_calls = sum(record[0] for record in calls.values())
+                op_seconds = sum(record[1] for record in calls.values())
+                total_calls += op_calls
+                total_seconds += op_seconds
+                operations[operation] = {
+                    "calls": op_calls,
+                    "ms": round(op_seconds * 1000, 3),
+                    "methods": {
+                        name: {"calls": record[0], "ms": round(record[1] * 1000, 3)}
+                        for name, record in sorted(calls.items(), key=lambda item: -item[1][1])
+                    },
+                }
+            return {
+                "label": label,
+                "timestamp": time.time(),
+                "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+                "calls": total_calls,
+                "ms": round(total_seconds * 1000, 3),
+                "operations": operations,
+            }
+
+    def format_summary(self, summary):
+        lines = [f"Resolve API: {summary['calls']} calls, {summary['ms']:.1f} ms ({summary['label']})"]
+        for operation, data in summary["operations"].items():
+            lines.append(f"  {operation}: {data['calls']} calls, {data['ms']:.1f} ms")
+            for name, record in data["methods"].items():
+                lines.append(f"      {name:<36} {record['calls']:>5} {record['ms']:>9.2f} ms")
+        return "\n".join(lines)
+
+    def dump(self, path, label=None):
+        """
+        Prints the summary and appends it as one JSON line to `path` (one line per paste).
+        """
+        summary = self.summary(label)
+        print(self.format_summary(summary))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+        return summary
+
+
+class ResolveProxy(NativeProxy):
+    """
+    Transparent proxy of a native Resolve object: method calls are forwarded, counted and timed,
+    returned objects are proxied in turn.
+    """
+    __slots__ = ("_profiler", "_type_name")
+
+    def __init__(self, target, profiler, type_name):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_type_name", type_name)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        profiler = self._profiler
+        call_name = f"{self._type_name}.{name}"
+        result_type = RETURNED_TYPES.get(name, "Object")
+
+        def call(*args, **kwargs):
+            args = unwrap_native(args)
+            kwargs = unwrap_native(kwargs)
+            start = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            finally:
+                profiler.record(call_name, time.perf_counter() - start)
+            return profiler.wrap_result(result, result_type)
+        return call
+
+    def __repr__(self):
+        return f"<ResolveProxy {self._type_name} {self._target!r}>"
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from resolveProfiler import NativeProxy, wrap_native, unwrap_native
+
+# answers that don't change during one ClipRocks invocation, asked once per object. Any other
+# call not starting with one of READ_PREFIXES (SetCurrentFolder, ReplaceClip, RelinkClips,
+# AppendToTimeline, ...) forgets the memoized answers of its object and of the objects it is given
+MEMOIZED_METHODS = {
+    "GetProjectManager",
+    "GetCurrentProject",
+    "GetMediaPool",
+    "GetMediaStorage",
+    "GetRootFolder",
+    "GetCurrentTimeline",
+    "GetName",
+    "GetSetting",
+}
+READ_PREFIXES = ("Get",)
+
+
+class ResolveSession:
+    """
+    The DaVinci Resolve scripting objects of one ClipRocks invocation, behind a proxy
+    (`session.resolve`) that:
+
+    - resolves nothing up front: the project, media pool, ... are asked for on first use, so a
+      dismissed menu costs no IPC at all;
+    - memoizes the answers that can't change meanwhile (MEMOIZED_METHODS);
+    - runs every native call on one dispatcher thread, in order: the Tk thread and the plugin
+      workers can all use Resolve without interleaving (SetCurrentFolder + AddItemsToMediaPool
+      of two imports), and adjacent requests of the same kind are merged (see call_batched).
+
+    `context` (optional) is called on the caller thread for each request and returns the
+    context manager the dispatcher enters around the call (see ResolveProfiler.caller_operation).
+    """
+
+    def __init__(self, resolve, context=None):
+        self.context = context
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._dispatch, name="resolve-dispatcher", daemon=True)
+        self.thread.start()
+        self.resolve = SessionProxy(resolve, self)
+
+    def call(self, function, *args, **kwargs):
+        """
+        Runs `function` on the dispatcher thread and returns its result (directly when already
+        there: calls made by a request).
+        """
+        if threading.current_thread() is self.thread:
+            return function(*args, **kwargs)
+        return self._submit(lambda: function(*args, **kwargs)).result()
+
+    def call_batched(self, key, batch_function, item):
+        """
+        Queues `item` for `batch_function(items) -> results`. Requests of the same `key` waiting
+        next to each other in the queue are run as a single `batch_function` call.
+        """
+        if threading.current_thread() is self.thread:
+            return batch_function([item])[0]
+        return self._submit(batch_function, key=key, item=item).result()
+
+    def _submit(self, function, key=None, item=None):
+        request = {
+            "function": function,
+            "key": key,
+            "item": item,
+            "context": self.context() if self.context else None,
+            "future": Future(),
+        }
+        with self.condition:
+            self.pending.append(request)
+            self.condition.notify()
+        return request["future"]
+
+    def _dispatch(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                batch = [self.pending.popleft()]
+                while batch[0]["key"] is not None and self.pending and self.pending[0]["key"] == batch[0]["key"]:
+                    batch.append(self.pending.popleft())
+            self._run(batch)
+
+    def _run(self, batch):
+        first = batch[0]
+        try:
+            if first["context"] is not None:
+                with first["context"]:
+                    results = self._execute(batch)
+            else:
+                results = self._execute(batch)
+        except BaseException as e:
+            for request in batch:
+                request["future"].set_exception(e)
+            return
+        for request, result in zip(batch, results):
+            request["future"].set_result(result)
+
+    @staticmethod
+    def _execute(batch):
+        if batch[0]["key"] is None:
+            return [batch[0]["function"]()]
+        return batch[0]["function"]([request["item"] for request in batch])
+
+    def wrap_result(self, result):
+        return wrap_native(result, lambda target: SessionProxy(target, self))
+
+
+class SessionProxy(NativeProxy):
+    """
+    Proxy of a native Resolve object: method calls run on the session dispatcher thread,
+    memoized answers are kept on the proxy, returned objects are proxied in turn.
+    """
+    __slots__ = ("_session", "_memo")
+
+    def __init__(self, target, session):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_session", session)
+        object.__setattr__(self, "_memo", {})
+
+    def __getattr__(self, name):
+        session = self._session
+        memo = self._memo
+        target = self._target
+
+        def call(*args, **kwargs):
+            # ex: RelinkClips([clip], folder) changes `clip`, ReplaceClip its own object
+            mutating = name not in MEMOIZED_METHODS and not name.startswith(READ_PREFIXES)
+            changed = [self, *SessionProxy._proxies((args, kwargs))] if mutating else []
+            args = unwrap_native(args)
+            kwargs = unwrap_native(kwargs)
+            memo_key = (name, args) if name in MEMOIZED_METHODS and not kwargs else None
+            if memo_key is not None:
+                try:
+                    if memo_key in memo:
+                        return memo[memo_key]
+                except TypeError:
+                    # unhashable arguments
+                    memo_key = None
+
+            try:
+                result = session.wrap_result(session.call(lambda: getattr(target, name)(*args, **kwargs)))
+            finally:
+                for proxy in changed:
+                    proxy._memo.clear()
+            if memo_key is not None:
+                memo[memo_key] = result
+            return result
+        return call
+
+    @staticmethod
+    def _proxies(value):
+        """
+        SessionProxy objects found in a call argument (lists, tuples and dicts walked).
+        """
+        if isinstance(value, SessionProxy):
+            return [value]
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, (list, tuple)):
+            return [proxy for item in value for proxy in SessionProxy._proxies(item)]
+        return []
+
+    def __repr__(self):
+        return f"<SessionProxy {self._target!r}>"
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import uuid
+import time
+import shutil
+import hashlib
+import threading
+
+# files are hashed and copied by chunks of this size
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class SharedStore:
+    """
+    Content-addressed store shared by the seats of a team on a network path: the download of a
+    stock image or the AI cutout of a shared screenshot is done once, the other editors copy
+    the result.
+
+    <root>/objects/ab/cd/<hash>.<ext> : files named by the hash of their content, sharded by
+    hash prefix so that no folder grows too big for the file server.
+    <root>/refs/ab/cd/<key hash>.json : work key (URL, plugin + options + input hash) -> object
+    and its metadata (mime type).
+
+    Nothing is locked: files are written under a unique temporary name and renamed in place
+    (atomic), a content-addressed object or a ref written twice has the same content anyway.
+    Each seat reads through a local copy (LRU on the file mtime, `local_max_mb`), the network
+    is only read on the first use of a key. Publishing to the network path runs in background
+    (see flush).
+    """
+
+    def __init__(self, root, local_folder, local_max_mb=2048):
+        """
+        :param root: shared folder (UNC path, mounted share).
+        :param local_folder: local read-through copy of this seat.
+        :param local_max_mb: size of the local copy, least recently used objects are removed.
+        """
+        self.root = root
+        self.local_objects = os.path.join(local_folder, "objects")
+        self.local_refs = os.path.join(local_folder, "refs")
+        for path in (self.local_objects, self.local_refs):
+            os.makedirs(path, exist_ok=True)
+        self.local_max_bytes = local_max_mb * 1024 * 1024
+        self.publishing = []
+        # local objects the background threads are still copying to the network (never evicted)
+        self.pinned = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def hash_key(key):
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def hash_file(path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _shared_path(self, kind, name):
+        return os.path.join(self.root, kind, name[:2], name[2:4], name)
+
+    @staticmethod
+    def _publish_file(source, destination):
+        """
+        Copies `source` to `destination` under a temporary name, then renames it in place.
+        """
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temp_path = f"{destination}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def _write_json(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_json(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Read : local copy first, then the shared store
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def get(self, key):
+        """
+        Returns (local path, ref) of the object stored for `key`, or None. The ref holds the
+        metadata given to `put` (mime_type, ...).
+        """
+        key_hash = self.hash_key(key)
+        local_ref_path = os.path.join(self.local_refs, f"{key_hash}.json")
+        ref = self._read_json(local_ref_path)
+        if ref:
+            local_path = os.path.join(self.local_objects, ref["object"])
+            if os.path.exists(local_path):
+                # most recently used
+                os.utime(local_path)
+                return local_path, ref
+
+        try:
+            ref = self._read_json(self._shared_path("refs", f"{key_hash}.json"))
+            if not ref:
+                return None
+            local_path = os.path.join(self.local_objects, ref["object"])
+            if not os.path.exists(local_path):
+                self._publish_file(self._shared_path("objects", ref["object"]), local_path)
+        except OSError as e:
+            print(f"Shared store unavailable: {e}")
+            return None
+
+        self._write_json(local_ref_path, ref)
+        os.utime(local_path)
+        self._evict(keep=local_path)
+        return local_path, ref
+
+    def read(self, key):
+        """
+        (bytes, ref) of the object stored for `key`, or (None, None).
+        """
+        stored = self.get(key)
+        if not stored:
+            return None, None
+        with open(stored[0], "rb") as f:
+            return f.read(), stored[1]
+
+    def _evict(self, keep=None):
+        """
+        Removes the least recently used local objects above `local_max_bytes` (their refs are
+        dropped on the next `get`). `keep`, the object just handed to the caller, and the
+        objects still being published are never removed.
+        """
+        entries = [entry for entry in os.scandir(self.local_objects) if entry.is_file() and not entry.name.endswith(".tmp")]
+        total = sum(entry.stat().st_size for entry in entries)
+        with self.lock:
+            protected = {os.path.normcase(os.path.abspath(path)) for path in (keep, *self.pinned) if path}
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if total <= self.local_max_bytes:
+                break
+            if os.path.normcase(os.path.abspath(entry.path)) in protected:
+                continue
+            total -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+
+    """──────────────────────────────────────────────────────────────────────────────────
+    Write : local copy at once, shared store in background
+    ─▼─────────────────────────────────────────────────────────────────────────────▼──"""
+
+    def put(self, key, path, extension=None, **metadata):
+        """
+        Stores the file `path` as the result of `key` (`extension` of the object, the one of
+        `path` by default). Returns the content hash.
+        """
+        content_hash = self.hash_file(path)
+        extension = extension or os.path.splitext(path)[1][1:]
+        ref = {"object": f"{content_hash}.{extension.lower()}", **metadata}
+
+        local_path = os.path.join(self.local_objects, ref["object"])
+        if not os.path.exists(local_path):
+            self._publish_file(path, local_path)
+        else:
+            # most recently used
+            os.utime(local_path)
+        self._write_json(os.path.join(self.local_refs, f"{self.hash_key(key)}.json"), ref)
+
+        thread = threading.Thread(target=self._publish, args=(key, local_path, ref), daemon=True)
+        with self.lock:
+            self.publishing.append(thread)
+            self.pinned.add(local_path)
+        self._evict(keep=local_path)
+        thread.start()
+        return content_hash
+
+    def put_bytes(self, key, data, extension, **metadata):
+        """
+        `put` for content in memory (downloads).
+        """
+        temp_path = os.path.join(self.local_objects, f"{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        try:
+            return self.put(key, temp_path, extension, **metadata)
+        finally:
+            os.remove(temp_path)
+
+    def _publish(self, key, local_path, ref):
+        try:
+            shared_path = self._shared_path("objects", ref["object"])
+            if not os.path.exists(shared_path):
+                self._publish_file(local_path, shared_path)
+            self._write_json(self._shared_path("refs", f"{self.hash_key(key)}.json"), ref)
+        except OSError as e:
+            print(f"Shared store publish failed: {e}")
+        finally:
+            with self.lock:
+                self.pinned.discard(local_path)
+
+    def flush(self, timeout=30):
+        """
+        Waits for the background publishing (before the script ends), `timeout` seconds at most
+        in all: a stalled network share must not keep Resolve's script running. The results
+        not published in time stay in the local copy of this seat only.
+        """
+        with self.lock:
+            threads, self.publishing = self.publishing, []
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        pending = [thread for thread in threads if thread.is_alive()]
+        if pending:
+            with self.lock:
+                self.publishing.extend(pending)
+            print(f"Shared store: {len(pending)} result(s) not published after {timeout}s")
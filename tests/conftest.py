@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+    Unit tests of the pure logic of ClipRocks (no Resolve, no Windows), run with pytest from the
+    script folder:
+
+        python -m pytest tests
+
+    The Windows clipboard modules are replaced by the synthetic clipboard of the benchmarks
+    (FakeClipboard) so that ClipElement, Media and the plugins can be imported anywhere.
+"""
+
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(TESTS_DIR)
+sys.path[:0] = [SCRIPT_DIR, os.path.join(SCRIPT_DIR, "benchmarks")]
+
+from fakeClipboard import FakeClipboard
+
+# None when the real clipboard is there (pywin32 installed): tests writing to it are skipped
+FAKE_CLIPBOARD = None
+try:
+    import win32clipboard
+except ImportError:
+    FAKE_CLIPBOARD = FakeClipboard()
+    FAKE_CLIPBOARD.install()
+
+
+@pytest.fixture
+def clipboard():
+    """
+    The synthetic clipboard, emptied.
+    """
+    if FAKE_CLIPBOARD is None:
+        pytest.skip("real Windows clipboard")
+    FAKE_CLIPBOARD.clear()
+    return FAKE_CLIPBOARD
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import types
+
+import pytest
+
+import assetCatalog
+from assetCatalog import AssetCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return AssetCatalog(str(tmp_path / "catalogs"), "My Project: v2", workers=2)
+
+
+def test_catalog_file_per_project(catalog, tmp_path):
+    assert catalog.path == str(tmp_path / "catalogs" / "My_Project__v2.json")
+
+
+def test_same_hash_for_bytes_and_file(catalog, tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"content")
+    assert catalog.hash_buffer(b"content") == catalog.hash_file(str(path))
+    assert catalog.hash_buffer(b"content") != catalog.hash_buffer(b"other")
+
+
+def test_chunked_hash_matches_the_file(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(assetCatalog, "CHUNK_SIZE", 1000)
+    data = bytes(range(256)) * 20
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+    assert catalog.hash_buffer(data) == catalog.hash_file(str(path))
+    # the length is part of the hash: trailing zeros give another one
+    assert catalog.hash_buffer(data) != catalog.hash_buffer(data + b"\0")
+
+
+def test_empty_file(catalog, tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert catalog.hash_file(str(path)) == catalog.hash_buffer(b"")
+
+
+def test_hash_key_never_equals_a_content_hash(catalog):
+    key = 'RemBg:{"input": "abc", "options": {}}'
+    assert AssetCatalog.hash_key(key) == AssetCatalog.hash_key(key)
+    assert AssetCatalog.hash_key(key).startswith("result:")
+    assert AssetCatalog.hash_key(key) != catalog.hash_buffer(key.encode("utf-8"))
+
+
+def test_hash_media(catalog, tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"jpeg")
+    assert catalog.hash_media(types.SimpleNamespace(raw_content=b"jpeg", path=None)) == catalog.hash_buffer(b"jpeg")
+    assert catalog.hash_media(types.SimpleNamespace(raw_content=None, path=str(path))) == catalog.hash_buffer(b"jpeg")
+    assert catalog.hash_media(types.SimpleNamespace(raw_content=object(), path=None)) is None
+
+
+def test_lookup_under_every_hash(catalog, tmp_path):
+    asset = tmp_path / "3.png"
+    asset.write_bytes(b"png")
+    catalog.add(["received", None, "saved"], str(asset), "3.png")
+
+    assert catalog.lookup("received") == {"hash": "received", "path": str(asset), "clip_name": "3.png"}
+    assert catalog.lookup("saved")["clip_name"] == "3.png"
+    assert catalog.lookup("unknown") is None
+    assert catalog.lookup(None) is None
+
+
+def test_lookup_needs_the_asset_file(catalog, tmp_path):
+    asset = tmp_path / "4.png"
+    asset.write_bytes(b"png")
+    catalog.add(["h"], str(asset), "4.png")
+    asset.unlink()
+    assert catalog.lookup("h") is None
+
+
+def test_forget_removes_every_hash_of_the_asset(catalog, tmp_path):
+    asset = tmp_path / "5.png"
+    asset.write_bytes(b"png")
+    other = tmp_path / "6.png"
+    other.write_bytes(b"png")
+    catalog.add(["a", "b"], str(asset), "5.png")
+    catalog.add(["c"], str(other), "6.png")
+
+    catalog.forget(catalog.lookup("a"))
+    assert catalog.lookup("b") is None
+    assert catalog.lookup("c")["clip_name"] == "6.png"
+
+    # and the catalog file is up to date for the next process
+    reloaded = AssetCatalog(str(tmp_path / "catalogs"), "My Project: v2")
+    assert reloaded.lookup("a") is None
+    assert reloaded.lookup("c")["clip_name"] == "6.png"
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from clipElement import ClipElement
+from fakeClipboard import FakeClipboard
+
+
+def test_srcset_width_descriptors():
+    srcset = "small.jpg 480w, large.jpg 1920w, medium.jpg 1080w"
+    assert ClipElement._largest_srcset_candidate(srcset) == "large.jpg"
+
+
+def test_srcset_density_descriptors():
+    assert ClipElement._largest_srcset_candidate("a.jpg, b.jpg 2x, c.jpg 1.5x") == "b.jpg"
+
+
+def test_srcset_width_wins_over_density():
+    assert ClipElement._largest_srcset_candidate("dense.jpg 3x, wide.jpg 100w") == "wide.jpg"
+
+
+def test_srcset_skips_invalid_candidates():
+    assert ClipElement._largest_srcset_candidate("bad.jpg huge, , ok.jpg 200w") == "ok.jpg"
+    assert ClipElement._largest_srcset_candidate("") is None
+    assert ClipElement._largest_srcset_candidate(" , ") is None
+
+
+def test_html_image_url_takes_the_largest_candidate(clipboard):
+    clipboard.set_image(FakeClipboard.make_image(32, 32))
+    clipboard.add_html(
+        '<img src="/thumb.jpg" srcset="/img/640.jpg 640w, /img/2048.jpg 2048w">',
+        source_url="https://example.com/gallery/page.html"
+    )
+    assert ClipElement().get_html_image_url() == "https://example.com/img/2048.jpg"
+
+
+def test_html_image_url_without_srcset(clipboard):
+    clipboard.set_image(FakeClipboard.make_image(32, 32))
+    clipboard.add_html('<p>caption</p><img alt="" src="photo.png">', source_url="https://example.com/a/")
+    assert ClipElement().get_html_image_url() == "https://example.com/a/photo.png"
+
+
+def test_html_image_url_ignores_non_http_sources(clipboard):
+    clipboard.set_image(FakeClipboard.make_image(32, 32))
+    clipboard.add_html('<img src="data:image/png;base64,AAAA">')
+    assert ClipElement().get_html_image_url() is None
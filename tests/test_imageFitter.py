@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import types
+
+import pytest
+from PIL import Image
+
+from plugins.imageFitter import ImageFitter
+from plugins.PastePlugin.main import PastePlugin
+
+
+def test_target_size_keeps_images_that_fit():
+    fitter = ImageFitter((1920, 1080), margin=1.5)
+    assert fitter.target_size((1920, 1080)) is None
+    assert fitter.target_size((2880, 1620)) is None
+
+
+def test_target_size_fits_the_timeline_times_the_margin():
+    fitter = ImageFitter((1920, 1080), margin=1.5)
+    assert fitter.target_size((5760, 3240)) == (2880, 1620)
+    # portrait: the height is the limit
+    assert fitter.target_size((3000, 6000)) == (810, 1620)
+
+
+def test_target_size_never_goes_below_one_pixel():
+    fitter = ImageFitter((100, 100), margin=1)
+    assert fitter.target_size((100000, 10)) == (100, 1)
+
+
+def test_fit_resamples_and_keeps_the_mode():
+    fitter = ImageFitter((100, 100), margin=1)
+    fitted = fitter.fit(Image.new("RGBA", (400, 200), (255, 0, 0, 128)))
+    assert fitted.size == (100, 50)
+    assert fitted.mode == "RGBA"
+
+
+def test_fit_file_writes_the_fitted_copy_in_the_same_format(tmp_path):
+    fitter = ImageFitter((100, 100), margin=1)
+    source = tmp_path / "big.jpg"
+    Image.new("RGB", (800, 400), "blue").save(source, format="JPEG")
+    dest = tmp_path / "fitted.jpg"
+
+    assert fitter.fit_file(str(source), str(dest))
+    with Image.open(dest) as fitted:
+        assert fitted.format == "JPEG"
+        assert fitted.size == (100, 50)
+
+
+def test_fit_file_skips_small_and_animated_images(tmp_path):
+    fitter = ImageFitter((100, 100), margin=1)
+    small = tmp_path / "small.png"
+    Image.new("RGB", (50, 50)).save(small)
+    animated = tmp_path / "animated.gif"
+    frames = [Image.new("RGB", (500, 500), color) for color in ("red", "green")]
+    frames[0].save(animated, save_all=True, append_images=frames[1:])
+
+    assert not fitter.fit_file(str(small), str(tmp_path / "out.png"))
+    assert not fitter.fit_file(str(animated), str(tmp_path / "out.gif"))
+    assert not os.path.exists(tmp_path / "out.png")
+    assert not os.path.exists(tmp_path / "out.gif")
+
+
+def test_fit_file_raises_on_undecodable_content(tmp_path):
+    fitter = ImageFitter((100, 100))
+    svg = tmp_path / "logo.png"
+    svg.write_bytes(b"<svg xmlns='http://www.w3.org/2000/svg'/>")
+    with pytest.raises(Exception):
+        fitter.fit_file(str(svg), str(tmp_path / "out.png"))
+
+
+def fitting_plugin(fitter):
+    plugin = PastePlugin.__new__(PastePlugin)
+    plugin.get_fitter = lambda: fitter
+    return plugin
+
+
+def test_save_fitted_data_keeps_undecodable_bytes_as_the_asset(tmp_path):
+    plugin = fitting_plugin(ImageFitter((100, 100)))
+    media = types.SimpleNamespace(save_path=str(tmp_path), original_path=None)
+    data = b"<svg xmlns='http://www.w3.org/2000/svg'/>"
+
+    path = plugin.save_fitted_data(media, data, "1.png")
+    assert open(path, "rb").read() == data
+    assert media.original_path is None
+    assert os.listdir(tmp_path / "originals") == []
+
+
+def test_save_fitted_data_records_the_original(tmp_path):
+    plugin = fitting_plugin(ImageFitter((100, 100), margin=1))
+    media = types.SimpleNamespace(save_path=str(tmp_path), original_path=None)
+    source = tmp_path / "source.png"
+    Image.new("RGB", (400, 400)).save(source)
+
+    path = plugin.save_fitted_data(media, source.read_bytes(), "2.png")
+    with Image.open(path) as fitted:
+        assert fitted.size == (100, 100)
+    assert ImageFitter.get_original(str(tmp_path), "2.png") == media.original_path
+    assert open(media.original_path, "rb").read() == source.read_bytes()
+
+
+def test_originals_index(tmp_path):
+    fitter = ImageFitter((100, 100))
+    originals = fitter.get_originals_path(str(tmp_path))
+    assert os.path.isdir(originals)
+
+    fitter.record_original(str(tmp_path), "5.jpg", os.path.join(originals, "5.jpg"))
+    assert ImageFitter.get_original(str(tmp_path), "5.jpg") == os.path.join(originals, "5.jpg")
+    assert ImageFitter.get_original(str(tmp_path), "6.jpg") is None
+    with open(tmp_path / ImageFitter.INDEX_FILE_NAME, encoding="utf-8") as f:
+        assert json.load(f) == {"5.jpg": os.path.join(originals, "5.jpg")}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+
+import pytest
+
+from jobQueue import JobQueue, unlock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "queue"), cores=4, memory_mb=8000)
+
+
+def crash(queued_job):
+    """
+    What the OS does when the process owning `queued_job` dies: its locks are released.
+    """
+    for handle in [queued_job.owner_lock, *queued_job.slot_locks]:
+        unlock(handle)
+    queued_job.owner_lock = None
+    queued_job.slot_locks = []
+
+
+def test_limit_from_cores_memory_and_max_concurrency(queue):
+    assert queue.limit({"cores": 2, "memory_mb": 1000}) == 2
+    assert queue.limit({"cores": 1, "memory_mb": 3000}) == 2
+    assert queue.limit({"cores": 1, "memory_mb": 1, "max_concurrency": 1}) == 1
+    assert queue.limit({"cores": 16, "memory_mb": 1}) == 1
+
+
+def test_submit_journals_the_job(queue):
+    queued_job = queue.submit("RemBg", "Rotoscope (IA)", {"cores": 2, "priority": 1}, project="Demo")
+    with open(os.path.join(queue.journal_folder, f"{queued_job.id}.json"), encoding="utf-8") as f:
+        entry = json.load(f)
+    assert entry["plugin"] == "RemBg"
+    assert entry["state"] == "queued"
+    assert entry["priority"] == 1
+    assert entry["cores"] == 2
+    assert queue.depth() == 1
+    assert queue.orphans() == []
+
+
+def test_turns_by_priority_then_age(queue):
+    first = queue.submit("RemBg", "b", {"cores": 4, "memory_mb": 1})
+    second = queue.submit("RemBg", "b", {"cores": 4, "memory_mb": 1})
+    # the clock may not move between two submits (15 ms on Windows)
+    first.entry["created_at"] -= 1
+    queue._write(first.entry)
+    urgent = queue.submit("Upscale", "u", {"cores": 4, "memory_mb": 1, "priority": 5})
+
+    # a waiting job of higher priority goes first, whatever its plugin
+    assert not queue.try_acquire(first)
+    assert queue.try_acquire(urgent)
+    assert queue.position(second) == 1
+
+    # all the cores are taken
+    assert not queue.try_acquire(first)
+    queue.finish(urgent)
+    assert not queue.try_acquire(second)
+    assert queue.try_acquire(first)
+    assert first.running
+    queue.finish(first)
+    assert queue.try_acquire(second)
+    queue.finish(second)
+    assert queue.depth() == 0
+
+
+def test_adopt_an_orphan_with_its_input(queue, tmp_path):
+    queued_job = queue.submit("RemBg", "b", {})
+    input_folder = queue.input_folder(queued_job)
+    os.makedirs(input_folder)
+    queue.set_input(queued_job, input_folder)
+    assert queue.try_acquire(queued_job)
+    crash(queued_job)
+
+    orphans = queue.orphans()
+    assert [entry["id"] for entry in orphans] == [queued_job.id]
+    adopted = queue.adopt(orphans[0])
+    assert adopted.entry["state"] == "queued"
+    assert adopted.entry["created_at"] == queued_job.entry["created_at"]
+    # taken by this process now
+    assert queue.orphans() == []
+    assert queue.adopt(orphans[0]) is None
+
+    queue.finish(adopted)
+    assert not os.path.exists(input_folder)
+    assert queue.depth() == 0
+
+
+def test_adopt_keeps_the_results_of_a_done_job(queue):
+    queued_job = queue.submit("Upscale", "u", {})
+    assert queue.try_acquire(queued_job)
+    queue.complete(queued_job, [["C:/assets/3.png", "3.png"]])
+    crash(queued_job)
+
+    adopted = queue.adopt(queue.orphans()[0])
+    assert adopted.entry["state"] == "done"
+    assert adopted.entry["results"] == [["C:/assets/3.png", "3.png"]]
+
+
+def test_adopt_drops_an_orphan_without_input(queue):
+    queued_job = queue.submit("RemBg", "b", {})
+    crash(queued_job)
+
+    assert queue.adopt(queue.orphans()[0]) is None
+    assert queue.orphans() == []
+    assert os.listdir(queue.journal_folder) == []
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from pasteMemo import PasteMemo
+
+FORMATS = [2, 8, 17]
+UPSCALE_X4 = {"model_name": "realesrgan-x4plus", "scale": 4}
+
+
+@pytest.fixture
+def asset(tmp_path):
+    path = tmp_path / "7.png"
+    path.write_bytes(b"png")
+    return str(path)
+
+
+@pytest.fixture
+def memo(tmp_path):
+    return PasteMemo(str(tmp_path / "paste_memo.json"), size=3)
+
+
+def no_hash():
+    raise AssertionError("the content must not be hashed")
+
+
+def test_same_clipboard_matches_without_hashing(memo, asset):
+    memo.record("Ajouter", "Demo", 41, FORMATS, "hash-a", asset, "7.png")
+    entry = memo.lookup("Ajouter", "Demo", 41, FORMATS, no_hash)
+    assert entry["clip_name"] == "7.png"
+
+
+def test_same_content_copied_again_matches_by_hash(memo, asset):
+    memo.record("Ajouter", "Demo", 41, FORMATS, "hash-a", asset, "7.png")
+    assert memo.lookup("Ajouter", "Demo", 52, FORMATS, lambda: "hash-a")["path"] == asset
+    assert memo.lookup("Ajouter", "Demo", 52, FORMATS, lambda: "hash-b") is None
+
+
+def test_formats_guard_against_a_restarted_counter(memo, asset):
+    memo.record("Ajouter", "Demo", 41, FORMATS, "hash-a", asset, "7.png")
+    assert memo.lookup("Ajouter", "Demo", 41, [13], lambda: "hash-text") is None
+
+
+def test_button_project_and_options_must_match(memo, asset):
+    memo.record("UpScale", "Demo", 41, FORMATS, "hash-a", asset, "7.png", UPSCALE_X4)
+    assert memo.lookup("UpScale", "Demo", 41, FORMATS, no_hash, UPSCALE_X4) is not None
+    assert memo.lookup("Ajouter", "Demo", 41, FORMATS, lambda: "hash-a", UPSCALE_X4) is None
+    assert memo.lookup("UpScale", "Other", 41, FORMATS, lambda: "hash-a", UPSCALE_X4) is None
+    assert memo.lookup("UpScale", "Demo", 41, FORMATS, lambda: "hash-a", {**UPSCALE_X4, "scale": 2}) is None
+
+
+def test_one_entry_per_content_and_options(memo, asset, tmp_path):
+    other = str(tmp_path / "8.png")
+    open(other, "wb").close()
+    memo.record("UpScale", "Demo", 41, FORMATS, "hash-a", asset, "7.png", UPSCALE_X4)
+    memo.record("UpScale", "Demo", 42, FORMATS, "hash-a", other, "8.png", {**UPSCALE_X4, "scale": 2})
+    memo.record("UpScale", "Demo", 43, FORMATS, "hash-a", other, "8.png", {**UPSCALE_X4, "scale": 2})
+
+    assert len(memo.entries) == 2
+    assert memo.lookup("UpScale", "Demo", 50, FORMATS, lambda: "hash-a", UPSCALE_X4)["clip_name"] == "7.png"
+
+
+def test_entries_need_the_asset_file(memo, tmp_path):
+    path = tmp_path / "9.png"
+    path.write_bytes(b"png")
+    memo.record("Ajouter", "Demo", 41, FORMATS, "hash-a", str(path), "9.png")
+    path.unlink()
+    assert memo.lookup("Ajouter", "Demo", 41, FORMATS, lambda: "hash-a") is None
+
+
+def test_oldest_entries_are_forgotten(memo, asset, tmp_path):
+    for index in range(5):
+        memo.record("Ajouter", "Demo", index, FORMATS, f"hash-{index}", asset, "7.png")
+
+    reloaded = PasteMemo(memo.path, size=3)
+    assert reloaded.lookup("Ajouter", "Demo", 0, FORMATS, lambda: "hash-0") is None
+    assert reloaded.lookup("Ajouter", "Demo", 4, FORMATS, no_hash) is not None
+
+
+def test_forget(memo, asset):
+    memo.record("Ajouter", "Demo", 41, FORMATS, "hash-a", asset, "7.png")
+    memo.forget(memo.lookup("Ajouter", "Demo", 41, FORMATS, no_hash))
+    assert PasteMemo(memo.path).lookup("Ajouter", "Demo", 41, FORMATS, lambda: "hash-a") is None
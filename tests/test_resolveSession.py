@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+
+import pytest
+
+from fakeResolve import FakeResolve
+from resolveSession import ResolveSession, SessionProxy
+
+
+@pytest.fixture
+def fake():
+    return FakeResolve()
+
+
+@pytest.fixture
+def resolve(fake):
+    return ResolveSession(fake).resolve
+
+
+def media_pool(resolve):
+    return resolve.GetProjectManager().GetCurrentProject().GetMediaPool()
+
+
+def test_memoized_answers_are_asked_once(fake, resolve):
+    first = media_pool(resolve)
+    second = media_pool(resolve)
+    assert first is second
+    assert fake.session.calls["GetProjectManager"] == 1
+    assert fake.session.calls["GetCurrentProject"] == 1
+    assert fake.session.calls["GetMediaPool"] == 1
+
+
+def test_other_reads_are_not_memoized(fake, resolve):
+    folder = media_pool(resolve).GetRootFolder()
+    folder.GetClipList()
+    folder.GetClipList()
+    assert fake.session.calls["GetClipList"] == 2
+
+
+def test_memo_is_per_arguments(fake, resolve):
+    project = resolve.GetProjectManager().GetCurrentProject()
+    assert project.GetSetting("timelineResolutionWidth") == "1920"
+    assert project.GetSetting("timelineFrameRate") == "25"
+    assert project.GetSetting("timelineResolutionWidth") == "1920"
+    assert fake.session.calls["GetSetting"] == 2
+
+
+def test_a_mutating_call_forgets_the_memo_of_its_object(fake, resolve):
+    pool = media_pool(resolve)
+    root = pool.GetRootFolder()
+    pool.AddSubFolder(root, "ClipRocks")
+    assert pool.GetRootFolder() == root
+    assert fake.session.calls["GetRootFolder"] == 2
+
+
+def test_a_mutating_call_forgets_the_memo_of_its_arguments(fake, resolve, tmp_path):
+    pool = media_pool(resolve)
+    clip = resolve.GetMediaStorage().AddItemsToMediaPool([str(tmp_path / "a.png")])[0]
+    assert clip.GetName() == "a.png"
+    assert clip.GetName() == "a.png"
+    assert fake.session.calls["GetName"] == 1
+
+    # RelinkClips changes `clip`, found inside the list argument
+    clip._target.name = "b.png"
+    pool.RelinkClips([clip], str(tmp_path))
+    assert clip.GetName() == "b.png"
+    assert fake.session.calls["GetName"] == 2
+
+
+def test_returned_objects_are_proxied_and_compare_as_native(fake, resolve):
+    pool = media_pool(resolve)
+    assert isinstance(pool, SessionProxy)
+    assert pool == fake.project.media_pool
+    assert hash(pool) == hash(fake.project.media_pool)
+    items = pool.AppendToTimeline([{"mediaPoolItem": None}])
+    assert items == []
+
+
+def test_calls_run_on_the_dispatcher_thread(fake):
+    session = ResolveSession(fake)
+    threads = []
+    fake.GetProjectManager = lambda: threads.append(threading.current_thread()) or fake.project_manager
+    session.resolve.GetProjectManager()
+    assert threads == [session.thread]
+
+
+def test_call_batched_merges_adjacent_requests(fake):
+    session = ResolveSession(fake)
+    batches = []
+    started, gate = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait(5)
+
+    # hold the dispatcher so the next requests queue up
+    blocker = threading.Thread(target=session.call, args=(hold,))
+    blocker.start()
+    assert started.wait(5)
+
+    def batch(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    results = {}
+    workers = [
+        threading.Thread(target=lambda i=i: results.__setitem__(i, session.call_batched("import", batch, i)))
+        for i in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    deadline = time.monotonic() + 5
+    while len(session.pending) < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for worker in [blocker, *workers]:
+        worker.join(5)
+
+    assert results == {0: 0, 1: 10, 2: 20}
+    assert len(batches) == 1
+    assert sorted(batches[0]) == [0, 1, 2]
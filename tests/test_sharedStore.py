@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from sharedStore import SharedStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedStore(str(tmp_path / "shared"), str(tmp_path / "local"), local_max_mb=1)
+
+
+def write(path, size, fill=b"x"):
+    path.write_bytes(fill * size)
+    return str(path)
+
+
+def test_put_then_get_reads_the_local_copy(store, tmp_path):
+    source = write(tmp_path / "cutout.png", 100)
+    content_hash = store.put("rembg:abc", source, mime_type="image/png")
+    store.flush(5)
+
+    local_path, ref = store.get("rembg:abc")
+    assert ref == {"object": f"{content_hash}.png", "mime_type": "image/png"}
+    assert open(local_path, "rb").read() == b"x" * 100
+    assert store.get("rembg:other") is None
+
+
+def test_get_copies_from_the_shared_folder(store, tmp_path):
+    store.put_bytes("url:https://example.com/a.jpg", b"jpeg", "jpg", mime_type="image/jpeg")
+    store.flush(5)
+
+    other_seat = SharedStore(store.root, str(tmp_path / "other-seat"))
+    data, ref = other_seat.read("url:https://example.com/a.jpg")
+    assert data == b"jpeg"
+    assert ref["mime_type"] == "image/jpeg"
+
+
+def test_evict_removes_the_least_recently_used(store, tmp_path):
+    old_path, _ = store.get(key_of(store, "old", write(tmp_path / "old.bin", 600 * 1024, b"o")))
+    os.utime(old_path, (time.time() - 60, time.time() - 60))
+    store.flush(5)
+
+    key_of(store, "new", write(tmp_path / "new.bin", 600 * 1024, b"n"))
+    store.flush(5)
+    assert not os.path.exists(old_path)
+    assert store.get("new") is not None
+
+
+def test_put_of_an_existing_object_makes_it_recent(store, tmp_path):
+    a_path = write(tmp_path / "a.bin", 500 * 1024, b"a")
+    a_local, _ = store.get(key_of(store, "a", a_path))
+    c_local, _ = store.get(key_of(store, "c", write(tmp_path / "c.bin", 300 * 1024, b"c")))
+    store.flush(5)
+    os.utime(a_local, (time.time() - 60, time.time() - 60))
+
+    # the same content stored under another key is used again: `c` becomes the oldest
+    key_of(store, "a-again", a_path)
+    store.flush(5)
+    os.utime(c_local, (time.time() - 30, time.time() - 30))
+
+    key_of(store, "b", write(tmp_path / "b.bin", 300 * 1024, b"b"))
+    store.flush(5)
+    assert os.path.exists(a_local)
+    assert not os.path.exists(c_local)
+
+
+def test_evict_never_removes_the_object_being_returned_or_published(store, tmp_path):
+    release = threading.Event()
+    publish = SharedStore._publish
+
+    def slow_publish(self, key, local_path, ref):
+        release.wait(5)
+        publish(self, key, local_path, ref)
+
+    store._publish = slow_publish.__get__(store)
+    first = store.put("first", write(tmp_path / "1.bin", 700 * 1024, b"1"))
+    second = store.put("second", write(tmp_path / "2.bin", 700 * 1024, b"2"))
+    # both still being published: over the limit but both kept
+    assert sorted(os.listdir(store.local_objects)) == sorted([f"{first}.bin", f"{second}.bin"])
+    release.set()
+    store.flush(5)
+    assert not store.pinned
+
+
+def test_flush_gives_up_after_its_timeout(store, tmp_path):
+    release = threading.Event()
+    store._publish = lambda key, local_path, ref: release.wait(5)
+    store.put("slow", write(tmp_path / "slow.bin", 10))
+
+    start = time.monotonic()
+    store.flush(0.1)
+    assert time.monotonic() - start < 1
+    # still queued for the next flush
+    assert len(store.publishing) == 1
+    release.set()
+    store.flush(5)
+    assert not store.publishing
+
+
+def key_of(store, key, path):
+    store.put(key, path)
+    return key
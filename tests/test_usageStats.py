@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+
+from usageStats import UsageStats
+
+CF_BITMAP, CF_DIB, CF_UNICODETEXT = 2, 8, 13
+HTML_FORMAT = 0xC0F1
+
+
+def test_record_and_score(tmp_path):
+    stats = UsageStats(str(tmp_path / "usage.json"))
+    stats.record([CF_BITMAP, CF_DIB], "Rotoscope (IA)")
+    stats.record([CF_BITMAP, CF_DIB], "Rotoscope (IA)")
+    stats.record([CF_BITMAP], "Ajouter")
+
+    assert stats.score([CF_BITMAP, CF_DIB], "Rotoscope (IA)") == 4
+    assert stats.score([CF_BITMAP], "Ajouter") == 1
+    assert stats.score([CF_UNICODETEXT], "Ajouter") == 0
+
+
+def test_likely_button(tmp_path):
+    stats = UsageStats(str(tmp_path / "usage.json"))
+    assert stats.likely_button([CF_BITMAP]) is None
+
+    stats.record([CF_BITMAP], "UpScale")
+    stats.record([CF_BITMAP, CF_DIB], "Ajouter")
+    assert stats.likely_button([CF_BITMAP, CF_DIB]) == "Ajouter"
+    assert stats.likely_button([CF_UNICODETEXT]) is None
+
+
+def test_registered_formats_are_not_counted(tmp_path):
+    path = tmp_path / "usage.json"
+    stats = UsageStats(str(path))
+    stats.record([CF_BITMAP, HTML_FORMAT], "Ajouter")
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {str(CF_BITMAP): {"Ajouter": 1}}
+    assert stats.score([HTML_FORMAT], "Ajouter") == 0
+
+
+def test_counts_are_halved_past_max_count(tmp_path):
+    stats = UsageStats(str(tmp_path / "usage.json"), max_count=10)
+    for _ in range(9):
+        stats.record([CF_BITMAP], "Ajouter")
+    stats.record([CF_BITMAP], "UpScale")
+    assert stats.score([CF_BITMAP], "Ajouter") == 9
+
+    # 11 clicks > 10: Ajouter 9 -> 4, UpScale 2 -> 1
+    stats.record([CF_BITMAP], "UpScale")
+    assert stats.score([CF_BITMAP], "Ajouter") == 4
+    assert stats.score([CF_BITMAP], "UpScale") == 1
+
+
+def test_halving_forgets_single_clicks(tmp_path):
+    stats = UsageStats(str(tmp_path / "usage.json"), max_count=4)
+    stats.record([CF_BITMAP], "Once")
+    for _ in range(4):
+        stats.record([CF_BITMAP], "Ajouter")
+
+    assert stats.score([CF_BITMAP], "Once") == 0
+    assert "Once" not in stats.counts[str(CF_BITMAP)]
+
+
+def test_counts_survive_a_new_process(tmp_path):
+    path = str(tmp_path / "usage.json")
+    UsageStats(path).record([CF_DIB], "Ajouter")
+    assert UsageStats(path).likely_button([CF_DIB]) == "Ajouter"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+    ClipRocks is a scripting tool for DaVinci Resolve that enables instant copying and pasting
+    of content into the timeline, with optional AI-powered features such as background removal
+    and image upscaling.
+
+    Copyright: (C) 2025, coderocksai https://github.com/coderocksAI/ClipRocks
+    youtube channel : https://www.youtube.com/@CodeRocks
+    website : coderocks.fr 
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+
+# registered clipboard formats (>= 0xC000) get other ids in every Windows session, not counted
+FIRST_REGISTERED_FORMAT = 0xC000
+
+
+class UsageStats:
+    """
+    Which buttons the user clicks, per clipboard format ID: { format_id: { button: count } },
+    in a small JSON file of the user's cache folder. The menu is ordered with it and the most
+    likely button is warmed up while the user moves to it (see ClipRocks.HandlePlugins).
+
+    When the clicks of a format pass `max_count`, its counts are halved so that a change of
+    habits shows after a few days instead of never.
+    """
+
+    def __init__(self, path, max_count=200):
+        self.path = path
+        self.max_count = max_count
+        self.counts = None
+
+    def _load(self):
+        if self.counts is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.counts = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self.counts = {}
+        return self.counts
+
+    def _save(self):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.counts, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _keys(format_ids):
+        return [str(format_id) for format_id in format_ids if format_id < FIRST_REGISTERED_FORMAT]
+
+    def score(self, format_ids, button_name):
+        """
+        Clicks on `button_name` for clipboards holding these formats.
+        """
+        counts = self._load()
+        return sum(counts.get(key, {}).get(button_name, 0) for key in self._keys(format_ids))
+
+    def likely_button(self, format_ids):
+        """
+        The button clicked most often for these formats, or None without history.
+        """
+        totals = {}
+        for key in self._keys(format_ids):
+            for button_name, count in self._load().get(key, {}).items():
+                totals[button_name] = totals.get(button_name, 0) + count
+        if not totals:
+            return None
+        return max(totals, key=totals.get)
+
+    def record(self, format_ids, button_name):
+        """
+        Counts a click on `button_name` for these formats.
+        """
+        counts = self._load()
+        for key in self._keys(format_ids):
+            buttons = counts.setdefault(key, {})
+            buttons[button_name] = buttons.get(button_name, 0) + 1
+            if sum(buttons.values()) > self.max_count:
+                counts[key] = {name: count // 2 for name, count in buttons.items() if count // 2}
+        self._save()